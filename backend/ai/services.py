@@ -177,7 +177,14 @@ class GeminiAnalysisEngine:
                 logger.error(f"Caching failed (write): {e}")
 
         return result
-        
+
+    def score_match(self, applicant_data: Dict, job_data: Dict) -> Dict[str, Any]:
+        """
+        Deterministic, model-free match score (the same rules as the fallback engine).
+        Cheap enough to run over every job in a batch before any AI calls.
+        """
+        return self._generate_fallback_analysis(applicant_data, job_data)
+
     def _analyze_application_match_impl(self, applicant_data: Dict, job_data: Dict, cover_letter: str, log_context: Dict) -> Dict[str, Any]:
         """Implementation of core analysis logic"""
         if not self.model:
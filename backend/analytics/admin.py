@@ -17,6 +17,6 @@ class DashboardViewAdmin(admin.ModelAdmin):
 
 @admin.register(AnalyticsExport)
 class AnalyticsExportAdmin(admin.ModelAdmin):
-    list_display = ['export_type', 'recruiter', 'format', 'status', 'created_at']
+    list_display = ['export_type', 'recruiter', 'format', 'status', 'progress', 'attempts', 'created_at']
     list_filter = ['export_type', 'format', 'status', 'created_at']
     search_fields = ['recruiter__username']
\ No newline at end of file
@@ -1,10 +1,35 @@
 # analytics/analytics_engine.py
-from django.db.models import Count, Q, Avg, Min, Max
+from django.core.cache import cache
+from django.db.models import Count, Q, Avg, Min, Max, Sum, F, ExpressionWrapper, DurationField
 from django.utils import timezone
 from datetime import timedelta, datetime
 from collections import defaultdict
+import hashlib
+import json
+import logging
 import pandas as pd
 
+from hirepath.caching import get_namespace_version
+from hirepath.dates import date_range_filter
+
+from .trends import DEFAULT_BUCKET, bucket_label, count_trend, parse_bucket
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever a job's or an applicant's skills change (see analytics.signals)
+SKILLS_CACHE_NAMESPACE = 'analytics:skills'
+
+# Reports are keyed on a data watermark, so a cached report never outlives its inputs;
+# the TTL only bounds how long unused entries occupy the cache
+REPORT_CACHE_TTL = 60 * 60 * 24
+
+# Match score bands used by the quality metrics
+QUALITY_BUCKETS = {
+    'high_quality': Q(match_score__gte=80),
+    'medium_quality': Q(match_score__gte=60, match_score__lt=80),
+    'low_quality': Q(match_score__lt=60),
+}
+
 class RecruitmentAnalyticsEngine:
     def __init__(self, recruiter):
         self.recruiter = recruiter
@@ -14,64 +39,75 @@ class RecruitmentAnalyticsEngine:
         
         self.recruiter_jobs = Job.objects.filter(created_by=recruiter)
         self.applications = Application.objects.filter(job__in=self.recruiter_jobs)
+        self._frames = {}
+        # Report sections that failed and fell back to empty data (see _report_failed)
+        self.failures = []
+    
+    def _report_failed(self, section):
+        """Log the current exception; a report with a failed section is not cached"""
+        logger.exception(f"Error in {section}")
+        self.failures.append(section)
     
-    def get_recruiter_overview(self, days=30):
-        """Get overview statistics for recruiter dashboard"""
+    def get_recruiter_overview(self, days=30, bucket=DEFAULT_BUCKET):
+        """
+        Get overview statistics for recruiter dashboard.
+
+        Reads the DailyJobStats rollups (one row per job per day) rather than
+        application rows, so the cost doesn't grow with application volume.
+        """
         try:
-            # Lazy import for Application model
             from applications.models import Application
+            from .models import DailyJobStats
+            from .rollups import STATUS_FIELDS
             
-            end_date = timezone.now().date()
+            end_date = timezone.localdate()
             start_date = end_date - timedelta(days=days)
             
-            recent_applications = self.applications.filter(
-                applied_at__date__range=[start_date, end_date]
+            job_counts = self.recruiter_jobs.aggregate(
+                total=Count('id'),
+                active=Count('id', filter=Q(closing_date__gte=end_date) | Q(closing_date__isnull=True))
             )
             
-            # Calculate basic metrics - FIXED: Use actual Job model fields
-            total_jobs = self.recruiter_jobs.count()
-            
-            # FIXED: Determine active jobs based on closing_date
-            active_jobs = self.recruiter_jobs.filter(
-                Q(closing_date__gte=end_date) | Q(closing_date__isnull=True)
-            ).count()
-            
-            total_applications = recent_applications.count()
+            rollups = DailyJobStats.objects.filter(
+                job__in=self.recruiter_jobs,
+                date__range=[start_date, end_date]
+            )
+            # Aliases can't reuse the rollup column names, hence the total_ prefix
+            totals = rollups.aggregate(
+                total_applications=Sum('applications'),
+                total_scored=Sum('scored'),
+                total_score=Sum('score_total'),
+                applications_today=Sum('applications', filter=Q(date=end_date)),
+                hires_today=Sum('hires', filter=Q(date=end_date)),
+                **{f'total_{field}': Sum(field) for field in STATUS_FIELDS.values()}
+            )
+            totals = {key: value or 0 for key, value in totals.items()}
+            by_status = {value: totals[f'total_{field}'] for value, field in STATUS_FIELDS.items()}
             
-            # Calculate conversion rate safely
-            hired_count = recent_applications.filter(status=Application.Status.ACCEPTED).count()
+            total_applications = totals['total_applications']
+            hired_count = by_status[Application.Status.ACCEPTED]
             conversion_rate = (hired_count / total_applications * 100) if total_applications > 0 else 0
-            
-            # Get applications trend
-            applications_trend = self._get_applications_trend(days)
-            
-            # Get average match score
-            avg_match_result = recent_applications.aggregate(avg_score=Avg('match_score'))
-            average_match_score = round(avg_match_result['avg_score'] or 0, 2)
-            
-            # Get top performing jobs
-            top_performing_jobs = self._get_top_performing_jobs(days)
-            
-            # Get quick stats
-            quick_stats = self._get_quick_stats(recent_applications)
-            
-            # Get status distribution
-            status_distribution = self._get_status_distribution(recent_applications)
+            average_match_score = totals['total_score'] / totals['total_scored'] if totals['total_scored'] else 0
             
             return {
                 'period': f"Last {days} days",
-                'total_jobs': total_jobs,
-                'active_jobs': active_jobs,
+                'total_jobs': job_counts['total'],
+                'active_jobs': job_counts['active'],
                 'total_applications': total_applications,
-                'applications_trend': applications_trend,
+                'applications_trend': self._get_applications_trend(rollups, start_date, end_date, bucket),
                 'conversion_rate': round(conversion_rate, 2),
-                'average_match_score': average_match_score,
-                'top_performing_jobs': top_performing_jobs,
-                'quick_stats': quick_stats,
-                'status_distribution': status_distribution
+                'average_match_score': round(average_match_score, 2),
+                'top_performing_jobs': self._get_top_performing_jobs(rollups),
+                'quick_stats': {
+                    'applications_today': totals['applications_today'],
+                    'pending_review': by_status[Application.Status.PENDING],
+                    'interviews_scheduled': by_status[Application.Status.INTERVIEW],
+                    'new_hires': totals['hires_today'],
+                },
+                'status_distribution': {value: count for value, count in by_status.items() if count}
             }
-        except Exception as e:
-            print(f"Error in get_recruiter_overview: {e}")
+        except Exception:
+            self._report_failed('get_recruiter_overview')
             # Return safe default data
             return {
                 'period': f"Last {days} days",
@@ -91,132 +127,70 @@ class RecruitmentAnalyticsEngine:
                 'status_distribution': {}
             }
     
-    def _get_status_distribution(self, applications):
-        """Get application status distribution"""
+    def _get_applications_trend(self, rollups, start_date, end_date, bucket=DEFAULT_BUCKET):
+        """Application counts per bucket from the rollups, with empty buckets filled in"""
         try:
-            status_counts = applications.values('status').annotate(count=Count('id'))
-            return {item['status']: item['count'] for item in status_counts}
+            return count_trend(rollups, 'date', start_date, end_date, bucket, Sum('applications'))
         except Exception:
-            return {}
-    
-    def _get_applications_trend(self, days):
-        """Get applications trend over time"""
-        try:
-            end_date = timezone.now().date()
-            start_date = end_date - timedelta(days=days)
-            
-            # Generate date range
-            date_range = [start_date + timedelta(days=x) for x in range(days + 1)]
-            
-            # Get applications grouped by date
-            trends_data = self.applications.filter(
-                applied_at__date__range=[start_date, end_date]
-            ).extra({
-                'date': "DATE(applied_at)"
-            }).values('date').annotate(
-                count=Count('id')
-            ).order_by('date')
-            
-            # Convert to dictionary for easy lookup
-            trends_dict = {item['date']: item['count'] for item in trends_data}
-            
-            # Build complete trend data
-            trends = []
-            for single_date in date_range:
-                trends.append({
-                    'date': single_date.isoformat(),
-                    'count': trends_dict.get(single_date, 0)
-                })
-            
-            return trends
-        except Exception as e:
-            print(f"Error in _get_applications_trend: {e}")
+            self._report_failed('_get_applications_trend')
             return []
     
-    def _get_top_performing_jobs(self, days):
-        """Get top performing jobs by applications and conversions"""
+    def _get_top_performing_jobs(self, rollups):
+        """Top jobs by applications in the period, from the rollups"""
         try:
-            end_date = timezone.now().date()
-            start_date = end_date - timedelta(days=days)
-            
-            top_jobs = self.recruiter_jobs.filter(
-                applications__applied_at__date__range=[start_date, end_date]
-            ).annotate(
-                application_count=Count('applications'),
-                hire_count=Count('applications', filter=Q(applications__status='ACCEPTED')),
-                avg_match=Avg('applications__match_score')
-            ).order_by('-application_count')[:5]
+            top_jobs = rollups.values('job_id', 'job__title').annotate(
+                application_count=Sum('applications'),
+                hire_count=Sum('status_hired'),
+                scored_count=Sum('scored'),
+                score_sum=Sum('score_total')
+            ).filter(application_count__gt=0).order_by('-application_count', 'job_id')[:5]
             
             job_data = []
             for job in top_jobs:
                 job_data.append({
-                    'id': job.id,
-                    'title': job.title,
-                    'application_count': job.application_count,
-                    'hire_count': job.hire_count,
-                    'avg_match_score': round(job.avg_match or 0, 2),
-                    'conversion_rate': round((job.hire_count / job.application_count * 100) if job.application_count > 0 else 0, 2)
+                    'id': job['job_id'],
+                    'title': job['job__title'],
+                    'application_count': job['application_count'],
+                    'hire_count': job['hire_count'],
+                    'avg_match_score': round(job['score_sum'] / job['scored_count'], 2) if job['scored_count'] else 0,
+                    'conversion_rate': round((job['hire_count'] / job['application_count'] * 100), 2)
                 })
             
             return job_data
-        except Exception as e:
-            print(f"Error in _get_top_performing_jobs: {e}")
+        except Exception:
+            self._report_failed('_get_top_performing_jobs')
             return []
     
-    def _get_quick_stats(self, applications):
-        """Generate quick stats for dashboard"""
-        try:
-            today = timezone.now().date()
-            from applications.models import Application
-            
-            return {
-                'applications_today': applications.filter(
-                    applied_at__date=today
-                ).count(),
-                'pending_review': applications.filter(status=Application.Status.PENDING).count(),
-                'interviews_scheduled': applications.filter(status=Application.Status.INTERVIEW).count(),
-                'new_hires': applications.filter(
-                    status=Application.Status.ACCEPTED,
-                    updated_at__date=today
-                ).count(),
-            }
-        except Exception as e:
-            print(f"Error in _get_quick_stats: {e}")
-            return {
-                'applications_today': 0,
-                'pending_review': 0,
-                'interviews_scheduled': 0,
-                'new_hires': 0,
-            }
-    
     def get_applications_analysis(self, start_date, end_date, filters=None):
         """Detailed applications analysis"""
         try:
             from applications.models import Application
             
+            bucket = parse_bucket((filters or {}).get('bucket'))
             applications = self._apply_filters(
-                self.applications.filter(applied_at__date__range=[start_date, end_date]),
+                self.applications.filter(**date_range_filter('applied_at', start_date, end_date)),
                 filters
             )
             
-            # Get status distribution
-            status_counts = applications.values('status').annotate(count=Count('id'))
+            # Status counts, quality buckets, total and average in one pass
+            totals = applications.aggregate(
+                total=Count('id'),
+                avg_match=Avg('match_score'),
+                **{f'status_{value}': Count('id', filter=Q(status=value)) for value in Application.Status.values},
+                **{band: Count('id', filter=condition) for band, condition in QUALITY_BUCKETS.items()}
+            )
             applications_by_status = {
-                item['status']: item['count'] 
-                for item in status_counts
+                value: totals[f'status_{value}']
+                for value in Application.Status.values
+                if totals[f'status_{value}']
             }
             
-            # Calculate quality metrics
-            high_quality = applications.filter(match_score__gte=80).count()
-            medium_quality = applications.filter(match_score__gte=60, match_score__lt=80).count()
-            low_quality = applications.filter(match_score__lt=60).count()
-            
             # Get detailed breakdown by job
             detailed_breakdown = list(
                 applications.values('job__title', 'job__id').annotate(
                     total=Count('id'),
                     avg_match=Avg('match_score'),
-                    hired=Count('id', filter=Q(status='ACCEPTED'))
+                    hired=Count('id', filter=Q(status=Application.Status.ACCEPTED))
                 ).order_by('-total')[:10]
             )
             
@@ -227,36 +201,38 @@ class RecruitmentAnalyticsEngine:
             
             return {
                 'summary': {
-                    'total_applications': applications.count(),
+                    'total_applications': totals['total'],
                     'applications_by_status': applications_by_status,
-                    'average_match_score': round(applications.aggregate(avg=Avg('match_score'))['avg'] or 0, 2),
+                    'average_match_score': round(totals['avg_match'] or 0, 2),
                 },
                 'trends': {
-                    'daily_applications': self._get_daily_trends_for_period(applications, start_date, end_date),
-                },
-                'quality_metrics': {
-                    'high_quality': high_quality,
-                    'medium_quality': medium_quality,
-                    'low_quality': low_quality,
+                    f'{bucket_label(bucket)}_applications': self._get_trends_for_period(
+                        applications, start_date, end_date, bucket
+                    ),
                 },
+                'quality_metrics': {band: totals[band] for band in QUALITY_BUCKETS},
                 'detailed_breakdown': detailed_breakdown
             }
-        except Exception as e:
-            print(f"Error in get_applications_analysis: {e}")
+        except Exception:
+            self._report_failed('get_applications_analysis')
             return self._get_empty_applications_analysis()
     
-    def _get_daily_trends_for_period(self, applications, start_date, end_date):
-        """Get daily trends for a specific period"""
+    def _get_trends_for_period(self, applications, start_date, end_date, bucket=DEFAULT_BUCKET):
+        """Application counts per local day, week or month of the period"""
         try:
-            trends = applications.extra({
-                'date': "DATE(applied_at)"
-            }).values('date').annotate(
-                count=Count('id')
-            ).order_by('date')
-            return list(trends)
+            return count_trend(applications, 'applied_at', start_date, end_date, bucket)
         except Exception:
+            self._report_failed('_get_trends_for_period')
             return []
     
+    def get_applications_trend(self, start_date, end_date, bucket=DEFAULT_BUCKET, filters=None):
+        """Applications submitted per bucket in the range, honoring the report filters"""
+        applications = self._apply_filters(
+            self.applications.filter(**date_range_filter('applied_at', start_date, end_date)),
+            filters
+        )
+        return self._get_trends_for_period(applications, start_date, end_date, bucket)
+    
     def _get_empty_applications_analysis(self):
         """Return empty applications analysis structure"""
         return {
@@ -277,7 +253,7 @@ class RecruitmentAnalyticsEngine:
     def get_candidate_pipeline(self, start_date, end_date):
         """Candidate pipeline analysis"""
         try:
-            applications = self.applications.filter(applied_at__date__range=[start_date, end_date])
+            applications = self.applications.filter(**date_range_filter('applied_at', start_date, end_date))
             
             pipeline_data = applications.values('status').annotate(
                 count=Count('id'),
@@ -297,21 +273,30 @@ class RecruitmentAnalyticsEngine:
                     'max_match': round(item['max_match'] or 0, 2)
                 })
             
+            frames = self.frames(start_date, end_date)
             return {
                 'pipeline_stages': formatted_data,
-                'total_candidates': applications.count()
+                'total_candidates': applications.count(),
+                'funnel': self.get_status_funnel(start_date, end_date),
+                'job_funnels': frames.job_funnels(),
+                'score_histogram': frames.score_histogram()
             }
-        except Exception as e:
-            print(f"Error in get_candidate_pipeline: {e}")
+        except Exception:
+            self._report_failed('get_candidate_pipeline')
             return {
                 'pipeline_stages': [],
-                'total_candidates': 0
+                'total_candidates': 0,
+                'funnel': [],
+                'job_funnels': [],
+                'score_histogram': {'bins': [], 'unscored': 0}
             }
     
     def get_source_analysis(self, start_date, end_date):
         """Application source performance analysis"""
         try:
-            applications = self.applications.filter(applied_at__date__range=[start_date, end_date])
+            from applications.models import Application
+            
+            applications = self.applications.filter(**date_range_filter('applied_at', start_date, end_date))
             
             # For now, return basic source analysis
             # You can enhance this when you have actual source tracking
@@ -319,15 +304,15 @@ class RecruitmentAnalyticsEngine:
                 'application_source': 'Direct Application',
                 'total_applications': applications.count(),
                 'avg_match_score': round(applications.aggregate(avg=Avg('match_score'))['avg'] or 0, 2),
-                'conversion_rate': round((applications.filter(status='ACCEPTED').count() / applications.count() * 100) if applications.count() > 0 else 0, 2)
+                'conversion_rate': round((applications.filter(status=Application.Status.ACCEPTED).count() / applications.count() * 100) if applications.count() > 0 else 0, 2)
             }]
             
             return {
                 'source_performance': source_data,
                 'total_sources': len(source_data)
             }
-        except Exception as e:
-            print(f"Error in get_source_analysis: {e}")
+        except Exception:
+            self._report_failed('get_source_analysis')
             return {
                 'source_performance': [],
                 'total_sources': 0
@@ -350,6 +335,63 @@ class RecruitmentAnalyticsEngine:
             
         return queryset
     
+    def frames(self, start_date, end_date, filters=None):
+        """Columnar data for the range, loaded at most once per engine (see analytics.columnar)"""
+        from applications.models import ApplicationStatusEvent
+        from .columnar import ReportFrames
+        
+        key = (start_date, end_date, json.dumps(filters or {}, sort_keys=True, default=str))
+        if key not in self._frames:
+            status_events = ApplicationStatusEvent.objects.filter(job__in=self.recruiter_jobs)
+            if filters:
+                status_events = status_events.filter(application__in=self._apply_filters(self.applications, filters))
+            self._frames[key] = ReportFrames(
+                self._apply_filters(self.applications, filters), status_events, start_date, end_date
+            )
+        return self._frames[key]
+    
+    def data_watermark(self):
+        """
+        Changes whenever anything a report reads changes: the latest
+        application/job update plus row counts (which catch deletions), from
+        one aggregate over the recruiter's jobs and their applications, and
+        the skills namespace version, since skill M2M changes touch no
+        updated_at. None if the version can't be read (the shared cache is
+        down), in which case nothing should be cached.
+        """
+        skills_version = get_namespace_version(SKILLS_CACHE_NAMESPACE)
+        if skills_version is None:
+            return None
+        # One row per application (or per job without any), so no count needs DISTINCT except jobs
+        watermark = self.recruiter_jobs.order_by().aggregate(
+            jobs_updated=Max('updated_at'),
+            jobs=Count('id', distinct=True),
+            applications_updated=Max('applications__updated_at'),
+            applications=Count('applications'),
+        )
+        return [
+            watermark['applications_updated'], watermark['applications'],
+            watermark['jobs_updated'], watermark['jobs'], skills_version,
+        ]
+    
+    def get_cached_report(self, report_type, date_range_start, date_range_end, filters=None):
+        """generate_comprehensive_report, served from cache while the recruiter's data is unchanged"""
+        watermark = self.data_watermark()
+        if watermark is None:
+            return self.generate_comprehensive_report(report_type, date_range_start, date_range_end, filters)
+        key_data = [report_type, date_range_start, date_range_end, filters or {}, watermark]
+        digest = hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        key = f"analytics:report:{self.recruiter.pk}:{digest}"
+        
+        report = cache.get(key)
+        if report is None:
+            self.failures = []
+            report = self.generate_comprehensive_report(report_type, date_range_start, date_range_end, filters)
+            # A section that fell back to empty data must not be served until the next change
+            if 'error' not in report and not self.failures:
+                cache.set(key, report, REPORT_CACHE_TTL)
+        return report
+    
     def generate_comprehensive_report(self, report_type, date_range_start, date_range_end, filters=None):
         """Generate comprehensive report based on type"""
         try:
@@ -362,103 +404,215 @@ class RecruitmentAnalyticsEngine:
             elif report_type == 'SOURCE_ANALYSIS':
                 return self.get_source_analysis(date_range_start, date_range_end)
             elif report_type == 'SKILL_GAP_ANALYSIS':
-                return self.get_skill_gap_analysis(date_range_start, date_range_end)
+                return self.get_skill_gap_analysis(date_range_start, date_range_end, filters)
             else:
                 return {'error': 'Unsupported report type'}
         except Exception as e:
             return {'error': f'Report generation failed: {str(e)}'}
     
+    def _status_events(self, start_date, end_date):
+        """Status transitions on the recruiter's jobs that happened in the date range"""
+        from applications.models import ApplicationStatusEvent
+        
+        return ApplicationStatusEvent.objects.filter(
+            job__in=self.recruiter_jobs,
+            **date_range_filter('at', start_date, end_date)
+        )
+    
+    @staticmethod
+    def _days(duration):
+        return round(duration.total_seconds() / 86400, 1) if duration is not None else 0
+    
+    def _hire_metric(self, event):
+        if event is None:
+            return None
+        application = event.application
+        return {
+            'job_title': event.job.title,
+            'applicant_name': application.applicant.get_full_name(),
+            'days_to_hire': event.time_to_hire.days,
+            'applied_date': timezone.localdate(application.applied_at).isoformat(),
+            'hired_date': timezone.localdate(event.at).isoformat(),
+            'match_score': application.match_score or 0
+        }
+    
     def get_time_to_hire_analysis(self, start_date, end_date):
-        """Time to hire metrics analysis"""
+        """Time to hire metrics analysis, from recorded transitions to hired"""
         try:
             from applications.models import Application
             
-            hired_applications = self.applications.filter(
-                status=Application.Status.ACCEPTED,
-                updated_at__date__range=[start_date, end_date]
+            hires = self._status_events(start_date, end_date).filter(
+                to_status=Application.Status.ACCEPTED
+            ).annotate(
+                time_to_hire=ExpressionWrapper(
+                    F('at') - F('application__applied_at'), output_field=DurationField()
+                )
             )
+            totals = hires.aggregate(total=Count('id'), average=Avg('time_to_hire'))
             
-            time_metrics = []
-            for app in hired_applications:
-                try:
-                    days_to_hire = (app.updated_at.date() - app.applied_at.date()).days
-                    time_metrics.append({
-                        'job_title': app.job.title,
-                        'applicant_name': app.applicant.get_full_name(),
-                        'days_to_hire': days_to_hire,
-                        'applied_date': app.applied_at.date().isoformat(),
-                        'hired_date': app.updated_at.date().isoformat(),
-                        'match_score': app.match_score or 0
-                    })
-                except Exception:
-                    continue
-            
-            if time_metrics:
-                avg_time = sum(metric['days_to_hire'] for metric in time_metrics) / len(time_metrics)
-                fastest = min(time_metrics, key=lambda x: x['days_to_hire'])
-                slowest = max(time_metrics, key=lambda x: x['days_to_hire'])
-            else:
-                avg_time = 0
-                fastest = slowest = None
+            frames = self.frames(start_date, end_date)
+            extremes = hires.select_related('job', 'application__applicant')
+            fastest = slowest = None
+            if totals['total']:
+                fastest = self._hire_metric(extremes.order_by('time_to_hire', 'id').first())
+                slowest = self._hire_metric(extremes.order_by('-time_to_hire', '-id').first())
             
             return {
                 'time_metrics': {
-                    'average_time_to_hire': round(avg_time, 1),
+                    'average_time_to_hire': self._days(totals['average']),
                     'fastest_hire': fastest,
                     'slowest_hire': slowest,
-                    'total_hires': len(time_metrics)
-                }
+                    'total_hires': totals['total']
+                },
+                'distribution': frames.time_to_hire_distribution(),
+                'stage_durations': self.get_stage_durations(start_date, end_date),
+                'weekly_cohorts': frames.weekly_cohorts()
             }
-        except Exception as e:
-            print(f"Error in get_time_to_hire_analysis: {e}")
+        except Exception:
+            self._report_failed('get_time_to_hire_analysis')
             return {
                 'time_metrics': {
                     'average_time_to_hire': 0,
                     'fastest_hire': None,
                     'slowest_hire': None,
                     'total_hires': 0
-                }
+                },
+                'distribution': {},
+                'stage_durations': [],
+                'weekly_cohorts': []
+            }
+    
+    def get_stage_durations(self, start_date, end_date):
+        """How long applications stayed in each status before moving on"""
+        durations = self._status_events(start_date, end_date).exclude(
+            from_status=''
+        ).values('from_status').annotate(
+            transitions=Count('id'),
+            average=Avg('time_in_previous_status'),
+            longest=Max('time_in_previous_status')
+        ).order_by('from_status')
+        
+        return [
+            {
+                'status': row['from_status'],
+                'transitions': row['transitions'],
+                'average_days': self._days(row['average']),
+                'max_days': self._days(row['longest'])
+            }
+            for row in durations
+        ]
+    
+    def get_status_funnel(self, start_date, end_date):
+        """
+        Of the applications submitted in the date range, how many ever reached
+        each status (at any time, not only their current one).
+        """
+        from applications.models import Application, ApplicationStatusEvent
+        
+        reached = dict(
+            ApplicationStatusEvent.objects.filter(
+                job__in=self.recruiter_jobs,
+                **date_range_filter('application__applied_at', start_date, end_date)
+            ).values('to_status').annotate(
+                applications=Count('application', distinct=True)
+            ).values_list('to_status', 'applications')
+        )
+        submitted = reached.get(Application.Status.PENDING, 0)
+        
+        return [
+            {
+                'status': value,
+                'applications': reached.get(value, 0),
+                'conversion_rate': round(reached.get(value, 0) / submitted * 100, 2) if submitted else 0
             }
+            for value in Application.Status.values
+        ]
     
-    def get_skill_gap_analysis(self, start_date, end_date):
-        """Analyze skill gaps across applications"""
+    def get_skill_gap_analysis(self, start_date, end_date, filters=None):
+        """
+        Skill gaps across every application in the range.
+
+        Pairs each application with its job's required skills (the
+        skills_required M2M table) and checks the applicant's skills (the
+        user skills M2M table) with a correlated EXISTS, so the database does
+        the set difference over indexed (job, skill) and (user, skill) pairs
+        and only per-skill counts come back.
+        """
         try:
-            applications = self.applications.filter(
-                applied_at__date__range=[start_date, end_date]
-            ).select_related('applicant', 'job')[:50]  # Limit for performance
+            from django.db.models import Exists, OuterRef
+            from accounts.models import User
+            from jobs.models import Job
+            
+            applicant_skills = User.skills.through.objects
+            applications = self._apply_filters(
+                self.applications.filter(**date_range_filter('applied_at', start_date, end_date)),
+                filters
+            )
             
-            skill_gaps = []
+            # Per required skill: applications to jobs requiring it, and how many applicants lack it
+            lacks_skill = ~Exists(applicant_skills.filter(
+                user_id=OuterRef('applicant_id'), skill_id=OuterRef('job__skills_required')
+            ))
+            skills = list(
+                applications.filter(job__skills_required__isnull=False).values(
+                    skill_id=F('job__skills_required'), skill=F('job__skills_required__name')
+                ).annotate(
+                    applicants=Count('id'),
+                    missing=Count('id', filter=Q(lacks_skill))
+                ).order_by('-missing', 'skill')
+            )
+            for item in skills:
+                item['missing_rate'] = round(item['missing'] / item['applicants'] * 100, 2)
+            
+            # Applications lacking at least one of their job's required skills
+            has_gap = Exists(
+                Job.skills_required.through.objects.filter(job_id=OuterRef('job_id')).exclude(
+                    skill_id__in=applicant_skills.filter(user_id=OuterRef(OuterRef('applicant_id'))).values('skill_id')
+                )
+            )
+            totals = applications.aggregate(
+                total=Count('id'),
+                with_gaps=Count('id', filter=Q(has_gap)),
+                high=Count('id', filter=Q(has_gap, match_score__lt=50)),
+                medium=Count('id', filter=Q(has_gap, match_score__gte=50, match_score__lt=70))
+            )
             
-            for app in applications:
-                try:
-                    # Simple skill gap analysis
-                    match_score = app.match_score or 0
-                    if match_score < 70:  # Consider low match scores as having skill gaps
-                        skill_gaps.append({
-                            'application_id': app.id,
-                            'job_title': app.job.title,
-                            'applicant_name': app.applicant.get_full_name(),
-                            'match_score': match_score,
-                            'gap_severity': 'High' if match_score < 50 else 'Medium'
-                        })
-                except Exception:
-                    continue
+            lowest_matches = applications.filter(has_gap).select_related('applicant', 'job').order_by(
+                F('match_score').asc(nulls_first=True)
+            )[:20]
+            detailed_analysis = [
+                {
+                    'application_id': app.id,
+                    'job_title': app.job.title,
+                    'applicant_name': app.applicant.get_full_name(),
+                    'match_score': app.match_score or 0,
+                    'skills_missing': app.skills_missing,
+                    'gap_severity': 'High' if (app.match_score or 0) < 50 else 'Medium'
+                }
+                for app in lowest_matches
+            ]
             
             return {
                 'summary': {
-                    'total_applications_with_gaps': len(skill_gaps),
-                    'high_severity_gaps': len([g for g in skill_gaps if g['gap_severity'] == 'High']),
-                    'medium_severity_gaps': len([g for g in skill_gaps if g['gap_severity'] == 'Medium']),
+                    'total_applications': totals['total'],
+                    'total_applications_with_gaps': totals['with_gaps'],
+                    'high_severity_gaps': totals['high'],
+                    'medium_severity_gaps': totals['medium'],
+                    'skills_analyzed': len(skills),
                 },
-                'detailed_analysis': skill_gaps[:20]
+                'skills': skills,
+                'detailed_analysis': detailed_analysis
             }
-        except Exception as e:
-            print(f"Error in get_skill_gap_analysis: {e}")
+        except Exception:
+            self._report_failed('get_skill_gap_analysis')
             return {
                 'summary': {
+                    'total_applications': 0,
                     'total_applications_with_gaps': 0,
                     'high_severity_gaps': 0,
                     'medium_severity_gaps': 0,
+                    'skills_analyzed': 0,
                 },
+                'skills': [],
                 'detailed_analysis': []
-            }
\ No newline at end of file
+            }
@@ -0,0 +1,181 @@
+# analytics/columnar.py
+"""
+Columnar report computations on pandas/NumPy.
+
+``ReportFrames`` pulls a narrow set of columns for a recruiter's applications
+(and their status transitions) once per date range with ``values_list`` —
+no model instances, no related-object lookups — and keeps them as
+DataFrames. Distributions, histograms, per-job funnels and cohorts are then
+computed with vectorized operations instead of one query (or one Python
+loop) per metric. Frames are loaded lazily, so a report only pays for the
+tables it uses.
+"""
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+
+from hirepath.dates import date_range_filter
+
+SCORE_BINS = np.linspace(0, 100, 11)
+SECONDS_PER_DAY = 86400
+
+
+def _local_times(values):
+    """Aware datetimes -> naive local-time pandas datetimes"""
+    return pd.to_datetime(values, utc=True).dt.tz_convert(timezone.get_current_timezone_name()).dt.tz_localize(None)
+
+
+def _round(value, digits=1):
+    return round(float(value), digits) if pd.notna(value) else 0
+
+
+class ReportFrames:
+    APPLICATION_COLUMNS = ['id', 'job_id', 'job__title', 'status', 'match_score', 'applied_at']
+    EVENT_COLUMNS = ['application_id', 'job_id', 'to_status', 'at', 'application__applied_at']
+
+    def __init__(self, applications, status_events, start_date, end_date):
+        """
+        ``applications``/``status_events``: the recruiter's querysets (filters
+        already applied). Cohort frames cover applications submitted in the
+        range and all their transitions; the hires frame covers transitions to
+        hired that happened in the range, like the SQL time-to-hire metrics.
+        """
+        from applications.models import Application
+
+        self._applications = applications.filter(**date_range_filter('applied_at', start_date, end_date))
+        self._status_events = status_events.filter(
+            **date_range_filter('application__applied_at', start_date, end_date)
+        )
+        self._hire_events = status_events.filter(
+            to_status=Application.Status.ACCEPTED, **date_range_filter('at', start_date, end_date)
+        )
+        self._frames = {}
+
+    @property
+    def applications(self):
+        """One row per application: id, job_id, job_title, status, match_score, applied_at (local)"""
+        if 'applications' not in self._frames:
+            rows = list(self._applications.order_by().values_list(*self.APPLICATION_COLUMNS))
+            frame = pd.DataFrame(rows, columns=['id', 'job_id', 'job_title', 'status', 'match_score', 'applied_at'])
+            frame['status'] = frame['status'].astype('category')
+            frame['match_score'] = frame['match_score'].astype('float64')
+            frame['applied_at'] = _local_times(frame['applied_at'])
+            self._frames['applications'] = frame
+        return self._frames['applications']
+
+    def _events_frame(self, name, queryset):
+        if name not in self._frames:
+            rows = list(queryset.order_by().values_list(*self.EVENT_COLUMNS))
+            frame = pd.DataFrame(rows, columns=['application_id', 'job_id', 'to_status', 'at', 'applied_at'])
+            frame['to_status'] = frame['to_status'].astype('category')
+            frame['at'] = _local_times(frame['at'])
+            frame['applied_at'] = _local_times(frame['applied_at'])
+            self._frames[name] = frame
+        return self._frames[name]
+
+    @property
+    def status_events(self):
+        """Transitions of the cohort: application_id, job_id, to_status, at, applied_at (local)"""
+        return self._events_frame('status_events', self._status_events)
+
+    @staticmethod
+    def _first_hires(events):
+        """First transition to hired per application, with days_to_hire"""
+        from applications.models import Application
+
+        hires = events[events['to_status'] == Application.Status.ACCEPTED]
+        hires = hires.sort_values('at').drop_duplicates('application_id')
+        days = (hires['at'] - hires['applied_at']).dt.total_seconds() / SECONDS_PER_DAY
+        return hires.assign(days_to_hire=days.clip(lower=0))
+
+    def hires(self):
+        """Hires made in the range, with days_to_hire"""
+        return self._first_hires(self._events_frame('hire_events', self._hire_events))
+
+    def time_to_hire_distribution(self):
+        """Mean, median and p90 days from application to hire"""
+        days = self.hires()['days_to_hire'].to_numpy()
+        if not len(days):
+            return {'hires': 0, 'mean_days': 0, 'median_days': 0, 'p90_days': 0, 'min_days': 0, 'max_days': 0}
+        return {
+            'hires': int(len(days)),
+            'mean_days': _round(days.mean()),
+            'median_days': _round(np.median(days)),
+            'p90_days': _round(np.percentile(days, 90)),
+            'min_days': _round(days.min()),
+            'max_days': _round(days.max()),
+        }
+
+    def score_histogram(self):
+        """Application counts per 10-point match score band; unscored applications counted apart"""
+        scores = self.applications['match_score']
+        counts, edges = np.histogram(scores.dropna().clip(0, 100).to_numpy(), bins=SCORE_BINS)
+        return {
+            'bins': [
+                {'range': f"{int(low)}-{int(high)}", 'count': int(count)}
+                for low, high, count in zip(edges[:-1], edges[1:], counts)
+            ],
+            'unscored': int(scores.isna().sum()),
+        }
+
+    def job_funnels(self):
+        """Per job: applications that ever reached each status, and conversion from submission"""
+        from applications.models import Application
+
+        applications = self.applications
+        if applications.empty:
+            return []
+        events = self.status_events[['application_id', 'job_id', 'to_status']].drop_duplicates(
+            ['application_id', 'to_status']
+        )
+        reached = pd.crosstab(events['job_id'], events['to_status'].astype(str)).reindex(
+            columns=Application.Status.values, fill_value=0
+        )
+        jobs = applications.groupby('job_id').agg(job_title=('job_title', 'first'), applications=('id', 'size'))
+        funnels = jobs.join(reached, how='left').fillna(0)
+
+        submitted = funnels['applications'].to_numpy(dtype=float)
+        hired = funnels[Application.Status.ACCEPTED].to_numpy(dtype=float)
+        funnels['hire_rate'] = np.round(np.divide(hired * 100, submitted, out=np.zeros_like(hired), where=submitted > 0), 2)
+        funnels = funnels.sort_values('applications', ascending=False)
+
+        return [
+            {
+                'job_id': int(job_id),
+                'job_title': row['job_title'],
+                'applications': int(row['applications']),
+                'reached': {value: int(row[value]) for value in Application.Status.values},
+                'hire_rate': float(row['hire_rate']),
+            }
+            for job_id, row in funnels.iterrows()
+        ]
+
+    def weekly_cohorts(self):
+        """Applications grouped by the week (Monday) they were submitted"""
+        applications = self.applications
+        if applications.empty:
+            return []
+        week = applications['applied_at'].dt.normalize() - pd.to_timedelta(applications['applied_at'].dt.weekday, unit='D')
+        hires = self._first_hires(self.status_events).set_index('application_id')['days_to_hire']
+        cohort = applications.assign(
+            week=week,
+            days_to_hire=applications['id'].map(hires),
+        ).groupby('week').agg(
+            applications=('id', 'size'),
+            avg_match=('match_score', 'mean'),
+            hires=('days_to_hire', 'count'),
+            median_days_to_hire=('days_to_hire', 'median'),
+        )
+        cohort['hire_rate'] = (cohort['hires'] / cohort['applications'] * 100).round(2)
+
+        return [
+            {
+                'week_start': week_start.date().isoformat(),
+                'applications': int(row['applications']),
+                'avg_match': _round(row['avg_match'], 2),
+                'hires': int(row['hires']),
+                'hire_rate': float(row['hire_rate']),
+                'median_days_to_hire': _round(row['median_days_to_hire']),
+            }
+            for week_start, row in cohort.iterrows()
+        ]
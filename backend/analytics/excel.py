@@ -0,0 +1,79 @@
+# analytics/excel.py
+"""
+Excel output with openpyxl's write-only mode.
+
+Rows are serialized to the sheet XML as they are appended, so a sheet of any
+length is written without holding it in memory. Column widths have to be set
+before the first row, so they are estimated from the first
+``WIDTH_SAMPLE_ROWS`` rows rather than measured over every cell.
+"""
+import json
+from itertools import islice
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 50
+
+# Excel's own limit on sheet names
+MAX_SHEET_NAME_LENGTH = 31
+
+HEADER_FONT = Font(bold=True)
+
+
+def new_workbook():
+    return Workbook(write_only=True)
+
+
+def cell_value(value):
+    """Coerce a value into something openpyxl can store in a cell"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, default=str)
+    elif not isinstance(value, str):
+        value = str(value)
+    # Control characters are not allowed in the sheet XML
+    return ILLEGAL_CHARACTERS_RE.sub('', value)
+
+
+def _display_width(value):
+    return len(str(value)) if value is not None else 0
+
+
+def write_sheet(workbook, title, rows, headers=None):
+    """
+    Append a sheet of ``rows`` (dicts) to a write-only ``workbook``.
+
+    ``headers`` defaults to the keys of the first row. Returns the number of
+    data rows written.
+    """
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    if headers is None:
+        headers = list(sample[0]) if sample else []
+
+    sheet = workbook.create_sheet(title=title[:MAX_SHEET_NAME_LENGTH])
+    for index, header in enumerate(headers, 1):
+        width = max([_display_width(header)] + [_display_width(row.get(header)) for row in sample])
+        sheet.column_dimensions[get_column_letter(index)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(sheet, value=cell_value(header))
+        cell.font = HEADER_FONT
+        header_cells.append(cell)
+    sheet.append(header_cells)
+
+    written = 0
+    for row in sample:
+        sheet.append([cell_value(row.get(header)) for header in headers])
+        written += 1
+    for row in rows:
+        sheet.append([cell_value(row.get(header)) for header in headers])
+        written += 1
+    return written
@@ -0,0 +1,603 @@
+# analytics/exports.py
+"""
+Background export pipeline for ``AnalyticsExport``.
+
+``create_export`` stores a PENDING row and queues ``run_export``, which
+claims it (PENDING -> PROCESSING) and builds the file. Progress is written
+to the row as the export advances; each write only touches a row that is
+still PROCESSING, so it doubles as the cancellation check. Failed attempts
+are re-queued with backoff until ``EXPORT_MAX_ATTEMPTS``.
+
+Row sources return ``(row count, rows)`` where rows are read from the
+database in ``EXPORT_CHUNK_SIZE`` keyset batches (``iter_keyset``). CSV and NDJSON are encoded line by
+line, Excel through openpyxl's write-only mode and PDF as paged tables (up
+to a row cap), into a temporary file (CSV/NDJSON can also go straight into a
+streaming response via ``stream_export``), so memory use does not grow with
+the export size; JSON still builds the whole document.
+
+Each export type accepts the filters listed in ``EXPORT_FILTERS``; they are
+validated by ``clean_filters`` when the export is requested, stored on the
+row and applied by the row source.
+
+At most ``EXPORT_MAX_CONCURRENT_PER_RECRUITER`` exports per recruiter may be
+pending or processing at once. An active export the pipeline has not touched
+for ``EXPORT_STALE_AFTER`` seconds (its worker died, or the process restarted
+and dropped its queue) no longer counts, and ``fail_stale_exports`` (run by
+``manage.py expire_exports``) marks it FAILED so it can be retried.
+"""
+import csv
+import json
+import logging
+import tempfile
+from datetime import date, timedelta, datetime
+from itertools import chain
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile, File
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.db.models.functions import Substr
+from django.utils import timezone
+from reportlab.platypus import Paragraph, Spacer
+
+from applications.models import Application
+from hirepath.dates import start_of_day
+from jobs.models import Job
+from .analytics_engine import RecruitmentAnalyticsEngine
+from .excel import new_workbook, write_sheet
+from .files import content_addressed_name, new_digest, release_file, save_once
+from .models import AnalyticsExport
+from .pdf import data_tables, get_styles, new_document
+from .tasks import run_export
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retry n is n * EXPORT_RETRY_DELAY
+EXPORT_RETRY_DELAY = 30
+
+# Rows fetched per database round trip (and between progress updates) when streaming
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportLimitReached(Exception):
+    pass
+
+
+# Filters common to the application-based exports; dates bound applied_at (local days)
+APPLICATION_FILTERS = ('job_id', 'status', 'min_match_score', 'start_date', 'end_date')
+
+# export_type -> filter keys its row source applies
+EXPORT_FILTERS = {
+    'APPLICATIONS': APPLICATION_FILTERS,
+    'CANDIDATES': APPLICATION_FILTERS,
+    'JOBS': ('job_id', 'start_date', 'end_date'),
+    'ANALYTICS': (),
+}
+
+
+def clean_filters(export_type, filters):
+    """
+    ``filters`` normalised for storage on the export (JSON types, dates as
+    ISO strings); ValueError if a key is not supported by ``export_type`` or
+    a value is invalid.
+    """
+    if not isinstance(filters, dict):
+        raise ValueError('filters must be an object')
+    allowed = EXPORT_FILTERS.get(export_type, ())
+    unsupported = sorted(set(filters) - set(allowed))
+    if unsupported:
+        raise ValueError(
+            f"Unsupported filters for {export_type} exports: {', '.join(unsupported)}"
+            f" (supported: {', '.join(allowed) or 'none'})"
+        )
+    
+    cleaned = {}
+    for key, value in filters.items():
+        if value in (None, ''):
+            continue
+        try:
+            if key == 'job_id':
+                cleaned[key] = int(value)
+            elif key == 'min_match_score':
+                cleaned[key] = float(value)
+            elif key in ('start_date', 'end_date'):
+                cleaned[key] = date.fromisoformat(str(value)).isoformat()
+            elif key == 'status':
+                if value not in Application.Status.values:
+                    raise ValueError
+                cleaned[key] = value
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for filter {key}: {value!r}")
+    if cleaned.get('start_date') and cleaned.get('end_date') and cleaned['start_date'] > cleaned['end_date']:
+        raise ValueError('start_date must not be after end_date')
+    return cleaned
+
+
+def _date_bounds(field, filters):
+    """Filter kwargs for the ``start_date``/``end_date`` filters on ``field``"""
+    bounds = {}
+    if filters.get('start_date'):
+        bounds[f'{field}__gte'] = start_of_day(date.fromisoformat(filters['start_date']))
+    if filters.get('end_date'):
+        bounds[f'{field}__lt'] = start_of_day(date.fromisoformat(filters['end_date']) + timedelta(days=1))
+    return bounds
+
+
+def filter_applications(applications, filters):
+    """Apply the stored export ``filters`` (see clean_filters) to an Application queryset"""
+    filters = filters or {}
+    if filters.get('job_id'):
+        applications = applications.filter(job_id=filters['job_id'])
+    if filters.get('status'):
+        applications = applications.filter(status=filters['status'])
+    if filters.get('min_match_score') is not None:
+        applications = applications.filter(match_score__gte=filters['min_match_score'])
+    return applications.filter(**_date_bounds('applied_at', filters))
+
+
+def iter_keyset(queryset, key='id', chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the rows of a ``.values()`` queryset in ``key`` order, one
+    ``key > last`` query per chunk. Unlike ``.iterator()``, which mysqlclient
+    serves by buffering the whole result set client-side, each batch is a
+    short, bounded query.
+    """
+    queryset = queryset.order_by(key)
+    batch = list(queryset[:chunk_size])
+    while batch:
+        yield from batch
+        if len(batch) < chunk_size:
+            return
+        batch = list(queryset.filter(**{f'{key}__gt': batch[-1][key]})[:chunk_size])
+
+def applications_rows(recruiter, filters=None):
+    """``(row count, rows)`` for the applications export; rows stream from the database"""
+    applications = filter_applications(
+        Application.objects.filter(job__created_by=recruiter), filters
+    ).values(
+        'id', 'applicant__first_name', 'applicant__last_name', 'applicant__email',
+        'job__title', 'job__company__name', 'status', 'match_score', 'applied_at', 'updated_at',
+        cover_letter_preview=Substr('cover_letter', 1, 100)
+    )
+    
+    def rows():
+        for app in iter_keyset(applications):
+            yield {
+                'Applicant Name': f"{app['applicant__first_name']} {app['applicant__last_name']}".strip(),
+                'Applicant Email': app['applicant__email'],
+                'Job Title': app['job__title'],
+                'Company': app['job__company__name'] or 'N/A',
+                'Status': app['status'],
+                'Match Score': app['match_score'] or 0,
+                'Applied Date': app['applied_at'].strftime('%Y-%m-%d'),
+                'Last Updated': app['updated_at'].strftime('%Y-%m-%d %H:%M'),
+                'Cover Letter Preview': app['cover_letter_preview'] + '...' if app['cover_letter_preview'] else ''
+            }
+    
+    return applications.count(), rows()
+
+def candidates_rows(recruiter, filters=None):
+    """``(row count, rows)`` for the unique candidates export"""
+    candidates = filter_applications(
+        Application.objects.filter(job__created_by=recruiter), filters
+    ).values(
+        'applicant__id',
+        'applicant__first_name',
+        'applicant__last_name',
+        'applicant__email'
+    ).annotate(
+        total_applications=Count('id'),
+        last_application=Max('applied_at'),
+        highest_match_score=Max('match_score')
+    )
+    
+    def rows():
+        for candidate in iter_keyset(candidates, key='applicant__id'):
+            yield {
+                'Candidate ID': candidate['applicant__id'],
+                'First Name': candidate['applicant__first_name'],
+                'Last Name': candidate['applicant__last_name'],
+                'Email': candidate['applicant__email'],
+                'Total Applications': candidate['total_applications'],
+                'Last Application': candidate['last_application'].strftime('%Y-%m-%d') if candidate['last_application'] else 'N/A',
+                'Highest Match Score': candidate['highest_match_score'] or 0
+            }
+    
+    return candidates.count(), rows()
+
+def jobs_rows(recruiter, filters=None):
+    """``(row count, rows)`` for the jobs export; dates bound the job's created_at"""
+    filters = filters or {}
+    recruiter_jobs = Job.objects.filter(created_by=recruiter, **_date_bounds('created_at', filters))
+    if filters.get('job_id'):
+        recruiter_jobs = recruiter_jobs.filter(id=filters['job_id'])
+    jobs = recruiter_jobs.values(
+        'id', 'title', 'company__name', 'created_at', 'closing_date'
+    ).annotate(
+        application_count=Count('applications'),
+        avg_match_score=Avg('applications__match_score'),
+        hired_count=Count('applications', filter=Q(applications__status=Application.Status.ACCEPTED))
+    )
+    
+    today = timezone.localdate()
+    
+    def rows():
+        for job in iter_keyset(jobs):
+            yield {
+                'Job Title': job['title'],
+                'Company': job['company__name'] or 'N/A',
+                # Same rule as Job.is_active
+                'Status': 'Active' if not job['closing_date'] or job['closing_date'] >= today else 'Closed',
+                'Created Date': job['created_at'].strftime('%Y-%m-%d'),
+                'Closing Date': job['closing_date'].strftime('%Y-%m-%d') if job['closing_date'] else 'Open',
+                'Total Applications': job['application_count'],
+                'Hired Candidates': job['hired_count'],
+                'Average Match Score': round(job['avg_match_score'] or 0, 2),
+                'Conversion Rate': f"{round((job['hired_count'] / job['application_count'] * 100) if job['application_count'] > 0 else 0, 2)}%"
+            }
+    
+    return recruiter_jobs.count(), rows()
+
+def analytics_rows(recruiter, filters=None):
+    """``(row count, rows)`` for the analytics summary export (last 30 days; takes no filters)"""
+    end_date = timezone.now().date()
+    start_date = end_date - timedelta(days=30)
+    
+    engine = RecruitmentAnalyticsEngine(recruiter)
+    overview = engine.get_recruiter_overview(30)
+    applications_analysis = engine.get_applications_analysis(start_date, end_date)
+    
+    analytics_data = [{
+        'Metric': 'Total Jobs',
+        'Value': overview.get('total_jobs', 0),
+        'Category': 'Overview'
+    }, {
+        'Metric': 'Active Jobs',
+        'Value': overview.get('active_jobs', 0),
+        'Category': 'Overview'
+    }, {
+        'Metric': 'Total Applications (30 days)',
+        'Value': overview.get('total_applications', 0),
+        'Category': 'Overview'
+    }, {
+        'Metric': 'Conversion Rate',
+        'Value': f"{overview.get('conversion_rate', 0)}%",
+        'Category': 'Overview'
+    }, {
+        'Metric': 'Average Match Score',
+        'Value': f"{overview.get('average_match_score', 0)}%",
+        'Category': 'Overview'
+    }, {
+        'Metric': 'Applications Today',
+        'Value': overview.get('quick_stats', {}).get('applications_today', 0),
+        'Category': 'Quick Stats'
+    }, {
+        'Metric': 'Pending Review',
+        'Value': overview.get('quick_stats', {}).get('pending_review', 0),
+        'Category': 'Quick Stats'
+    }, {
+        'Metric': 'Interviews Scheduled',
+        'Value': overview.get('quick_stats', {}).get('interviews_scheduled', 0),
+        'Category': 'Quick Stats'
+    }, {
+        'Metric': 'New Hires',
+        'Value': overview.get('quick_stats', {}).get('new_hires', 0),
+        'Category': 'Quick Stats'
+    }, {
+        'Metric': 'High Quality Applications',
+        'Value': applications_analysis.get('quality_metrics', {}).get('high_quality', 0),
+        'Category': 'Quality Metrics'
+    }, {
+        'Metric': 'Medium Quality Applications',
+        'Value': applications_analysis.get('quality_metrics', {}).get('medium_quality', 0),
+        'Category': 'Quality Metrics'
+    }, {
+        'Metric': 'Low Quality Applications',
+        'Value': applications_analysis.get('quality_metrics', {}).get('low_quality', 0),
+        'Category': 'Quality Metrics'
+    }]
+    
+    return len(analytics_data), iter(analytics_data)
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to the caller"""
+    def write(self, value):
+        return value
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+def iter_csv_export(rows):
+    """Encode export rows as CSV, one line at a time"""
+    writer = csv.writer(_Echo())
+    headers = None
+    for row in rows:
+        if headers is None:
+            headers = list(row)
+            yield writer.writerow(headers).encode('utf-8')
+        yield writer.writerow([_csv_value(row.get(header, '')) for header in headers]).encode('utf-8')
+    if headers is None:
+        yield "No data available".encode('utf-8')
+
+def iter_ndjson_export(rows):
+    """Encode export rows as newline-delimited JSON, one line at a time"""
+    for row in rows:
+        yield (json.dumps(row, default=str, ensure_ascii=False) + '\n').encode('utf-8')
+
+def generate_json_export(data):
+    """Generate JSON file from data"""
+    def json_serializable(obj):
+        if isinstance(obj, (datetime, timezone.datetime)):
+            return obj.isoformat()
+        elif hasattr(obj, '__dict__'):
+            return obj.__dict__
+        else:
+            return str(obj)
+    
+    return json.dumps(data, indent=2, default=json_serializable, ensure_ascii=False).encode('utf-8')
+
+def write_pdf_export(rows, title, out):
+    """Write export rows to ``out`` as paged PDF tables, up to MAX_PDF_ROWS rows"""
+    rows = iter(rows)
+    first = next(rows, None)
+    styles = get_styles()
+    doc = new_document(out, columns=len(first) if first else 0)
+    story = [
+        Paragraph(f"{title} Export", styles['Heading1']),
+        Paragraph(f"Generated: {timezone.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']),
+        Spacer(1, 20),
+    ]
+    
+    if first is None:
+        story.append(Paragraph("No data available for export.", styles['Normal']))
+    else:
+        story.extend(data_tables(chain([first], rows), doc.width))
+    
+    doc.build(story)
+
+def write_excel_export(rows, sheet_name, out):
+    """Write export rows to ``out`` as a one-sheet workbook, row by row"""
+    rows = iter(rows)
+    first = next(rows, None)
+    workbook = new_workbook()
+    if first is None:
+        write_sheet(workbook, sheet_name, [{'Message': 'No data available for export'}])
+    else:
+        write_sheet(workbook, sheet_name, chain([first], rows))
+    workbook.save(out)
+
+def _write_encoded(encode):
+    """Adapt a line encoder (iter_csv_export, ...) to the file writer signature"""
+    def write(rows, sheet_name, out):
+        for chunk in encode(rows):
+            out.write(chunk)
+    return write
+
+
+# export_type -> (row source, sheet name, filename prefix)
+EXPORT_SOURCES = {
+    'APPLICATIONS': (applications_rows, 'Applications', 'applications'),
+    'CANDIDATES': (candidates_rows, 'Candidates', 'candidates'),
+    'JOBS': (jobs_rows, 'Jobs', 'jobs'),
+    'ANALYTICS': (analytics_rows, 'Analytics', 'analytics'),
+}
+
+# Formats written row by row in constant memory: format -> (encoder, file extension)
+STREAM_WRITERS = {
+    'CSV': (iter_csv_export, 'csv'),
+    'NDJSON': (iter_ndjson_export, 'ndjson'),
+}
+
+# Formats written row by row to a file: format -> (writer(rows, sheet_name, out), file extension)
+FILE_WRITERS = {
+    'CSV': (_write_encoded(iter_csv_export), 'csv'),
+    'NDJSON': (_write_encoded(iter_ndjson_export), 'ndjson'),
+    'EXCEL': (write_excel_export, 'xlsx'),
+    'PDF': (write_pdf_export, 'pdf'),
+}
+
+# Formats built from the full row list: format -> (writer, file extension)
+EXPORT_WRITERS = {
+    'JSON': (lambda data, sheet_name: generate_json_export(data), 'json'),
+}
+
+CONTENT_TYPES = {
+    'EXCEL': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'CSV': 'text/csv; charset=utf-8',
+    'NDJSON': 'application/x-ndjson; charset=utf-8',
+    'JSON': 'application/json; charset=utf-8',
+    'PDF': 'application/pdf'
+}
+
+
+def stale_cutoff():
+    """Active exports last touched before this are treated as abandoned"""
+    return timezone.now() - timedelta(seconds=settings.EXPORT_STALE_AFTER)
+
+
+def stale_exports():
+    """Pending/processing exports abandoned by their worker"""
+    return AnalyticsExport.objects.filter(
+        status__in=AnalyticsExport.ACTIVE_STATUSES, updated_at__lt=stale_cutoff()
+    )
+
+
+def fail_stale_exports():
+    """Mark abandoned pending/processing exports FAILED (they can be retried); returns the count"""
+    now = timezone.now()
+    return stale_exports().update(
+        status='FAILED', error='Export timed out; retry it to run it again', completed_at=now, updated_at=now
+    )
+
+
+def _check_export_limit(recruiter):
+    """Raise ExportLimitReached if ``recruiter`` has no free export slot; call inside atomic()"""
+    # Lock the recruiter row so concurrent requests count slots one at a time
+    get_user_model().objects.select_for_update().filter(pk=recruiter.pk).exists()
+    active = AnalyticsExport.objects.filter(
+        recruiter=recruiter, status__in=AnalyticsExport.ACTIVE_STATUSES, updated_at__gte=stale_cutoff()
+    ).count()
+    limit = settings.EXPORT_MAX_CONCURRENT_PER_RECRUITER
+    if active >= limit:
+        raise ExportLimitReached(
+            f"You already have {active} exports in progress; wait for one to finish (limit {limit})."
+        )
+
+
+def create_export(recruiter, export_type, format, filters=None):
+    """Store a new export and queue it; ``filters`` must already be cleaned (clean_filters). Raises ExportLimitReached"""
+    with transaction.atomic():
+        _check_export_limit(recruiter)
+        export = AnalyticsExport.objects.create(
+            recruiter=recruiter,
+            export_type=export_type,
+            format=format,
+            filters=filters or {},
+        )
+        run_export.enqueue(export.pk)
+    return export
+
+
+def cancel_export(export):
+    """Cancel a pending or running export; returns False if it had already finished"""
+    now = timezone.now()
+    return bool(AnalyticsExport.objects.filter(
+        pk=export.pk, status__in=AnalyticsExport.ACTIVE_STATUSES
+    ).update(status='CANCELLED', completed_at=now, updated_at=now))
+
+
+def retry_export(export):
+    """Re-queue a failed or cancelled export; raises ExportLimitReached"""
+    with transaction.atomic():
+        _check_export_limit(export.recruiter)
+        retried = AnalyticsExport.objects.filter(
+            pk=export.pk, status__in=['FAILED', 'CANCELLED']
+        ).update(
+            status='PENDING', progress=0, attempts=0, error='', started_at=None, completed_at=None,
+            updated_at=timezone.now()
+        )
+        if retried:
+            run_export.enqueue(export.pk)
+    return bool(retried)
+
+
+def report_progress(export_id, progress):
+    """Record progress (0-100); raises ExportCancelled if the export is no longer running"""
+    if not AnalyticsExport.objects.filter(pk=export_id, status='PROCESSING').update(
+        progress=progress, updated_at=timezone.now()
+    ):
+        raise ExportCancelled(export_id)
+
+
+def _with_progress(export_id, rows, row_count):
+    """Pass rows through, recording progress (5-90%) after every chunk"""
+    for done, row in enumerate(rows, 1):
+        yield row
+        if done % EXPORT_CHUNK_SIZE == 0:
+            report_progress(export_id, 5 + 85 * min(done, row_count) // max(row_count, 1))
+
+def export_input_key(export):
+    """
+    Hash of everything an export's file is built from: the recruiter, type,
+    format and filters, plus the recruiter's data watermark (see
+    RecruitmentAnalyticsEngine.data_watermark). The local date is part of it
+    because some rows depend on it (a job's Active/Closed status, the
+    analytics window). Applicant profile edits (name, email) do not move the
+    watermark, so they reach a repeated export the next day.
+    """
+    watermark = RecruitmentAnalyticsEngine(export.recruiter).data_watermark()
+    if watermark is None:
+        # Can't tell whether the data changed, so never match an earlier file
+        watermark = timezone.now()
+    return new_digest(
+        export.recruiter_id, export.export_type, export.format, export.filters, timezone.localdate(), watermark
+    ).hexdigest()
+
+def build_export(export):
+    """
+    Generate the export file and mark the export COMPLETED. If a file was
+    already built from the same inputs (export_input_key) it is reused
+    without querying or rendering the rows again.
+    """
+    fetch, sheet_name, _ = EXPORT_SOURCES.get(
+        export.export_type, (lambda recruiter, filters: (0, iter([])), 'Export', 'export')
+    )
+    if export.format in EXPORT_WRITERS:
+        write, file_extension = EXPORT_WRITERS[export.format]
+    else:
+        write, file_extension = FILE_WRITERS.get(export.format, FILE_WRITERS['EXCEL'])
+    
+    content_hash = export_input_key(export)
+    storage = export.file.storage
+    name = content_addressed_name(export.file, export, content_hash, file_extension)
+    if not storage.exists(name):
+        row_count, rows = fetch(export.recruiter, export.filters)
+        report_progress(export.pk, 5)
+        if export.format in EXPORT_WRITERS:
+            file_content = write(list(rows), sheet_name)
+            report_progress(export.pk, 90)
+            name = save_once(storage, name, ContentFile(file_content))
+        else:
+            # Spool to a temporary file so memory stays flat whatever the row count
+            with tempfile.TemporaryFile() as spool:
+                write(_with_progress(export.pk, rows, row_count), sheet_name, spool)
+                report_progress(export.pk, 90)
+                spool.seek(0)
+                name = save_once(storage, name, File(spool))
+    
+    now = timezone.now()
+    completed = AnalyticsExport.objects.filter(pk=export.pk, status='PROCESSING').update(
+        status='COMPLETED', progress=100, file=name, content_hash=content_hash, completed_at=now, updated_at=now
+    )
+    if not completed:
+        # Cancelled while the file was being written
+        release_file(storage, name)
+        raise ExportCancelled(export.pk)
+
+def stream_export(recruiter, export_type, format, filters=None):
+    """
+    ``(row count, filename, byte iterator)`` for serving a CSV/NDJSON export
+    directly; ``filters`` must already be cleaned (clean_filters)
+    """
+    fetch, _, filename_prefix = EXPORT_SOURCES[export_type]
+    encode, file_extension = STREAM_WRITERS[format]
+    row_count, rows = fetch(recruiter, filters or {})
+    filename = f"{filename_prefix}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
+    return row_count, filename, encode(rows)
+
+
+def process_export(export_id):
+    """Claim and build one export; failures are retried with backoff"""
+    now = timezone.now()
+    claimed = AnalyticsExport.objects.filter(pk=export_id, status='PENDING').update(
+        status='PROCESSING', progress=0, attempts=F('attempts') + 1, started_at=now, updated_at=now
+    )
+    if not claimed:
+        # Cancelled before it started, or already picked up by another worker
+        return
+
+    export = AnalyticsExport.objects.select_related('recruiter').get(pk=export_id)
+    try:
+        build_export(export)
+    except ExportCancelled:
+        logger.info(f"Export {export_id} was cancelled")
+    except Exception as e:
+        logger.exception(f"Export {export_id} failed (attempt {export.attempts})")
+        if export.attempts < settings.EXPORT_MAX_ATTEMPTS:
+            if AnalyticsExport.objects.filter(pk=export_id, status='PROCESSING').update(
+                status='PENDING', error=str(e), updated_at=timezone.now()
+            ):
+                # Delayed on a timer, not by sleeping in a worker (see hirepath.tasks)
+                run_export.enqueue(export_id, countdown=EXPORT_RETRY_DELAY * export.attempts)
+        else:
+            now = timezone.now()
+            AnalyticsExport.objects.filter(pk=export_id, status='PROCESSING').update(
+                status='FAILED', error=str(e), completed_at=now, updated_at=now
+            )
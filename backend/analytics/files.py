@@ -0,0 +1,80 @@
+# analytics/files.py
+"""
+Storage lifecycle for export and report files.
+
+Files are content-addressed: the name is derived from a hash of what goes
+into the file (an export's request and data watermark, or the report
+contents), so exporting unchanged data again finds the stored file before
+any rows are read or rendered. The hash is taken over the inputs rather
+than the file bytes, which also differ run to run because XLSX and PDF embed
+creation timestamps.
+
+Several rows may point at one file, so a file is only deleted once nothing
+references it (``release_file``). ``expire_exports`` clears references older
+than ``EXPORT_FILE_TTL_DAYS`` and releases their files.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+
+def new_digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        update_digest(digest, part)
+    return digest
+
+
+def update_digest(digest, value):
+    digest.update(json.dumps(value, sort_keys=True, default=str).encode('utf-8'))
+    digest.update(b'\n')
+
+
+def content_addressed_name(field_file, instance, content_hash, extension):
+    """Storage name for a file with ``content_hash``, under the field's upload_to"""
+    return field_file.field.generate_filename(instance, f"{content_hash}.{extension}")
+
+
+def save_once(storage, name, content):
+    """Save ``content`` as ``name`` unless an identical file is already stored; returns the name"""
+    if storage.exists(name):
+        return name
+    return storage.save(name, content)
+
+
+def is_referenced(name):
+    from .models import AnalyticsExport, RecruitmentReport
+    return (
+        AnalyticsExport.objects.filter(file=name).exists()
+        or RecruitmentReport.objects.filter(exported_file=name).exists()
+    )
+
+
+def release_file(storage, name):
+    """Delete ``name`` from storage if no export or report refers to it any more"""
+    if name and not is_referenced(name):
+        storage.delete(name)
+        return True
+    return False
+
+
+def file_download_response(field_file, filename, content_type):
+    """
+    Serve a stored file as an attachment without reading it into memory.
+
+    With ``EXPORT_X_ACCEL_REDIRECT_PREFIX`` set (e.g. ``/protected-media/``,
+    an nginx ``internal`` location aliased to MEDIA_ROOT) the web server sends
+    the file; otherwise Django streams it with FileResponse.
+    """
+    prefix = getattr(settings, 'EXPORT_X_ACCEL_REDIRECT_PREFIX', '')
+    if prefix:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + field_file.name.lstrip('/')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    response = FileResponse(field_file.open('rb'), as_attachment=True, filename=filename)
+    response['Content-Type'] = content_type
+    return response
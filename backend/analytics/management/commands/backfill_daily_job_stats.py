@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.rollups import rebuild_daily_job_stats
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the DailyJobStats rollups from applications and status events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First date to rebuild (YYYY-MM-DD); default: all history')
+        parser.add_argument('--end', help='Last date to rebuild (YYYY-MM-DD); required with --start')
+        parser.add_argument('--recruiter', type=int, help='Only rebuild jobs created by this user id')
+        parser.add_argument('--chunk-size', type=int, default=200, help='Jobs rebuilt per transaction')
+
+    def handle(self, *args, **options):
+        start_date = end_date = None
+        if options['start'] or options['end']:
+            if not (options['start'] and options['end']):
+                raise CommandError('--start and --end must be given together')
+            try:
+                start_date = datetime.strptime(options['start'], '%Y-%m-%d').date()
+                end_date = datetime.strptime(options['end'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Dates must be YYYY-MM-DD')
+
+        jobs = Job.objects.order_by('pk')
+        if options['recruiter']:
+            jobs = jobs.filter(created_by_id=options['recruiter'])
+        job_ids = list(jobs.values_list('pk', flat=True))
+
+        buckets = 0
+        chunk_size = options['chunk_size']
+        for offset in range(0, len(job_ids), chunk_size):
+            buckets += rebuild_daily_job_stats(job_ids[offset:offset + chunk_size], start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {buckets} daily buckets for {len(job_ids)} jobs.'))
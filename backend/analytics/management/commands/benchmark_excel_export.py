@@ -0,0 +1,90 @@
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.exports import write_excel_export
+
+
+def synthetic_rows(count, seed=42):
+    """Rows shaped like the applications export, generated lazily"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    statuses = ['PENDING', 'REVIEWED', 'SHORTLISTED', 'INTERVIEW', 'HIRED', 'REJECTED']
+    for i in range(count):
+        applied = start + timedelta(minutes=rng.randint(0, 500000))
+        yield {
+            'Applicant Name': f'Graduate {i}',
+            'Applicant Email': f'graduate{i}@example.com',
+            'Job Title': f'Job {rng.randint(1, 500)}',
+            'Company': f'Company {rng.randint(1, 50)}',
+            'Status': rng.choice(statuses),
+            'Match Score': round(rng.uniform(0, 100), 1),
+            'Applied Date': applied.strftime('%Y-%m-%d'),
+            'Last Updated': (applied + timedelta(days=rng.randint(0, 30))).strftime('%Y-%m-%d %H:%M'),
+            'Cover Letter Preview': 'I am excited to apply for this role ' * rng.randint(0, 3),
+        }
+
+
+def legacy_excel_export(rows, sheet_name, out):
+    """The previous implementation: DataFrame + normal-mode openpyxl + a full pass for widths"""
+    df = pd.DataFrame(list(rows))
+    with pd.ExcelWriter(out, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+        worksheet = writer.sheets[sheet_name]
+        for column in worksheet.columns:
+            max_length = max(len(str(cell.value)) for cell in column)
+            worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the write-only Excel exporter against the previous pandas exporter on synthetic rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', default='10000,100000,1000000', help='Comma-separated row counts')
+        parser.add_argument(
+            '--legacy-max', type=int, default=100000,
+            help='Skip the legacy exporter above this many rows (it holds every cell in memory)'
+        )
+        parser.add_argument('--memory', action='store_true', help='Also report peak Python memory (slower)')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['rows'].split(',')]
+        except ValueError:
+            raise CommandError('--rows must be comma-separated integers')
+
+        writers = {
+            'legacy (pandas)': legacy_excel_export,
+            'write-only': write_excel_export,
+        }
+        for size in sizes:
+            self.stdout.write(f"{size} rows")
+            for label, write in writers.items():
+                if write is legacy_excel_export and size > options['legacy_max']:
+                    self.stdout.write(f"  {label:<16} skipped (--legacy-max {options['legacy_max']})")
+                    continue
+                elapsed, file_size, peak = self.run(write, size, options['memory'])
+                line = f"  {label:<16} {elapsed:8.2f}s  {file_size / 1024 / 1024:8.1f} MB file"
+                if peak is not None:
+                    line += f"  {peak / 1024 / 1024:8.1f} MB peak"
+                self.stdout.write(line)
+
+    def run(self, write, size, trace_memory):
+        with tempfile.TemporaryFile() as out:
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            write(synthetic_rows(size), 'Applications', out)
+            elapsed = time.perf_counter() - started
+            peak = None
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            out.seek(0, os.SEEK_END)
+            return elapsed, out.tell(), peak
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from analytics.exports import fail_stale_exports, stale_exports
+from analytics.files import release_file
+from analytics.models import AnalyticsExport, RecruitmentReport
+
+
+class Command(BaseCommand):
+    help = (
+        'Expire export and report files older than EXPORT_FILE_TTL_DAYS, delete unreferenced files '
+        'and fail exports abandoned for longer than EXPORT_STALE_AFTER'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.EXPORT_FILE_TTL_DAYS,
+            help='Expire files created more than this many days ago'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be expired')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        exports = AnalyticsExport.objects.filter(status='COMPLETED', completed_at__lt=cutoff)
+        reports = RecruitmentReport.objects.exclude(
+            Q(exported_file='') | Q(exported_file__isnull=True)
+        ).filter(Q(exported_at__lt=cutoff) | Q(exported_at__isnull=True, generated_at__lt=cutoff))
+
+        names = set(exports.exclude(file='').values_list('file', flat=True))
+        names |= set(reports.values_list('exported_file', flat=True))
+
+        if options['dry_run']:
+            self.stdout.write(
+                f"Would expire {exports.count()} exports and {reports.count()} report files "
+                f"({len(names)} stored files) older than {cutoff:%Y-%m-%d %H:%M} "
+                f"and fail {stale_exports().count()} stale exports"
+            )
+            return
+
+        # Pending/processing exports whose worker is gone would otherwise hold a concurrency slot forever
+        failed = fail_stale_exports()
+
+        expired_exports = exports.update(status='EXPIRED', file='')
+        expired_reports = reports.update(exported_file='', is_exported=False)
+
+        # Files may still be shared with newer exports of identical data
+        deleted = sum(release_file(default_storage, name) for name in names)
+        self.stdout.write(
+            f"Expired {expired_exports} exports and {expired_reports} report files; "
+            f"deleted {deleted} of {len(names)} stored files; failed {failed} stale exports"
+        )
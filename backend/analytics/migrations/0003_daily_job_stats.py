@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_alter_analyticsexport_export_type_and_more'),
+        ('jobs', '0005_job_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyJobStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('status_pending', models.PositiveIntegerField(default=0)),
+                ('status_reviewed', models.PositiveIntegerField(default=0)),
+                ('status_shortlisted', models.PositiveIntegerField(default=0)),
+                ('status_interview', models.PositiveIntegerField(default=0)),
+                ('status_hired', models.PositiveIntegerField(default=0)),
+                ('status_rejected', models.PositiveIntegerField(default=0)),
+                ('status_withdrawn', models.PositiveIntegerField(default=0)),
+                ('scored', models.PositiveIntegerField(default=0)),
+                ('score_total', models.FloatField(default=0)),
+                ('min_score', models.FloatField(blank=True, null=True)),
+                ('max_score', models.FloatField(blank=True, null=True)),
+                ('hires', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.job')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('job', 'date')},
+            },
+        ),
+    ]
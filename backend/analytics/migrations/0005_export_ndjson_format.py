@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_export_progress'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analyticsexport',
+            name='format',
+            field=models.CharField(choices=[('EXCEL', 'Excel'), ('CSV', 'CSV'), ('NDJSON', 'NDJSON'), ('PDF', 'PDF'), ('JSON', 'JSON')], default='EXCEL', max_length=10),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:36
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_exported_at(apps, schema_editor):
+    # Best available approximation for files exported before exported_at existed
+    RecruitmentReport = apps.get_model('analytics', 'RecruitmentReport')
+    RecruitmentReport.objects.filter(is_exported=True, exported_at__isnull=True).update(
+        exported_at=F('last_accessed')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_export_ndjson_format'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticsexport',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='recruitmentreport',
+            name='exported_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='analyticsexport',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled'), ('EXPIRED', 'Expired')], default='PENDING', max_length=20),
+        ),
+        migrations.RunPython(backfill_exported_at, migrations.RunPython.noop),
+    ]
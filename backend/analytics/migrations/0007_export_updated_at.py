@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_export_file_lifecycle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticsexport',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
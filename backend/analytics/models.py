@@ -42,6 +42,7 @@ class RecruitmentReport(models.Model):
     export_format = models.CharField(max_length=10, choices=EXPORT_FORMATS, blank=True, null=True)
     exported_file = models.FileField(upload_to='reports/exports/', blank=True, null=True)
     is_exported = models.BooleanField(default=False)
+    exported_at = models.DateTimeField(blank=True, null=True)
     
     # Metadata
     generated_at = models.DateTimeField(auto_now_add=True)
@@ -85,6 +86,7 @@ class AnalyticsExport(models.Model):
     FORMAT_CHOICES = [
         ('EXCEL', 'Excel'),
         ('CSV', 'CSV'),
+        ('NDJSON', 'NDJSON'),
         ('PDF', 'PDF'),
         ('JSON', 'JSON')
     ]
@@ -93,20 +95,79 @@ class AnalyticsExport(models.Model):
         ('PENDING', 'Pending'),
         ('PROCESSING', 'Processing'),
         ('COMPLETED', 'Completed'),
-        ('FAILED', 'Failed')
+        ('FAILED', 'Failed'),
+        ('CANCELLED', 'Cancelled'),
+        ('EXPIRED', 'Expired')
     ]
     
+    # Exports in these states count against the per-recruiter concurrency limit
+    ACTIVE_STATUSES = ['PENDING', 'PROCESSING']
+    
     recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name="exports")
     export_type = models.CharField(max_length=20, choices=EXPORT_TYPES)
     filters = models.JSONField(default=dict)
     format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='EXCEL')
     file = models.FileField(upload_to='exports/', blank=True, null=True)
+    # Hash of the exported data; files are stored under it and shared by identical exports
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
     completed_at = models.DateTimeField(blank=True, null=True)
+    # Last time the pipeline touched the row; active exports idle longer than EXPORT_STALE_AFTER are abandoned
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recruiter', 'status'], name='export_recruiter_status_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.export_type} - {self.recruiter.username}"
\ No newline at end of file
+        return f"{self.export_type} - {self.recruiter.username}"
+
+
+class DailyJobStats(models.Model):
+    """
+    Per-job, per-day rollup read by the recruiter dashboard.
+
+    Application counts, status breakdown and score stats cover applications
+    submitted on ``date`` (local time), by their current status; ``hires``
+    counts transitions to hired recorded on ``date``. Rows are recomputed
+    from source whenever an application in the bucket changes (see
+    ``analytics.rollups``) and can be rebuilt with ``backfill_daily_job_stats``.
+    """
+    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    
+    applications = models.PositiveIntegerField(default=0)
+    status_pending = models.PositiveIntegerField(default=0)
+    status_reviewed = models.PositiveIntegerField(default=0)
+    status_shortlisted = models.PositiveIntegerField(default=0)
+    status_interview = models.PositiveIntegerField(default=0)
+    status_hired = models.PositiveIntegerField(default=0)
+    status_rejected = models.PositiveIntegerField(default=0)
+    status_withdrawn = models.PositiveIntegerField(default=0)
+    
+    # Sum/count rather than an average so buckets can be combined exactly
+    scored = models.PositiveIntegerField(default=0)
+    score_total = models.FloatField(default=0)
+    min_score = models.FloatField(null=True, blank=True)
+    max_score = models.FloatField(null=True, blank=True)
+    
+    hires = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['job', 'date']
+        ordering = ['date']
+    
+    def __str__(self):
+        return f"{self.job_id} @ {self.date}: {self.applications} applications"
+    
+    @property
+    def avg_score(self):
+        return self.score_total / self.scored if self.scored else None
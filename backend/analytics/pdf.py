@@ -0,0 +1,116 @@
+# analytics/pdf.py
+"""
+PDF output for exports and reports.
+
+Row data is laid out as a series of small tables of ``ROWS_PER_TABLE`` rows,
+each repeating the header, instead of one table holding every row: ReportLab
+lays out and splits a table as a whole, so one big table costs far more time
+and memory than the same rows in page-sized pieces. Column widths are fixed
+up front from a sample of rows, so every piece lines up and no table has to
+measure its cells. Output stops at a row cap with a note saying so.
+
+The stylesheet and table styles are built once and shared by every document.
+"""
+from functools import lru_cache
+from itertools import chain, islice
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+ROWS_PER_TABLE = 40
+MAX_PDF_ROWS = 5000
+MAX_CELL_LENGTH = 50
+WIDTH_SAMPLE_ROWS = 200
+
+# Wider tables than this switch the page to landscape
+PORTRAIT_MAX_COLUMNS = 6
+
+DATA_TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 8),
+    ('FONT', (0, 1), (-1, -1), 'Helvetica', 7),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+KEY_VALUE_TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, -1), 'Helvetica', 9),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+INFO_TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, -1), 'Helvetica', 10),
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+
+@lru_cache(maxsize=None)
+def get_styles():
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle('ReportTitle', parent=styles['Heading1'], fontSize=16, spaceAfter=30))
+    return styles
+
+
+def new_document(out, columns=0):
+    """A document writing to ``out``; landscape when a table has many columns"""
+    pagesize = landscape(A4) if columns > PORTRAIT_MAX_COLUMNS else A4
+    return SimpleDocTemplate(out, pagesize=pagesize, leftMargin=36, rightMargin=36, topMargin=36, bottomMargin=36)
+
+
+def cell_text(value):
+    text = '' if value is None else str(value)
+    if len(text) > MAX_CELL_LENGTH:
+        text = text[:MAX_CELL_LENGTH - 3] + '...'
+    return text
+
+
+def column_widths(headers, sample, available_width):
+    """Split ``available_width`` between columns in proportion to their sampled text length"""
+    lengths = [
+        max([len(cell_text(header))] + [len(cell_text(row.get(header))) for row in sample]) or 1
+        for header in headers
+    ]
+    total = sum(lengths)
+    return [available_width * length / total for length in lengths]
+
+
+def data_tables(rows, available_width, headers=None, max_rows=MAX_PDF_ROWS):
+    """
+    Yield flowables for ``rows`` (dicts): tables of ``ROWS_PER_TABLE`` rows and,
+    if there were more than ``max_rows`` rows, a note that the rest was left out.
+    Rows are consumed lazily, and no further than ``max_rows + 1``.
+    """
+    rows = iter(rows)
+    sample = list(islice(rows, min(WIDTH_SAMPLE_ROWS, max_rows + 1)))
+    if headers is None:
+        headers = list(sample[0]) if sample else []
+    if not headers:
+        return
+    widths = column_widths(headers, sample, available_width)
+    header_row = [cell_text(header) for header in headers]
+
+    remaining = chain(sample, islice(rows, max_rows + 1 - len(sample)))
+    written = 0
+    while written < max_rows:
+        chunk = list(islice(remaining, min(ROWS_PER_TABLE, max_rows - written)))
+        if not chunk:
+            break
+        table = Table(
+            [header_row] + [[cell_text(row.get(header)) for header in headers] for row in chunk],
+            colWidths=widths,
+        )
+        table.setStyle(DATA_TABLE_STYLE)
+        yield table
+        written += len(chunk)
+
+    if next(remaining, None) is not None:
+        yield Spacer(1, 10)
+        yield Paragraph(
+            f"Only the first {max_rows:,} rows are shown. Export as CSV or Excel for the complete data.",
+            get_styles()['Italic'],
+        )
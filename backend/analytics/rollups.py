@@ -0,0 +1,132 @@
+# analytics/rollups.py
+"""
+Maintain ``DailyJobStats`` rollups.
+
+A bucket is ``(job_id, date)``. Buckets are always recomputed from the
+source rows with grouped aggregates, never adjusted by deltas, so a refresh
+is idempotent and safe to repeat or run concurrently.
+"""
+from collections import defaultdict
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum, Min, Max, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from applications.models import Application, ApplicationStatusEvent
+from hirepath.dates import date_range_filter
+from hirepath.tasks import background_task
+from .models import DailyJobStats
+
+# Application status value -> DailyJobStats column
+STATUS_FIELDS = {value: f'status_{value.lower()}' for value in Application.Status.values}
+
+ROLLUP_FIELDS = [
+    'applications', *STATUS_FIELDS.values(), 'scored', 'score_total', 'min_score', 'max_score', 'hires',
+]
+
+
+def rollup_buckets(applications):
+    """Buckets touched by a change to these applications"""
+    buckets = set()
+    for application in applications:
+        if application.applied_at:
+            buckets.add((application.job_id, timezone.localdate(application.applied_at)))
+        if application.status == Application.Status.ACCEPTED and application.status_changed_at:
+            buckets.add((application.job_id, timezone.localdate(application.status_changed_at)))
+    return buckets
+
+
+def compute_rollups(job_ids=None, start_date=None, end_date=None):
+    """
+    ``{(job_id, date): {field: value}}`` for every bucket with data, from two
+    grouped queries (applications by applied day, hires by transition day).
+    """
+    applications = Application.objects.all()
+    hires = ApplicationStatusEvent.objects.filter(to_status=Application.Status.ACCEPTED)
+    if job_ids is not None:
+        applications = applications.filter(job_id__in=job_ids)
+        hires = hires.filter(job_id__in=job_ids)
+    if start_date is not None:
+        applications = applications.filter(**date_range_filter('applied_at', start_date, end_date))
+        hires = hires.filter(**date_range_filter('at', start_date, end_date))
+
+    rows = defaultdict(dict)
+    grouped = applications.annotate(day=TruncDate('applied_at')).values('job_id', 'day').annotate(
+        applications=Count('id'),
+        scored=Count('match_score'),
+        score_total=Sum('match_score'),
+        min_score=Min('match_score'),
+        max_score=Max('match_score'),
+        **{field: Count('id', filter=Q(status=value)) for value, field in STATUS_FIELDS.items()}
+    ).order_by()
+    for row in grouped:
+        key = (row.pop('job_id'), row.pop('day'))
+        row['score_total'] = row['score_total'] or 0
+        rows[key].update(row)
+
+    hire_counts = hires.annotate(day=TruncDate('at')).values('job_id', 'day').annotate(
+        hires=Count('id')
+    ).order_by()
+    for row in hire_counts:
+        rows[(row['job_id'], row['day'])]['hires'] = row['hires']
+    return rows
+
+
+def save_rollups(rows):
+    """Upsert ``{(job_id, date): fields}``; missing fields are written as zero/empty"""
+    empty = {field: None if field in ('min_score', 'max_score') else 0 for field in ROLLUP_FIELDS}
+    stats = [
+        DailyJobStats(job_id=job_id, date=day, **{**empty, **fields})
+        for (job_id, day), fields in rows.items()
+    ]
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target; it upserts
+    # through the unique (job, date) constraint
+    conflict_target = {}
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_target['unique_fields'] = ['job', 'date']
+    DailyJobStats.objects.bulk_create(
+        stats,
+        batch_size=500,
+        update_conflicts=True,
+        update_fields=ROLLUP_FIELDS + ['updated_at'],
+        **conflict_target
+    )
+
+
+def refresh_buckets(buckets):
+    """Recompute the given ``(job_id, date)`` buckets, zeroing ones that are now empty"""
+    days_by_job = defaultdict(set)
+    for job_id, day in buckets:
+        days_by_job[job_id].add(day)
+
+    rows = {}
+    for job_id, days in days_by_job.items():
+        computed = compute_rollups([job_id], min(days), max(days))
+        for day in days:
+            rows[(job_id, day)] = computed.get((job_id, day), {})
+    save_rollups(rows)
+
+
+@background_task
+def refresh_daily_job_stats(buckets):
+    refresh_buckets((job_id, date.fromisoformat(day)) for job_id, day in buckets)
+
+
+def queue_rollup_refresh(buckets):
+    if buckets:
+        # ISO dates so the arguments survive a JSON task queue
+        refresh_daily_job_stats.enqueue([[job_id, day.isoformat()] for job_id, day in sorted(buckets)])
+
+
+def rebuild_daily_job_stats(job_ids, start_date=None, end_date=None):
+    """Replace the rollups of ``job_ids`` (optionally only within a date range)"""
+    rows = compute_rollups(job_ids, start_date, end_date)
+    existing = DailyJobStats.objects.filter(job_id__in=job_ids)
+    if start_date is not None:
+        existing = existing.filter(date__range=[start_date, end_date])
+    with transaction.atomic():
+        existing.delete()
+        save_rollups(rows)
+    return len(rows)
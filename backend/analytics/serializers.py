@@ -12,10 +12,10 @@ class RecruitmentReportSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'report_type', 'description', 'recruiter', 'recruiter_name',
             'date_range_start', 'date_range_end', 'filters_applied', 'report_data',
-            'export_format', 'exported_file', 'file_url', 'is_exported',
+            'export_format', 'exported_file', 'file_url', 'is_exported', 'exported_at',
             'generated_at', 'last_accessed', 'report_period'  # ADDED 'report_period'
         ]
-        read_only_fields = ['id', 'recruiter', 'generated_at', 'last_accessed']
+        read_only_fields = ['id', 'recruiter', 'generated_at', 'last_accessed', 'exported_at']
     
     def get_report_period(self, obj):
         return f"{obj.date_range_start} to {obj.date_range_end}"
@@ -32,6 +32,35 @@ class DashboardViewSerializer(serializers.ModelSerializer):
         model = DashboardView
         fields = ['id', 'name', 'widget_config', 'filters', 'is_default', 'created_at', 'updated_at']
         read_only_fields = ['id', 'recruiter', 'created_at', 'updated_at']
+    
+    def validate_widget_config(self, value):
+        from .trends import BUCKETS
+        from .widgets import MAX_DAYS, WIDGETS, configured_widgets
+        
+        widgets = configured_widgets(value)
+        unknown = sorted({str(widget.get('type')) for widget in widgets if widget.get('type') not in WIDGETS})
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown widget types: {', '.join(unknown)}. Available: {', '.join(WIDGETS)}"
+            )
+        
+        for widget in widgets:
+            label = f"Widget {widget.get('id', widget['type'])}"
+            options = widget.get('options')
+            if options is None:
+                continue
+            if not isinstance(options, dict):
+                raise serializers.ValidationError(f"{label}: options must be an object")
+            for key, low, high in (('days', 1, MAX_DAYS), ('cache_ttl', 0, None)):
+                if key not in options:
+                    continue
+                number = options[key]
+                if isinstance(number, bool) or not isinstance(number, int) or number < low or (high and number > high):
+                    bounds = f"between {low} and {high}" if high else f"at least {low}"
+                    raise serializers.ValidationError(f"{label}: {key} must be a whole number {bounds}")
+            if 'bucket' in options and options['bucket'] not in BUCKETS:
+                raise serializers.ValidationError(f"{label}: bucket must be one of {', '.join(BUCKETS)}")
+        return value
 
 class AnalyticsExportSerializer(serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
@@ -40,9 +69,13 @@ class AnalyticsExportSerializer(serializers.ModelSerializer):
         model = AnalyticsExport
         fields = [
             'id', 'export_type', 'filters', 'format', 'file', 'file_url',
-            'status', 'created_at', 'completed_at'
+            'status', 'progress', 'attempts', 'error',
+            'created_at', 'started_at', 'completed_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'status', 'progress', 'attempts', 'error',
+            'created_at', 'started_at', 'completed_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'completed_at']
     
     def get_file_url(self, obj):
         if obj.file:
@@ -69,4 +102,38 @@ class ExportRequestSerializer(serializers.Serializer):
     format = serializers.ChoiceField(choices=AnalyticsExport.FORMAT_CHOICES)
     filters = serializers.JSONField(required=False, default=dict)
     date_range_start = serializers.DateField(required=False)
-    date_range_end = serializers.DateField(required=False)
\ No newline at end of file
+    date_range_end = serializers.DateField(required=False)
+    
+    def validate(self, data):
+        from .exports import clean_filters
+        
+        filters = data.get('filters') or {}
+        if not isinstance(filters, dict):
+            raise serializers.ValidationError({'filters': 'filters must be an object'})
+        # date_range_start/end are shorthand for the start_date/end_date filters
+        filters = dict(filters)
+        for field, key in (('date_range_start', 'start_date'), ('date_range_end', 'end_date')):
+            if data.get(field):
+                filters[key] = data[field].isoformat()
+        try:
+            data['filters'] = clean_filters(data['export_type'], filters)
+        except ValueError as e:
+            raise serializers.ValidationError({'filters': str(e)})
+        return data
+
+class ExportStreamSerializer(serializers.Serializer):
+    export_type = serializers.ChoiceField(choices=AnalyticsExport.EXPORT_TYPES)
+    # Not "format": DRF reserves ?format= for renderer selection
+    file_format = serializers.ChoiceField(choices=[('CSV', 'CSV'), ('NDJSON', 'NDJSON')], default='CSV')
+    
+    def validate(self, data):
+        from .exports import EXPORT_FILTERS, clean_filters
+        
+        # Filters are plain query parameters here (?job_id=&status=...)
+        filter_keys = {key for keys in EXPORT_FILTERS.values() for key in keys}
+        filters = {key: self.initial_data.get(key) for key in filter_keys if key in self.initial_data}
+        try:
+            data['filters'] = clean_filters(data['export_type'], filters)
+        except ValueError as e:
+            raise serializers.ValidationError({'filters': str(e)})
+        return data
@@ -0,0 +1,47 @@
+# analytics/signals.py
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import User
+from applications.models import Application, ApplicationStatusEvent
+from applications.signals import applications_updated
+from hirepath.caching import bump_namespace_version
+from jobs.models import Job
+from skills.models import Skill
+from .analytics_engine import SKILLS_CACHE_NAMESPACE
+from .rollups import queue_rollup_refresh, rollup_buckets
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def application_written(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    queue_rollup_refresh(rollup_buckets([instance]))
+
+
+@receiver(applications_updated)
+def applications_bulk_written(sender, applications, **kwargs):
+    queue_rollup_refresh(rollup_buckets(applications))
+
+
+@receiver(post_save, sender=ApplicationStatusEvent)
+def status_event_written(sender, instance, created, raw=False, **kwargs):
+    """Application.save() writes the hire event after its own post_save"""
+    if created and not raw and instance.to_status == Application.Status.ACCEPTED:
+        queue_rollup_refresh({(instance.job_id, timezone.localdate(instance.at))})
+
+
+@receiver(m2m_changed, sender=Job.skills_required.through)
+@receiver(m2m_changed, sender=User.skills.through)
+def skills_changed(sender, action, **kwargs):
+    """Skill M2M rows carry no updated_at, so report watermarks follow this version instead"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_namespace_version(SKILLS_CACHE_NAMESPACE)
+
+
+@receiver(post_delete, sender=Skill)
+def skill_deleted(sender, instance, **kwargs):
+    # Deleting a skill removes its M2M rows without m2m_changed
+    bump_namespace_version(SKILLS_CACHE_NAMESPACE)
@@ -0,0 +1,9 @@
+# analytics/tasks.py
+from hirepath.tasks import background_task
+
+
+@background_task
+def run_export(export_id):
+    """Build one AnalyticsExport (see analytics.exports)"""
+    from .exports import process_export
+    process_export(export_id)
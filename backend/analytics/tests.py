@@ -1,3 +1,796 @@
-from django.test import TestCase
+import csv
+import json
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import openpyxl
+from PyPDF2 import PdfReader
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db.models import Count, F
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from reportlab.platypus import Table
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from applications.models import Application, ApplicationStatusEvent
+from companies.models import Company
+from jobs.models import Job
+from skills.models import Skill
+
+from . import exports
+from .analytics_engine import RecruitmentAnalyticsEngine
+from .files import release_file
+from .models import AnalyticsExport, DailyJobStats, DashboardView
+from .pdf import data_tables
+from .rollups import rebuild_daily_job_stats, save_rollups
+from .trends import fill_trend
+
+
+class RecruiterDataMixin:
+    """Two jobs with six applications of known status and score"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='analysis_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Analysis Co', location='Cape Town', created_by=cls.recruiter)
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Analysis test job',
+                company=company,
+                location='Cape Town',
+                employment_type=Job.EMPLOYMENT_TYPES[0][0],
+                work_type=Job.WORK_TYPES[0][0],
+                experience_level=Job.EXPERIENCE_LEVELS[0][0],
+                created_by=cls.recruiter,
+            )
+            for i in range(2)
+        ]
+        graduates = User.objects.bulk_create(
+            [User(username=f'analysis_graduate_{i}', role='GRADUATE') for i in range(6)]
+        )
+        if not all(graduate.pk for graduate in graduates):
+            graduates = list(User.objects.filter(username__startswith='analysis_graduate_'))
+
+        now = timezone.now()
+        statuses = [
+            Application.Status.PENDING, Application.Status.ACCEPTED, Application.Status.REJECTED,
+            Application.Status.ACCEPTED, Application.Status.PENDING, Application.Status.REVIEWED,
+        ]
+        scores = [95.0, 85.0, 70.0, 65.0, 40.0, None]
+        # bulk_create skips save(), so no scoring runs while seeding
+        Application.objects.bulk_create([
+            Application(
+                job=cls.jobs[i % 2],
+                applicant=graduate,
+                status=statuses[i],
+                match_score=scores[i],
+                applied_at=now - timedelta(days=i),
+            )
+            for i, graduate in enumerate(graduates)
+        ])
+
+
+class ApplicationsAnalysisTests(RecruiterDataMixin, TestCase):
+    """
+    get_applications_analysis backs the analytics dashboard and every report,
+    so its query count must not grow with the number of statuses or buckets.
+    """
+
+    def analyze(self, filters=None):
+        end_date = timezone.localdate()
+        engine = RecruitmentAnalyticsEngine(self.recruiter)
+        return engine.get_applications_analysis(end_date - timedelta(days=30), end_date, filters)
+
+    def test_query_count_is_constant(self):
+        # One conditional aggregate, one per-job breakdown, one daily trend
+        with self.assertNumQueries(3):
+            self.analyze()
+        with self.assertNumQueries(3):
+            self.analyze({'status': Application.Status.PENDING, 'min_match_score': 50})
+
+    def test_summary_and_quality_metrics(self):
+        analysis = self.analyze()
+
+        self.assertEqual(analysis['summary']['total_applications'], 6)
+        self.assertEqual(analysis['summary']['applications_by_status'], {
+            Application.Status.PENDING: 2,
+            Application.Status.ACCEPTED: 2,
+            Application.Status.REJECTED: 1,
+            Application.Status.REVIEWED: 1,
+        })
+        self.assertEqual(analysis['summary']['average_match_score'], 71.0)
+        self.assertEqual(analysis['quality_metrics'], {
+            'high_quality': 2,
+            'medium_quality': 2,
+            'low_quality': 1,
+        })
+        self.assertEqual(sum(day['count'] for day in analysis['trends']['daily_applications']), 6)
+
+    def test_breakdown_counts_hires(self):
+        breakdown = {item['job__id']: item for item in self.analyze()['detailed_breakdown']}
+
+        self.assertEqual(breakdown[self.jobs[0].id]['total'], 3)
+        self.assertEqual(breakdown[self.jobs[0].id]['hired'], 0)
+        self.assertEqual(breakdown[self.jobs[1].id]['hired'], 2)
+        self.assertEqual(breakdown[self.jobs[1].id]['conversion_rate'], 66.67)
+
+    def test_source_conversion_counts_hires(self):
+        end_date = timezone.localdate()
+        engine = RecruitmentAnalyticsEngine(self.recruiter)
+        source = engine.get_source_analysis(end_date - timedelta(days=30), end_date)['source_performance'][0]
+        self.assertEqual((source['total_applications'], source['conversion_rate']), (6, 33.33))
+
+
+class ReportFramesTests(RecruiterDataMixin, TestCase):
+    """Columnar metrics computed from one load of each frame"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        events = []
+        for application in Application.objects.filter(job__in=cls.jobs):
+            events.append(ApplicationStatusEvent(
+                application=application, job=application.job,
+                to_status=Application.Status.PENDING, at=application.applied_at,
+            ))
+            if application.status == Application.Status.ACCEPTED:
+                # Hired 1 and 2 days after applying
+                days = 1 if application.match_score == 85.0 else 2
+                events.append(ApplicationStatusEvent(
+                    application=application, job=application.job,
+                    from_status=Application.Status.PENDING, to_status=Application.Status.ACCEPTED,
+                    at=application.applied_at + timedelta(days=days),
+                ))
+        ApplicationStatusEvent.objects.bulk_create(events)
+
+    def frames(self):
+        # applied_at is auto_now_add, so the hires fall in the coming days
+        today = timezone.localdate()
+        return RecruitmentAnalyticsEngine(self.recruiter).frames(today - timedelta(days=30), today + timedelta(days=3))
+
+    def test_time_to_hire_distribution(self):
+        distribution = self.frames().time_to_hire_distribution()
+        self.assertEqual(distribution['hires'], 2)
+        self.assertEqual(distribution['mean_days'], 1.5)
+        self.assertEqual(distribution['median_days'], 1.5)
+        self.assertEqual(distribution['p90_days'], 1.9)
+
+    def test_score_histogram(self):
+        histogram = self.frames().score_histogram()
+        counts = {band['range']: band['count'] for band in histogram['bins']}
+        self.assertEqual(counts['90-100'], 1)
+        self.assertEqual(counts['60-70'], 1)
+        self.assertEqual(counts['40-50'], 1)
+        self.assertEqual(sum(counts.values()), 5)
+        self.assertEqual(histogram['unscored'], 1)
+
+    def test_job_funnels_and_cohorts_share_one_load(self):
+        frames = self.frames()
+        with self.assertNumQueries(2):
+            funnels = frames.job_funnels()
+            cohorts = frames.weekly_cohorts()
+
+        by_job = {funnel['job_id']: funnel for funnel in funnels}
+        hiring_job = by_job[self.jobs[1].pk]
+        self.assertEqual(hiring_job['applications'], 3)
+        self.assertEqual(hiring_job['reached'][Application.Status.ACCEPTED], 2)
+        self.assertEqual(hiring_job['hire_rate'], 66.67)
+        self.assertEqual(by_job[self.jobs[0].pk]['hire_rate'], 0)
+
+        self.assertEqual(sum(cohort['applications'] for cohort in cohorts), 6)
+        self.assertEqual(sum(cohort['hires'] for cohort in cohorts), 2)
+
+
+class SkillGapAnalysisTests(RecruiterDataMixin, TestCase):
+    """Job 0 requires Python and SQL, job 1 Python; three graduates have some of them"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        python, sql = Skill.objects.create(name='Python'), Skill.objects.create(name='SQL')
+        cls.jobs[0].skills_required.set([python, sql])
+        cls.jobs[1].skills_required.set([python])
+        graduates = {user.username: user for user in User.objects.filter(username__startswith='analysis_graduate_')}
+        graduates['analysis_graduate_0'].skills.set([python, sql])
+        graduates['analysis_graduate_1'].skills.set([python])
+        graduates['analysis_graduate_2'].skills.set([python])
+
+    def analyze(self, filters=None):
+        end_date = timezone.localdate()
+        engine = RecruitmentAnalyticsEngine(self.recruiter)
+        return engine.get_skill_gap_analysis(end_date - timedelta(days=30), end_date, filters)
+
+    def test_missing_share_per_skill(self):
+        with self.assertNumQueries(3):
+            analysis = self.analyze()
+
+        skills = {item['skill']: item for item in analysis['skills']}
+        self.assertEqual((skills['Python']['applicants'], skills['Python']['missing']), (6, 3))
+        self.assertEqual((skills['SQL']['applicants'], skills['SQL']['missing']), (3, 2))
+        self.assertEqual(skills['SQL']['missing_rate'], 66.67)
+
+        summary = analysis['summary']
+        self.assertEqual(summary['total_applications'], 6)
+        self.assertEqual(summary['total_applications_with_gaps'], 4)
+        self.assertEqual(summary['high_severity_gaps'], 1)
+        self.assertEqual(summary['medium_severity_gaps'], 1)
+        self.assertEqual(len(analysis['detailed_analysis']), 4)
+
+    def test_honors_filters(self):
+        analysis = self.analyze({'job_id': self.jobs[1].pk})
+        self.assertEqual(
+            [(item['skill'], item['applicants'], item['missing']) for item in analysis['skills']],
+            [('Python', 3, 2)]
+        )
+        self.assertEqual(analysis['summary']['total_applications_with_gaps'], 2)
+
+
+class TrendTests(RecruiterDataMixin, TestCase):
+    """Trend buckets are local calendar periods, with empty ones filled in"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 00:30 on 3 March in Johannesburg is still 2 March in UTC
+        local_times = [
+            datetime(2025, 3, 3, 0, 30), datetime(2025, 3, 3, 23, 30), datetime(2025, 3, 5, 12, 0),
+            datetime(2025, 3, 17, 9, 0), datetime(2025, 4, 1, 9, 0), datetime(2025, 4, 2, 9, 0),
+        ]
+        tz = timezone.get_current_timezone()
+        for application, local_time in zip(Application.objects.order_by('id'), local_times):
+            Application.objects.filter(pk=application.pk).update(applied_at=timezone.make_aware(local_time, tz))
+
+    def trend(self, bucket, filters=None):
+        engine = RecruitmentAnalyticsEngine(self.recruiter)
+        return engine.get_applications_trend(date(2025, 3, 2), date(2025, 4, 2), bucket, filters)
+
+    def test_days_are_local(self):
+        counts = {point['date']: point['count'] for point in self.trend('day')}
+        self.assertEqual(len(counts), 32)
+        self.assertEqual(counts['2025-03-02'], 0)
+        self.assertEqual(counts['2025-03-03'], 2)
+        self.assertEqual(counts['2025-03-04'], 0)
+        self.assertEqual(sum(counts.values()), 6)
+
+    def test_weeks_and_months(self):
+        self.assertEqual(
+            [(point['date'], point['count']) for point in self.trend('week')],
+            [('2025-02-24', 0), ('2025-03-03', 3), ('2025-03-10', 0), ('2025-03-17', 1),
+             ('2025-03-24', 0), ('2025-03-31', 2)]
+        )
+        self.assertEqual(
+            [(point['date'], point['count']) for point in self.trend('month')],
+            [('2025-03-01', 4), ('2025-04-01', 2)]
+        )
+
+    def test_fill_trend_without_data(self):
+        self.assertEqual(
+            fill_trend({}, date(2025, 1, 30), date(2025, 2, 1)),
+            [{'date': '2025-01-30', 'count': 0}, {'date': '2025-01-31', 'count': 0}, {'date': '2025-02-01', 'count': 0}]
+        )
+
+
+@override_settings(DASHBOARD_WIDGET_WORKERS=1)
+class DashboardWidgetTests(RecruiterDataMixin, TestCase):
+    """Only configured widgets are computed, each cached on its own"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+        self.dashboard = DashboardView.objects.create(
+            recruiter=self.recruiter,
+            name='Main',
+            is_default=True,
+            filters={'days': 60},
+            widget_config={'widgets': [
+                {'id': 'trend', 'type': 'applications_trend', 'options': {'bucket': 'week'}},
+                {'id': 'gaps', 'type': 'skill_gaps', 'options': {'job_id': self.jobs[1].pk}},
+                {'id': 'old', 'type': 'retired_widget'},
+            ]},
+        )
+
+    def widgets(self, query=''):
+        response = self.client.get(f'/analytics/dashboard/widgets/{query}')
+        self.assertEqual(response.status_code, 200)
+        return {widget['id']: widget for widget in response.json()['widgets']}
+
+    def test_computes_configured_widgets(self):
+        widgets = self.widgets()
+        self.assertEqual(list(widgets), ['trend', 'gaps', 'old'])
+        self.assertEqual(sum(point['count'] for point in widgets['trend']['data']), 6)
+        self.assertEqual(widgets['gaps']['data']['summary']['total_applications'], 3)
+        self.assertEqual(widgets['old']['error'], 'Unknown widget type')
+        self.assertNotIn('overview', widgets)
+
+    def test_widgets_are_cached_independently(self):
+        first = self.widgets()
+        self.assertFalse(first['trend']['cached'])
+
+        self.dashboard.widget_config['widgets'][1]['options']['job_id'] = self.jobs[0].pk
+        self.dashboard.save()
+        second = self.widgets()
+        self.assertTrue(second['trend']['cached'])
+        self.assertFalse(second['gaps']['cached'])
+        self.assertEqual(second['gaps']['data']['summary']['total_applications'], 3)
+
+        # Query parameters change the widget parameters, hence the cache key
+        self.assertFalse(self.widgets('?days=10')['trend']['cached'])
+
+    def test_widgets_are_keyed_only_on_parameters_they_read(self):
+        self.dashboard.widget_config = {'widgets': [
+            {'id': 'pipeline', 'type': 'pipeline'},
+            {'id': 'sources', 'type': 'sources'},
+            {'id': 'hires', 'type': 'time_to_hire'},
+            {'id': 'gaps', 'type': 'skill_gaps'},
+        ]}
+        self.dashboard.save()
+        self.widgets()
+
+        # Report filters and the bucket don't apply to these widgets, so they share one entry
+        widgets = self.widgets(f'?status=PENDING&job_id={self.jobs[0].pk}&bucket=week')
+        self.assertEqual(
+            [widgets[name]['cached'] for name in ('pipeline', 'sources', 'hires', 'gaps')],
+            [True, True, True, False],
+        )
+        self.assertEqual(widgets['sources']['data']['source_performance'][0]['total_applications'], 6)
+        self.assertEqual(widgets['gaps']['data']['summary']['total_applications'], 2)
+
+    def test_saving_invalid_widget_config_is_rejected(self):
+        for widgets in (
+            [{'type': 'nope'}],
+            [{'type': 'pipeline', 'options': ['days', 30]}],
+            [{'type': 'pipeline', 'options': {'days': 0}}],
+            [{'type': 'pipeline', 'options': {'cache_ttl': '1h'}}],
+            [{'type': 'pipeline', 'options': {'bucket': 'year'}}],
+        ):
+            response = self.client.post('/analytics/dashboards/', {
+                'name': 'Broken', 'widget_config': {'widgets': widgets}
+            }, format='json')
+            self.assertEqual(response.status_code, 400, widgets)
+
+    def test_stored_invalid_options_fail_only_that_widget(self):
+        # Saved before options were validated
+        DashboardView.objects.filter(pk=self.dashboard.pk).update(widget_config={'widgets': [
+            {'id': 'bad', 'type': 'pipeline', 'options': 'weekly'},
+            {'id': 'good', 'type': 'sources'},
+        ]})
+        widgets = self.widgets()
+        self.assertIn('error', widgets['bad'])
+        self.assertEqual(widgets['good']['data']['source_performance'][0]['total_applications'], 6)
+
+    def test_failed_widget_is_reported_and_not_cached(self):
+        with mock.patch.object(
+            RecruitmentAnalyticsEngine, 'get_skill_gap_analysis', side_effect=DatabaseError('connection lost')
+        ):
+            widgets = self.widgets()
+        self.assertEqual(widgets['gaps']['error'], 'Failed to compute widget')
+        self.assertNotIn('data', widgets['gaps'])
+        self.assertIn('data', widgets['trend'])
+
+        widgets = self.widgets()
+        self.assertFalse(widgets['gaps']['cached'])
+        self.assertEqual(widgets['gaps']['data']['summary']['total_applications'], 3)
+
+    def test_widget_with_a_failed_section_is_not_cached(self):
+        # Fails inside the section, which falls back to empty data
+        with mock.patch('analytics.analytics_engine.date_range_filter', side_effect=DatabaseError('connection lost')):
+            with self.assertLogs('analytics.analytics_engine', 'ERROR'):
+                widgets = self.widgets()
+        self.assertEqual(widgets['gaps']['error'], 'Failed to compute widget')
+        self.assertFalse(self.widgets()['gaps']['cached'])
+
+
+class ReportCacheTests(RecruiterDataMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.engine = RecruitmentAnalyticsEngine(self.recruiter)
+        self.end_date = timezone.localdate()
+        self.start_date = self.end_date - timedelta(days=30)
+
+    def report(self, filters=None):
+        return self.engine.get_cached_report('APPLICATION_ANALYSIS', self.start_date, self.end_date, filters)
+
+    def test_identical_request_only_checks_watermark(self):
+        first = self.report()
+        # One watermark aggregate and the skills version (the shared cache is a table), no report queries
+        with self.assertNumQueries(2):
+            self.assertEqual(self.report(), first)
+
+    def test_filters_are_part_of_the_key(self):
+        self.report()
+        filtered = self.report({'status': Application.Status.ACCEPTED})
+        self.assertEqual(filtered['summary']['total_applications'], 2)
+
+    def test_data_change_regenerates_report(self):
+        self.assertEqual(self.report()['summary']['applications_by_status'][Application.Status.ACCEPTED], 2)
+
+        application = Application.objects.filter(job__in=self.jobs, status=Application.Status.PENDING).first()
+        application.status = Application.Status.ACCEPTED
+        application.save()
+
+        self.assertEqual(self.report()['summary']['applications_by_status'][Application.Status.ACCEPTED], 3)
+
+    def test_deletion_regenerates_report(self):
+        self.assertEqual(self.report()['summary']['total_applications'], 6)
+        Application.objects.filter(job__in=self.jobs).order_by('applied_at').first().delete()
+        self.assertEqual(self.report()['summary']['total_applications'], 5)
+
+    def skill_gaps(self):
+        return self.engine.get_cached_report('SKILL_GAP_ANALYSIS', self.start_date, self.end_date)
+
+    def test_skill_changes_regenerate_skill_gap_report(self):
+        python, sql = Skill.objects.create(name='Python'), Skill.objects.create(name='SQL')
+        self.jobs[0].skills_required.add(python)
+        self.assertEqual(self.skill_gaps()['summary']['total_applications_with_gaps'], 3)
+
+        self.jobs[0].skills_required.set([sql])
+        self.assertEqual([item['skill'] for item in self.skill_gaps()['skills']], ['SQL'])
+
+        graduate = Application.objects.filter(job=self.jobs[0]).first().applicant
+        graduate.skills.add(sql)
+        self.assertEqual(self.skill_gaps()['summary']['total_applications_with_gaps'], 2)
+        graduate.skills.remove(sql)
+        self.assertEqual(self.skill_gaps()['summary']['total_applications_with_gaps'], 3)
+
+    def test_failed_report_is_not_cached(self):
+        # Fails partway through the report rather than in the dispatch
+        with mock.patch.object(
+            RecruitmentAnalyticsEngine, 'get_status_funnel', side_effect=DatabaseError('connection lost')
+        ):
+            with self.assertLogs('analytics.analytics_engine', 'ERROR'):
+                failed = self.engine.get_cached_report('CANDIDATE_PIPELINE', self.start_date, self.end_date)
+        # The section falls back to empty data, which is served once but not cached
+        self.assertEqual(failed['total_candidates'], 0)
+
+        report = self.engine.get_cached_report('CANDIDATE_PIPELINE', self.start_date, self.end_date)
+        self.assertEqual(report['total_candidates'], 6)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class DailyJobStatsTests(RecruiterDataMixin, TestCase):
+    """Rollups are upserted per (job, date) and kept current by the signals"""
+
+    def stats(self, job):
+        return DailyJobStats.objects.get(job=job, date=timezone.localdate())
+
+    def test_save_rollups_updates_existing_bucket(self):
+        job, today = self.jobs[0], timezone.localdate()
+        save_rollups({(job.pk, today): {'applications': 3, 'status_pending': 3}})
+        save_rollups({(job.pk, today): {'applications': 5, 'status_pending': 4, 'hires': 1}})
+
+        self.assertEqual(DailyJobStats.objects.filter(job=job, date=today).count(), 1)
+        stats = self.stats(job)
+        self.assertEqual((stats.applications, stats.status_pending, stats.hires), (5, 4, 1))
+
+    def test_rebuild_matches_source_rows(self):
+        rebuild_daily_job_stats([job.pk for job in self.jobs])
+        stats = self.stats(self.jobs[1])
+        self.assertEqual(stats.applications, 3)
+        self.assertEqual(stats.status_hired, 2)
+        self.assertEqual(stats.status_reviewed, 1)
+        self.assertEqual((stats.min_score, stats.max_score, stats.scored), (65.0, 85.0, 2))
+
+    def test_status_change_refreshes_bucket(self):
+        rebuild_daily_job_stats([job.pk for job in self.jobs])
+        application = Application.objects.get(job=self.jobs[0], match_score=40.0)
+        application.status = Application.Status.ACCEPTED
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+
+        stats = self.stats(self.jobs[0])
+        self.assertEqual(stats.status_hired, 1)
+        self.assertEqual(stats.status_pending, 1)
+        self.assertEqual(stats.hires, 1)
+
+    def test_deletion_refreshes_bucket(self):
+        rebuild_daily_job_stats([job.pk for job in self.jobs])
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.get(job=self.jobs[0], match_score=40.0).delete()
+        self.assertEqual(self.stats(self.jobs[0]).applications, 2)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True, EXPORT_MAX_CONCURRENT_PER_RECRUITER=2)
+class ExportPipelineTests(RecruiterDataMixin, TestCase):
+    """Background exports: lifecycle, concurrency limit, filters and file handling"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def export(self, export_type='APPLICATIONS', format='CSV', filters=None):
+        """Create an export and run it (the task is eager and queued on commit)"""
+        with self.captureOnCommitCallbacks(execute=True):
+            export = exports.create_export(self.recruiter, export_type, format, filters)
+        export.refresh_from_db()
+        return export
+
+    def read_csv(self, export):
+        with export.file.open('rb') as f:
+            return list(csv.DictReader(StringIO(f.read().decode('utf-8'))))
+
+    def test_filters_are_applied_to_rows(self):
+        export = self.export(filters={'status': Application.Status.ACCEPTED, 'min_match_score': 80})
+        self.assertEqual(export.status, 'COMPLETED')
+        rows = self.read_csv(export)
+        self.assertEqual([(row['Status'], row['Match Score']) for row in rows], [('HIRED', '85.0')])
+
+        jobs = self.read_csv(self.export('JOBS', filters={'job_id': self.jobs[1].pk}))
+        self.assertEqual([row['Job Title'] for row in jobs], ['Job 1'])
+
+    def test_request_rejects_unsupported_filters(self):
+        client = APIClient()
+        client.force_authenticate(self.recruiter)
+        response = client.post('/analytics/exports/request/', {
+            'export_type': 'ANALYTICS', 'format': 'CSV', 'filters': {'status': 'PENDING'}
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unsupported filters', str(response.data['errors']['filters']))
+
+        response = client.post('/analytics/exports/request/', {
+            'export_type': 'APPLICATIONS', 'format': 'CSV', 'filters': {'status': 'NOPE'}
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AnalyticsExport.objects.exists())
+
+        response = client.post('/analytics/exports/request/', {
+            'export_type': 'APPLICATIONS', 'format': 'CSV', 'date_range_start': '2026-01-01'
+        }, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(AnalyticsExport.objects.get().filters, {'start_date': '2026-01-01'})
+
+    def test_stale_exports_do_not_hold_slots(self):
+        # Queued but never run, as after a restart that dropped the queue
+        for _ in range(2):
+            exports.create_export(self.recruiter, 'APPLICATIONS', 'CSV')
+        with self.assertRaises(exports.ExportLimitReached):
+            exports.create_export(self.recruiter, 'APPLICATIONS', 'CSV')
+
+        AnalyticsExport.objects.update(updated_at=exports.stale_cutoff() - timedelta(seconds=1))
+        exports.create_export(self.recruiter, 'APPLICATIONS', 'CSV')
+
+    def test_expire_exports_fails_stale_exports(self):
+        stale = exports.create_export(self.recruiter, 'APPLICATIONS', 'CSV')
+        fresh = exports.create_export(self.recruiter, 'JOBS', 'CSV')
+        AnalyticsExport.objects.filter(pk=stale.pk).update(
+            status='PROCESSING', updated_at=exports.stale_cutoff() - timedelta(seconds=1)
+        )
+
+        out = StringIO()
+        call_command('expire_exports', stdout=out)
+        self.assertIn('failed 1 stale exports', out.getvalue())
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, fresh.status), ('FAILED', 'PENDING'))
+        # A failed export can be retried
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(exports.retry_export(stale))
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, 'COMPLETED')
+
+    def test_export_runs_to_completion(self):
+        export = self.export()
+        self.assertEqual((export.status, export.progress, export.attempts), ('COMPLETED', 100, 1))
+        self.assertEqual(len(export.content_hash), 64)
+        self.assertTrue(export.file.storage.exists(export.file.name))
+        self.assertEqual(len(self.read_csv(export)), 6)
+
+    def test_cancelled_export_is_not_run(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            export = exports.create_export(self.recruiter, 'APPLICATIONS', 'CSV')
+        self.assertTrue(exports.cancel_export(export))
+        self.assertFalse(exports.cancel_export(export))
+
+        for callback in callbacks:
+            callback()
+        export.refresh_from_db()
+        self.assertEqual((export.status, export.attempts, export.file.name or ''), ('CANCELLED', 0, ''))
+
+    def test_failed_export_is_retried_then_can_be_requeued(self):
+        with mock.patch.object(exports, 'build_export', side_effect=RuntimeError('disk full')):
+            export = self.export()
+        self.assertEqual((export.status, export.attempts, export.error), ('FAILED', 3, 'disk full'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(exports.retry_export(export))
+        export.refresh_from_db()
+        self.assertEqual((export.status, export.attempts, export.error), ('COMPLETED', 1, ''))
+        # Only failed or cancelled exports can be retried
+        self.assertFalse(exports.retry_export(export))
+
+    def test_concurrency_limit_per_recruiter(self):
+        client = APIClient()
+        client.force_authenticate(self.recruiter)
+        with self.captureOnCommitCallbacks():
+            for _ in range(2):
+                response = client.post(
+                    '/analytics/exports/request/', {'export_type': 'JOBS', 'format': 'CSV'}, format='json'
+                )
+                self.assertEqual(response.status_code, 202)
+            response = client.post(
+                '/analytics/exports/request/', {'export_type': 'JOBS', 'format': 'CSV'}, format='json'
+            )
+        self.assertEqual(response.status_code, 429)
+
+        # Finished exports free their slot
+        exports.cancel_export(AnalyticsExport.objects.first())
+        with self.captureOnCommitCallbacks():
+            exports.create_export(self.recruiter, 'JOBS', 'CSV')
+
+        other = User.objects.create(username='other_export_recruiter', role='RECRUITER')
+        with self.captureOnCommitCallbacks():
+            exports.create_export(other, 'JOBS', 'CSV')
+
+    def test_csv_and_ndjson_round_trip(self):
+        expected = sorted(
+            f"{application.applicant.username}|{application.status}"
+            for application in Application.objects.filter(job__created_by=self.recruiter).select_related('applicant')
+        )
+        User.objects.filter(username__startswith='analysis_graduate_').update(first_name=F('username'))
+
+        rows = self.read_csv(self.export('APPLICATIONS', 'CSV'))
+        self.assertEqual(sorted(f"{row['Applicant Name']}|{row['Status']}" for row in rows), expected)
+
+        export = self.export('APPLICATIONS', 'NDJSON')
+        with export.file.open('rb') as f:
+            lines = [json.loads(line) for line in f.read().decode('utf-8').splitlines()]
+        self.assertEqual(sorted(f"{row['Applicant Name']}|{row['Status']}" for row in lines), expected)
+        self.assertEqual(lines[0]['Match Score'], 95.0)
+
+    def test_stream_endpoint_serves_csv(self):
+        client = APIClient()
+        client.force_authenticate(self.recruiter)
+        response = client.get('/analytics/exports/stream/', {'export_type': 'JOBS', 'file_format': 'CSV'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Total-Count'], '2')
+        rows = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+        self.assertEqual([row['Total Applications'] for row in rows], ['3', '3'])
+
+    def test_stream_endpoint_applies_filters(self):
+        client = APIClient()
+        client.force_authenticate(self.recruiter)
+        response = client.get('/analytics/exports/stream/', {
+            'export_type': 'APPLICATIONS', 'file_format': 'NDJSON',
+            'status': Application.Status.ACCEPTED, 'min_match_score': '80',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Total-Count'], '1')
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(row['Status'], row['Match Score']) for row in lines], [('HIRED', 85.0)])
+
+        response = client.get('/analytics/exports/stream/', {
+            'export_type': 'JOBS', 'file_format': 'CSV', 'job_id': str(self.jobs[1].pk),
+        })
+        rows = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+        self.assertEqual([row['Job Title'] for row in rows], ['Job 1'])
+
+        response = client.get('/analytics/exports/stream/', {'export_type': 'JOBS', 'status': 'PENDING'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unsupported filters', str(response.data['errors']['filters']))
+
+    def test_rows_are_read_in_keyset_batches(self):
+        applications = Application.objects.filter(job__created_by=self.recruiter)
+        ids = sorted(applications.values_list('id', flat=True))
+        # 6 rows in batches of 4: one full batch, then a short one ends the walk
+        with self.assertNumQueries(2):
+            self.assertEqual([row['id'] for row in exports.iter_keyset(applications.values('id'), chunk_size=4)], ids)
+        # A full last batch needs one more (empty) query to know it was the last
+        with self.assertNumQueries(4):
+            self.assertEqual([row['id'] for row in exports.iter_keyset(applications.values('id'), chunk_size=2)], ids)
+
+        candidates = applications.values('applicant__id').annotate(total=Count('id'))
+        self.assertEqual(
+            [row['applicant__id'] for row in exports.iter_keyset(candidates, key='applicant__id', chunk_size=2)],
+            sorted(set(applications.values_list('applicant_id', flat=True))),
+        )
+
+    def test_excel_round_trip(self):
+        export = self.export('JOBS', 'EXCEL')
+        self.assertTrue(export.file.name.endswith('.xlsx'))
+        with export.file.open('rb') as f:
+            sheet = openpyxl.load_workbook(BytesIO(f.read()), read_only=True)['Jobs']
+            values = list(sheet.values)
+        headers, rows = values[0], values[1:]
+        self.assertEqual(headers[0], 'Job Title')
+        self.assertEqual(sorted(row[0] for row in rows), ['Job 0', 'Job 1'])
+        self.assertEqual([row[headers.index('Total Applications')] for row in rows], [3, 3])
+
+    def test_empty_excel_export_says_so(self):
+        export = self.export('APPLICATIONS', 'EXCEL', filters={'status': Application.Status.INTERVIEW})
+        with export.file.open('rb') as f:
+            values = list(openpyxl.load_workbook(BytesIO(f.read()), read_only=True).active.values)
+        self.assertEqual(values, [('Message',), ('No data available for export',)])
+
+    def test_pdf_round_trip(self):
+        export = self.export('JOBS', 'PDF')
+        self.assertTrue(export.file.name.endswith('.pdf'))
+        with export.file.open('rb') as f:
+            text = ''.join(page.extract_text() for page in PdfReader(BytesIO(f.read())).pages)
+        self.assertIn('Jobs Export', text)
+        self.assertIn('Job 0', text)
+        self.assertIn('Job 1', text)
+
+    def test_pdf_tables_stop_at_row_cap(self):
+        rows = ({'Row': i} for i in range(10))
+        flowables = list(data_tables(rows, 500, max_rows=3))
+        tables = [flowable for flowable in flowables if isinstance(flowable, Table)]
+        self.assertEqual(sum(len(table._cellvalues) - 1 for table in tables), 3)
+        self.assertIn('first 3 rows', flowables[-1].getPlainText())
+
+    def test_identical_exports_share_one_file(self):
+        first = self.export('JOBS', 'CSV')
+        # The same request over unchanged data neither reads nor renders rows
+        fetch = mock.Mock(side_effect=AssertionError('rows fetched for an existing file'))
+        with mock.patch.dict(exports.EXPORT_SOURCES, {'JOBS': (fetch, 'Jobs', 'jobs')}):
+            second = self.export('JOBS', 'CSV')
+        fetch.assert_not_called()
+        self.assertEqual(second.status, 'COMPLETED')
+        self.assertEqual((first.file.name, first.content_hash), (second.file.name, second.content_hash))
+        self.assertIn(first.content_hash, first.file.name)
+
+        # Other filters, or another recruiter, get their own file
+        filtered = self.export('JOBS', 'CSV', filters={'job_id': self.jobs[0].pk})
+        self.assertNotEqual(filtered.file.name, first.file.name)
+        other = User.objects.create(username='other_file_recruiter', role='RECRUITER')
+        with self.captureOnCommitCallbacks(execute=True):
+            other_export = exports.create_export(other, 'JOBS', 'CSV')
+        other_export.refresh_from_db()
+        self.assertNotEqual(other_export.file.name, first.file.name)
+
+        # Different data (or format) gets its own file
+        Application.objects.filter(job=self.jobs[0]).first().delete()
+        third = self.export('JOBS', 'CSV')
+        self.assertNotEqual(third.file.name, first.file.name)
+        self.assertNotEqual(self.export('JOBS', 'NDJSON').content_hash, first.content_hash)
+
+    def test_release_file_keeps_files_still_referenced(self):
+        first = self.export('JOBS', 'CSV')
+        second = self.export('JOBS', 'CSV')
+        storage, name = first.file.storage, first.file.name
+
+        AnalyticsExport.objects.filter(pk=first.pk).update(file='')
+        self.assertFalse(release_file(storage, name))
+        self.assertTrue(storage.exists(name))
+
+        AnalyticsExport.objects.filter(pk=second.pk).update(file='')
+        self.assertTrue(release_file(storage, name))
+        self.assertFalse(storage.exists(name))
+
+    def test_expire_exports_removes_old_files(self):
+        old = self.export('JOBS', 'CSV')
+        shared = self.export('JOBS', 'CSV')
+        other = self.export('APPLICATIONS', 'CSV')
+        storage = old.file.storage
+        AnalyticsExport.objects.filter(pk__in=[old.pk, other.pk]).update(
+            completed_at=timezone.now() - timedelta(days=8)
+        )
+
+        out = StringIO()
+        call_command('expire_exports', '--dry-run', stdout=out)
+        self.assertIn('Would expire 2 exports', out.getvalue())
+        self.assertEqual(AnalyticsExport.objects.filter(status='EXPIRED').count(), 0)
+
+        call_command('expire_exports', stdout=StringIO())
+        statuses = dict(AnalyticsExport.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            [statuses[old.pk], statuses[shared.pk], statuses[other.pk]], ['EXPIRED', 'COMPLETED', 'EXPIRED']
+        )
+        # The newer identical export still uses the shared file
+        self.assertTrue(storage.exists(shared.file.name))
+        self.assertFalse(storage.exists(other.file.name))
+
+        client = APIClient()
+        client.force_authenticate(self.recruiter)
+        self.assertEqual(client.get(f'/analytics/exports/{old.pk}/download/').status_code, 410)
+        self.assertEqual(client.get(f'/analytics/exports/{shared.pk}/download/').status_code, 200)
@@ -0,0 +1,76 @@
+# analytics/trends.py
+"""
+Counts over time in day, week or month buckets.
+
+Rows are bucketed in SQL with TruncDate/TruncWeek/TruncMonth, which convert
+to the current time zone (``TIME_ZONE``) first, so a day is a local calendar
+day rather than the UTC date ``DATE(applied_at)`` gives. Callers restrict the
+range with ``date_range_filter`` on the raw column, which the
+``(job, applied_at)`` index serves; only the selected rows are truncated.
+
+Buckets without rows are filled in by reindexing the counts over the full
+bucket range with pandas instead of a per-day Python loop.
+"""
+from datetime import timedelta
+
+import pandas as pd
+from django.db.models import Count, DateField
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+
+DEFAULT_BUCKET = 'day'
+
+# bucket: (truncation, pandas frequency of bucket starts, label)
+BUCKETS = {
+    'day': (TruncDate, 'D', 'daily'),
+    'week': (TruncWeek, 'W-MON', 'weekly'),
+    'month': (TruncMonth, 'MS', 'monthly'),
+}
+
+
+def parse_bucket(value):
+    """``value`` if it names a bucket, else the default"""
+    return value if value in BUCKETS else DEFAULT_BUCKET
+
+
+def bucket_label(bucket):
+    return BUCKETS[bucket][2]
+
+
+def bucket_start(day, bucket):
+    """First day of the bucket containing ``day`` (weeks start on Monday)"""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def truncate(field, bucket):
+    """Expression for the local start date of ``field``'s bucket"""
+    function = BUCKETS[bucket][0]
+    if function is TruncDate:
+        return TruncDate(field)
+    return function(field, output_field=DateField())
+
+
+def fill_trend(counts, start_date, end_date, bucket=DEFAULT_BUCKET):
+    """
+    ``[{'date', 'count'}]`` for every bucket from ``start_date`` to
+    ``end_date``, from ``counts`` (bucket start date -> count), zero where
+    ``counts`` has no entry.
+    """
+    index = pd.date_range(bucket_start(start_date, bucket), end_date, freq=BUCKETS[bucket][1])
+    series = pd.Series(list(counts.values()), index=pd.to_datetime(list(counts.keys())), dtype='float64')
+    series = series.reindex(index, fill_value=0).fillna(0).astype('int64')
+    return [{'date': day.date().isoformat(), 'count': int(count)} for day, count in series.items()]
+
+
+def count_trend(queryset, field, start_date, end_date, bucket=DEFAULT_BUCKET, value=None):
+    """
+    Trend of ``value`` (default: row count) over ``queryset`` bucketed on
+    ``field``. ``queryset`` should already be limited to the date range.
+    """
+    counts = queryset.annotate(period=truncate(field, bucket)).values('period').annotate(
+        count=value or Count('id')
+    ).order_by().values_list('period', 'count')
+    return fill_trend(dict(counts), start_date, end_date, bucket)
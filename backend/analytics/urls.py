@@ -2,14 +2,20 @@
 from django.urls import path
 from .views import (
     recruiter_dashboard,
+    dashboard_widgets,
     generate_report,
     get_report_analytics,
+    applications_trend,
     request_export,
     export_report,  # Make sure this is imported
     ReportListView,
     ReportDetailView,
     DashboardViewListCreate,
     ExportListView,
+    ExportDetailView,
+    stream_export,
+    cancel_export,
+    retry_export,
     download_export,
     debug_exports
 )
@@ -17,6 +23,7 @@ from .views import (
 urlpatterns = [
     # Dashboard
     path('dashboard/', recruiter_dashboard, name='recruiter-dashboard'),
+    path('dashboard/widgets/', dashboard_widgets, name='dashboard-widgets'),
     
     # Reports
     path('reports/', ReportListView.as_view(), name='report-list'),
@@ -24,13 +31,19 @@ urlpatterns = [
     path('reports/<int:pk>/', ReportDetailView.as_view(), name='report-detail'),
     path('reports/<int:report_id>/export/', export_report, name='export-report'),  # This line is crucial
     path('analytics/<str:report_type>/', get_report_analytics, name='get-analytics'),
+    path('trends/applications/', applications_trend, name='applications-trend'),
     
     # Dashboards
     path('dashboards/', DashboardViewListCreate.as_view(), name='dashboard-views'),
+    path('dashboards/<int:dashboard_id>/widgets/', dashboard_widgets, name='dashboard-view-widgets'),
     
     # Exports
     path('exports/', ExportListView.as_view(), name='export-list'),
     path('exports/request/', request_export, name='request-export'),
+    path('exports/stream/', stream_export, name='stream-export'),
+    path('exports/<int:export_id>/', ExportDetailView.as_view(), name='export-detail'),
+    path('exports/<int:export_id>/cancel/', cancel_export, name='cancel-export'),
+    path('exports/<int:export_id>/retry/', retry_export, name='retry-export'),
     path('exports/<int:export_id>/download/', download_export, name='download-export'),
     
     # Debug
@@ -2,32 +2,32 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from datetime import timedelta, datetime
-import pandas as pd
 import json
 import csv
+import logging
 from io import BytesIO, StringIO
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Spacer, Table
 
 from .models import RecruitmentReport, DashboardView, AnalyticsExport
 from .serializers import (
     RecruitmentReportSerializer, DashboardViewSerializer, AnalyticsExportSerializer,
-    ReportGenerateSerializer, ExportRequestSerializer
+    ReportGenerateSerializer, ExportRequestSerializer, ExportStreamSerializer
 )
 from .analytics_engine import RecruitmentAnalyticsEngine
-from applications.models import Application
-from jobs.models import Job
-from django.db import models
-from django.contrib.auth import get_user_model
+from .excel import new_workbook, write_sheet
+from .files import content_addressed_name, file_download_response, new_digest, release_file
+from .pdf import INFO_TABLE_STYLE, KEY_VALUE_TABLE_STYLE, data_tables, get_styles, new_document
+from .trends import parse_bucket
+from .widgets import DEFAULT_WIDGET_CONFIG, FILTER_KEYS, render_widgets
+from . import exports
 from django.core.files.base import ContentFile
 
+logger = logging.getLogger(__name__)
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def recruiter_dashboard(request):
@@ -44,26 +44,56 @@ def recruiter_dashboard(request):
         if days <= 0 or days > 365:
             days = 30
         
+        # Trend granularity: day, week or month
+        bucket = parse_bucket(request.GET.get('bucket'))
+        
         # Initialize analytics engine
         engine = RecruitmentAnalyticsEngine(request.user)
         
         # Get dashboard data
-        overview_data = engine.get_recruiter_overview(days)
+        overview_data = engine.get_recruiter_overview(days, bucket)
         
         return Response({
             'success': True,
             'data': overview_data,
-            'period_days': days
+            'period_days': days,
+            'bucket': bucket
         })
         
     except Exception as e:
-        print(f"Dashboard error: {str(e)}")
+        logger.exception("Dashboard error")
         return Response({
             'success': False,
             'error': 'Failed to load dashboard data',
             'debug_error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def dashboard_widgets(request, dashboard_id=None):
+    """
+    Compute the widgets of a saved dashboard (the recruiter's default one
+    without ``dashboard_id``). Query parameters days, bucket, job_id, status
+    and min_match_score override the dashboard's saved filters.
+    """
+    dashboards = DashboardView.objects.filter(recruiter=request.user)
+    if dashboard_id is not None:
+        dashboard = get_object_or_404(dashboards, pk=dashboard_id)
+    else:
+        dashboard = dashboards.order_by('-is_default', '-updated_at').first()
+    
+    defaults = dict(dashboard.filters or {}) if dashboard else {}
+    for key in ('days', 'bucket') + FILTER_KEYS:
+        if request.GET.get(key):
+            defaults[key] = request.GET[key]
+    
+    widget_config = dashboard.widget_config if dashboard else DEFAULT_WIDGET_CONFIG
+    return Response({
+        'success': True,
+        'dashboard': {'id': dashboard.id, 'name': dashboard.name} if dashboard else None,
+        'widgets': render_widgets(request.user, widget_config, defaults)
+    })
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def generate_report(request):
@@ -73,7 +103,7 @@ def generate_report(request):
     if serializer.is_valid():
         try:
             engine = RecruitmentAnalyticsEngine(request.user)
-            report_data = engine.generate_comprehensive_report(
+            report_data = engine.get_cached_report(
                 report_type=serializer.validated_data['report_type'],
                 date_range_start=serializer.validated_data['date_range_start'],
                 date_range_end=serializer.validated_data['date_range_end'],
@@ -132,15 +162,23 @@ def export_report(request, report_id):
                 'error': 'Invalid export format'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Generate the export file
-        file_content = generate_report_export(report, export_format)
+        # Reuse the stored file if this exact report was exported before
+        file_extension = REPORT_FILE_EXTENSIONS[export_format]
+        storage = report.exported_file.storage
+        name = content_addressed_name(
+            report.exported_file, report, report_content_hash(report, export_format), file_extension
+        )
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(generate_report_export(report, export_format)))
         
-        # Save the exported file
-        filename = f"report_{report.id}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{export_format.lower()}"
-        report.exported_file.save(filename, ContentFile(file_content))
+        previous = report.exported_file.name
+        report.exported_file.name = name
         report.export_format = export_format
         report.is_exported = True
+        report.exported_at = timezone.now()
         report.save()
+        if previous and previous != name:
+            release_file(storage, previous)
         
         return Response({
             'success': True,
@@ -159,6 +197,15 @@ def export_report(request, report_id):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+REPORT_FILE_EXTENSIONS = {'PDF': 'pdf', 'EXCEL': 'xlsx', 'CSV': 'csv', 'JSON': 'json'}
+
+def report_content_hash(report, format):
+    """Hash of everything a report export renders, used to name and reuse its file"""
+    return new_digest(
+        format, report.title, report.report_type, report.description,
+        report.date_range_start, report.date_range_end, report.generated_at, report.report_data
+    ).hexdigest()
+
 def generate_report_export(report, format):
     """Generate export file for a report"""
     if format == 'PDF':
@@ -175,18 +222,12 @@ def generate_report_export(report, format):
 def generate_report_pdf(report):
     """Generate PDF export for a report"""
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
+    doc = new_document(buffer)
+    styles = get_styles()
     story = []
     
     # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=30,
-    )
-    story.append(Paragraph(report.title, title_style))
+    story.append(Paragraph(report.title, styles['ReportTitle']))
     
     # Report info
     info_data = [
@@ -199,11 +240,7 @@ def generate_report_pdf(report):
         info_data.append(['Description:', report.description])
     
     info_table = Table(info_data, colWidths=[100, 300])
-    info_table.setStyle(TableStyle([
-        ('FONT', (0, 0), (-1, -1), 'Helvetica', 10),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
+    info_table.setStyle(INFO_TABLE_STYLE)
     story.append(info_table)
     story.append(Spacer(1, 20))
     
@@ -223,28 +260,15 @@ def generate_report_pdf(report):
                     
                     if len(table_data) > 1:
                         section_table = Table(table_data, colWidths=[150, 250])
-                        section_table.setStyle(TableStyle([
-                            ('FONT', (0, 0), (-1, -1), 'Helvetica', 9),
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ]))
+                        section_table.setStyle(KEY_VALUE_TABLE_STYLE)
                         story.append(section_table)
                         story.append(Spacer(1, 10))
                 
                 elif isinstance(section_data, list) and section_data:
                     if all(isinstance(item, dict) for item in section_data):
-                        headers = list(section_data[0].keys())
-                        table_data = [headers]
-                        for item in section_data[:10]:
-                            table_data.append([str(item.get(h, '')) for h in headers])
-                        
-                        section_table = Table(table_data, colWidths=[400/len(headers)] * len(headers))
-                        section_table.setStyle(TableStyle([
-                            ('FONT', (0, 0), (-1, -1), 'Helvetica', 8),
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ]))
-                        story.append(section_table)
+                        # Every key that appears in any row, in first-seen order
+                        headers = list(dict.fromkeys(key for item in section_data for key in item))
+                        story.extend(data_tables(section_data, doc.width, headers=headers))
                         story.append(Spacer(1, 10))
     
     doc.build(story)
@@ -252,36 +276,36 @@ def generate_report_pdf(report):
 
 def generate_report_excel(report):
     """Generate Excel export for a report"""
-    output = BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Report info sheet
-        info_data = {
-            'Field': ['Title', 'Report Type', 'Date Range', 'Generated', 'Description'],
-            'Value': [
-                report.title,
-                report.get_report_type_display(),
-                f"{report.date_range_start} to {report.date_range_end}",
-                report.generated_at.strftime('%Y-%m-%d %H:%M'),
-                report.description or ''
-            ]
-        }
-        pd.DataFrame(info_data).to_excel(writer, sheet_name='Report Info', index=False)
-        
-        # Report data sheets
-        if report.report_data:
-            for section_name, section_data in report.report_data.items():
-                if section_data:
-                    sheet_name = section_name.replace('_', ' ').title()[:31]
-                    if isinstance(section_data, dict):
-                        df = pd.DataFrame(list(section_data.items()), columns=['Metric', 'Value'])
-                    elif isinstance(section_data, list):
-                        df = pd.DataFrame(section_data)
-                    else:
-                        df = pd.DataFrame({'Data': [str(section_data)]})
-                    
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+    workbook = new_workbook()
+    
+    # Report info sheet
+    write_sheet(workbook, 'Report Info', [
+        {'Field': 'Title', 'Value': report.title},
+        {'Field': 'Report Type', 'Value': report.get_report_type_display()},
+        {'Field': 'Date Range', 'Value': f"{report.date_range_start} to {report.date_range_end}"},
+        {'Field': 'Generated', 'Value': report.generated_at.strftime('%Y-%m-%d %H:%M')},
+        {'Field': 'Description', 'Value': report.description or ''},
+    ])
+    
+    # Report data sheets
+    if report.report_data:
+        for section_name, section_data in report.report_data.items():
+            if section_data:
+                sheet_name = section_name.replace('_', ' ').title()
+                if isinstance(section_data, dict):
+                    write_sheet(workbook, sheet_name, (
+                        {'Metric': key, 'Value': value} for key, value in section_data.items()
+                    ))
+                elif isinstance(section_data, list):
+                    rows = [item if isinstance(item, dict) else {'Data': item} for item in section_data]
+                    # Every key that appears in any row, in first-seen order
+                    headers = list(dict.fromkeys(key for row in rows for key in row))
+                    write_sheet(workbook, sheet_name, rows, headers=headers)
+                else:
+                    write_sheet(workbook, sheet_name, [{'Data': str(section_data)}])
     
+    output = BytesIO()
+    workbook.save(output)
     return output.getvalue()
 
 def generate_report_csv(report):
@@ -354,24 +378,27 @@ def get_report_analytics(request, report_type):
         else:
             end_date = timezone.now().date()
         
-        engine = RecruitmentAnalyticsEngine(request.user)
-        
-        if report_type == 'applications':
-            data = engine.get_applications_analysis(start_date, end_date)
-        elif report_type == 'pipeline':
-            data = engine.get_candidate_pipeline(start_date, end_date)
-        elif report_type == 'sources':
-            data = engine.get_source_analysis(start_date, end_date)
-        elif report_type == 'skill-gaps':
-            data = engine.get_skill_gap_analysis(start_date, end_date)
-        elif report_type == 'time-to-hire':
-            data = engine.get_time_to_hire_analysis(start_date, end_date)
-        else:
+        report_types = {
+            'applications': 'APPLICATION_ANALYSIS',
+            'pipeline': 'CANDIDATE_PIPELINE',
+            'sources': 'SOURCE_ANALYSIS',
+            'skill-gaps': 'SKILL_GAP_ANALYSIS',
+            'time-to-hire': 'TIME_TO_HIRE',
+        }
+        if report_type not in report_types:
             return Response({
                 'success': False,
                 'error': 'Invalid report type'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        engine = RecruitmentAnalyticsEngine(request.user)
+        data = engine.get_cached_report(report_types[report_type], start_date, end_date)
+        if 'error' in data:
+            return Response({
+                'success': False,
+                'error': data['error']
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
         return Response({
             'success': True,
             'data': data,
@@ -387,372 +414,139 @@ def get_report_analytics(request, report_type):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def applications_trend(request):
+    """Applications per day, week or month (?bucket=) in a date range, with optional job_id/status filters"""
+    try:
+        start_date_str = request.GET.get('start_date')
+        end_date_str = request.GET.get('end_date')
+        
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else timezone.localdate()
+        start_date = (
+            datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str
+            else end_date - timedelta(days=30)
+        )
+    except ValueError:
+        return Response({
+            'success': False,
+            'error': 'Dates must be YYYY-MM-DD'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if start_date > end_date:
+        return Response({
+            'success': False,
+            'error': 'start_date must not be after end_date'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    bucket = parse_bucket(request.GET.get('bucket'))
+    filters = {key: request.GET[key] for key in ('job_id', 'status') if request.GET.get(key)}
+    engine = RecruitmentAnalyticsEngine(request.user)
+    return Response({
+        'success': True,
+        'data': engine.get_applications_trend(start_date, end_date, bucket, filters),
+        'bucket': bucket,
+        'date_range': {
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat()
+        }
+    })
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def request_export(request):
-    """Request data export"""
+    """Queue a data export; poll exports/<id>/ for progress"""
     serializer = ExportRequestSerializer(data=request.data)
     
     if serializer.is_valid():
         try:
-            export = AnalyticsExport.objects.create(
-                recruiter=request.user,
-                export_type=serializer.validated_data['export_type'],
-                format=serializer.validated_data['format'],
-                filters=serializer.validated_data.get('filters', {})
+            export = exports.create_export(
+                request.user,
+                serializer.validated_data['export_type'],
+                serializer.validated_data['format'],
+                serializer.validated_data.get('filters', {})
             )
-            
-            process_export(export)
-            
-            return Response({
-                'success': True,
-                'export_id': export.id,
-                'message': 'Export request submitted'
-            })
-            
-        except Exception as e:
+        except exports.ExportLimitReached as e:
             return Response({
                 'success': False,
                 'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        
+        return Response({
+            'success': True,
+            'export_id': export.id,
+            'status': export.status,
+            'message': 'Export request submitted'
+        }, status=status.HTTP_202_ACCEPTED)
     
     return Response({
         'success': False,
         'errors': serializer.errors
     }, status=status.HTTP_400_BAD_REQUEST)
 
-def get_applications_data(recruiter):
-    """Get applications data for export"""
-    applications = Application.objects.filter(
-        job__created_by=recruiter
-    ).select_related('applicant', 'job', 'job__company')
-    
-    application_data = []
-    for app in applications:
-        application_data.append({
-            'Applicant Name': app.applicant.get_full_name(),
-            'Applicant Email': app.applicant.email,
-            'Job Title': app.job.title,
-            'Company': app.job.company.name if app.job.company else 'N/A',
-            'Status': app.status,
-            'Match Score': app.match_score or 0,
-            'Applied Date': app.applied_at.strftime('%Y-%m-%d'),
-            'Last Updated': app.updated_at.strftime('%Y-%m-%d %H:%M'),
-            'Cover Letter Preview': (app.cover_letter or '')[:100] + '...' if app.cover_letter else ''
-        })
-    return application_data
-
-def get_candidates_data(recruiter):
-    """Get unique candidates data"""
-    candidates = Application.objects.filter(
-        job__created_by=recruiter
-    ).values(
-        'applicant__id',
-        'applicant__first_name',
-        'applicant__last_name',
-        'applicant__email'
-    ).annotate(
-        total_applications=Count('id'),
-        last_application=Max('applied_at'),
-        highest_match_score=Max('match_score')
-    )
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def stream_export(request):
+    """
+    Stream a CSV or NDJSON export straight to the client, row by row. The
+    export type's filters (see exports.EXPORT_FILTERS) are query parameters.
+    """
+    serializer = ExportStreamSerializer(data=request.query_params)
+    
+    if not serializer.is_valid():
+        return Response({
+            'success': False,
+            'errors': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
     
-    candidate_data = []
-    for candidate in candidates:
-        candidate_data.append({
-            'Candidate ID': candidate['applicant__id'],
-            'First Name': candidate['applicant__first_name'],
-            'Last Name': candidate['applicant__last_name'],
-            'Email': candidate['applicant__email'],
-            'Total Applications': candidate['total_applications'],
-            'Last Application': candidate['last_application'].strftime('%Y-%m-%d') if candidate['last_application'] else 'N/A',
-            'Highest Match Score': candidate['highest_match_score'] or 0
-        })
-    return candidate_data
-
-def get_jobs_data(recruiter):
-    """Get jobs data for export"""
-    jobs = Job.objects.filter(
-        created_by=recruiter
-    ).annotate(
-        application_count=Count('applications'),
-        avg_match_score=Avg('applications__match_score'),
-        hired_count=Count('applications', filter=models.Q(applications__status='ACCEPTED'))
-    ).select_related('company')
-    
-    job_data = []
-    for job in jobs:
-        job_data.append({
-            'Job Title': job.title,
-            'Company': job.company.name if job.company else 'N/A',
-            'Status': job.status,
-            'Created Date': job.created_at.strftime('%Y-%m-%d'),
-            'Closing Date': job.closing_date.strftime('%Y-%m-%d') if job.closing_date else 'Open',
-            'Total Applications': job.application_count,
-            'Hired Candidates': job.hired_count,
-            'Average Match Score': round(job.avg_match_score or 0, 2),
-            'Conversion Rate': f"{round((job.hired_count / job.application_count * 100) if job.application_count > 0 else 0, 2)}%"
-        })
-    return job_data
-
-def get_analytics_data(recruiter):
-    """Get analytics data for export"""
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=30)
-    
-    engine = RecruitmentAnalyticsEngine(recruiter)
-    overview = engine.get_recruiter_overview(30)
-    applications_analysis = engine.get_applications_analysis(start_date, end_date)
-    
-    analytics_data = [{
-        'Metric': 'Total Jobs',
-        'Value': overview.get('total_jobs', 0),
-        'Category': 'Overview'
-    }, {
-        'Metric': 'Active Jobs',
-        'Value': overview.get('active_jobs', 0),
-        'Category': 'Overview'
-    }, {
-        'Metric': 'Total Applications (30 days)',
-        'Value': overview.get('total_applications', 0),
-        'Category': 'Overview'
-    }, {
-        'Metric': 'Conversion Rate',
-        'Value': f"{overview.get('conversion_rate', 0)}%",
-        'Category': 'Overview'
-    }, {
-        'Metric': 'Average Match Score',
-        'Value': f"{overview.get('average_match_score', 0)}%",
-        'Category': 'Overview'
-    }, {
-        'Metric': 'Applications Today',
-        'Value': overview.get('quick_stats', {}).get('applications_today', 0),
-        'Category': 'Quick Stats'
-    }, {
-        'Metric': 'Pending Review',
-        'Value': overview.get('quick_stats', {}).get('pending_review', 0),
-        'Category': 'Quick Stats'
-    }, {
-        'Metric': 'Interviews Scheduled',
-        'Value': overview.get('quick_stats', {}).get('interviews_scheduled', 0),
-        'Category': 'Quick Stats'
-    }, {
-        'Metric': 'New Hires',
-        'Value': overview.get('quick_stats', {}).get('new_hires', 0),
-        'Category': 'Quick Stats'
-    }, {
-        'Metric': 'High Quality Applications',
-        'Value': applications_analysis.get('quality_metrics', {}).get('high_quality', 0),
-        'Category': 'Quality Metrics'
-    }, {
-        'Metric': 'Medium Quality Applications',
-        'Value': applications_analysis.get('quality_metrics', {}).get('medium_quality', 0),
-        'Category': 'Quality Metrics'
-    }, {
-        'Metric': 'Low Quality Applications',
-        'Value': applications_analysis.get('quality_metrics', {}).get('low_quality', 0),
-        'Category': 'Quality Metrics'
-    }]
-    
-    return analytics_data
+    file_format = serializer.validated_data['file_format']
+    row_count, filename, content = exports.stream_export(
+        request.user, serializer.validated_data['export_type'], file_format, serializer.validated_data['filters']
+    )
+    response = StreamingHttpResponse(content, content_type=exports.CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['X-Total-Count'] = str(row_count)
+    return response
 
-def generate_csv_export(data, sheet_name):
-    """Generate CSV file from data"""
-    if not data:
-        return "No data available".encode('utf-8')
-    
-    output = StringIO()
-    
-    if isinstance(data, list) and data:
-        if isinstance(data[0], dict):
-            headers = list(data[0].keys())
-            writer = csv.DictWriter(output, fieldnames=headers)
-            writer.writeheader()
-            for item in data:
-                row = {}
-                for header in headers:
-                    value = item.get(header, '')
-                    if isinstance(value, (list, dict)):
-                        value = json.dumps(value)
-                    row[header] = str(value)
-                writer.writerow(row)
-        else:
-            writer = csv.writer(output)
-            writer.writerow(['Data'])
-            for item in data:
-                writer.writerow([str(item)])
-    elif isinstance(data, dict):
-        writer = csv.writer(output)
-        writer.writerow(['Key', 'Value'])
-        for key, value in data.items():
-            if isinstance(value, (list, dict)):
-                value = json.dumps(value)
-            writer.writerow([key, str(value)])
-    else:
-        writer = csv.writer(output)
-        writer.writerow(['Data'])
-        writer.writerow([str(data)])
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def cancel_export(request, export_id):
+    """Cancel a pending or running export"""
+    export = get_object_or_404(AnalyticsExport, id=export_id, recruiter=request.user)
     
-    return output.getvalue().encode('utf-8')
-
-def generate_json_export(data):
-    """Generate JSON file from data"""
-    def json_serializable(obj):
-        if isinstance(obj, (datetime, timezone.datetime)):
-            return obj.isoformat()
-        elif hasattr(obj, '__dict__'):
-            return obj.__dict__
-        else:
-            return str(obj)
+    if not exports.cancel_export(export):
+        return Response({
+            'success': False,
+            'error': f'Export is already {export.status.lower()}'
+        }, status=status.HTTP_409_CONFLICT)
     
-    return json.dumps(data, indent=2, default=json_serializable, ensure_ascii=False).encode('utf-8')
+    return Response({'success': True, 'export_id': export.id, 'status': 'CANCELLED'})
 
-def generate_pdf_export(data, title):
-    """Generate PDF export for data"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def retry_export(request, export_id):
+    """Re-queue a failed or cancelled export"""
+    export = get_object_or_404(AnalyticsExport, id=export_id, recruiter=request.user)
     
-    story.append(Paragraph(f"{title} Export", styles['Heading1']))
-    story.append(Paragraph(f"Generated: {timezone.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
-    story.append(Spacer(1, 20))
+    try:
+        retried = exports.retry_export(export)
+    except exports.ExportLimitReached as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS)
     
-    if not data:
-        story.append(Paragraph("No data available for export.", styles['Normal']))
-    else:
-        if isinstance(data, list) and data and isinstance(data[0], dict):
-            headers = list(data[0].keys())
-            table_data = [headers]
-            
-            for item in data:
-                row = []
-                for header in headers:
-                    value = item.get(header, '')
-                    if isinstance(value, str) and len(value) > 50:
-                        value = value[:47] + '...'
-                    row.append(str(value))
-                table_data.append(row)
-            
-            table = Table(table_data, repeatRows=1)
-            table.setStyle(TableStyle([
-                ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 10),
-                ('FONT', (0, 1), (-1, -1), 'Helvetica', 8),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-            story.append(table)
-            
-        elif isinstance(data, list):
-            for i, item in enumerate(data, 1):
-                story.append(Paragraph(f"{i}. {str(item)}", styles['Normal']))
-                story.append(Spacer(1, 5))
-                
-        elif isinstance(data, dict):
-            for key, value in data.items():
-                story.append(Paragraph(f"<b>{key}:</b> {str(value)}", styles['Normal']))
-                story.append(Spacer(1, 5))
-        else:
-            story.append(Paragraph(str(data), styles['Normal']))
+    if not retried:
+        return Response({
+            'success': False,
+            'error': 'Only failed or cancelled exports can be retried'
+        }, status=status.HTTP_409_CONFLICT)
     
-    doc.build(story)
-    return buffer.getvalue()
-
-def generate_excel_export(data, sheet_name):
-    """Generate Excel file from data"""
-    try:
-        if not data:
-            df = pd.DataFrame({'Message': ['No data available for export']})
-        else:
-            df = pd.DataFrame(data)
-        
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-            
-            worksheet = writer.sheets[sheet_name]
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-        return output.getvalue()
-    except Exception as e:
-        print(f"Excel generation error: {e}")
-        output = BytesIO()
-        df = pd.DataFrame({'Error': [f'Failed to generate export: {str(e)}']})
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Error', index=False)
-        return output.getvalue()
-
-def process_export(export):
-    """Process export request - FIXED VERSION"""
-    try:
-        if export.export_type == 'APPLICATIONS':
-            data = get_applications_data(export.recruiter)
-            sheet_name = 'Applications'
-            filename_prefix = 'applications'
-            
-        elif export.export_type == 'CANDIDATES':
-            data = get_candidates_data(export.recruiter)
-            sheet_name = 'Candidates'
-            filename_prefix = 'candidates'
-            
-        elif export.export_type == 'JOBS':
-            data = get_jobs_data(export.recruiter)
-            sheet_name = 'Jobs'
-            filename_prefix = 'jobs'
-            
-        elif export.export_type == 'ANALYTICS':
-            data = get_analytics_data(export.recruiter)
-            sheet_name = 'Analytics'
-            filename_prefix = 'analytics'
-            
-        else:
-            data = []
-            sheet_name = 'Export'
-            filename_prefix = 'export'
-        
-        # Generate file based on format
-        if export.format == 'EXCEL':
-            file_content = generate_excel_export(data, sheet_name)
-            file_extension = 'xlsx'
-            
-        elif export.format == 'CSV':
-            file_content = generate_csv_export(data, sheet_name)
-            file_extension = 'csv'
-            
-        elif export.format == 'JSON':
-            file_content = generate_json_export(data)
-            file_extension = 'json'
-            
-        elif export.format == 'PDF':
-            file_content = generate_pdf_export(data, sheet_name)
-            file_extension = 'pdf'
-            
-        else:
-            file_content = generate_excel_export(data, sheet_name)
-            file_extension = 'xlsx'
-        
-        filename = f"{filename_prefix}_{export.recruiter.id}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-        export.file.save(filename, ContentFile(file_content))
-        export.status = 'COMPLETED'
-        export.completed_at = timezone.now()
-        export.save()
-        
-    except Exception as e:
-        print(f"Export processing error: {e}")
-        export.status = 'FAILED'
-        export.save()
+    return Response({
+        'success': True,
+        'export_id': export.id,
+        'status': 'PENDING'
+    }, status=status.HTTP_202_ACCEPTED)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
@@ -767,6 +561,9 @@ def debug_exports(request):
             'export_type': export.export_type,
             'format': export.format,
             'status': export.status,
+            'progress': export.progress,
+            'attempts': export.attempts,
+            'error': export.error,
             'file_exists': bool(export.file),
             'file_name': export.file.name if export.file else None,
             'created_at': export.created_at,
@@ -796,6 +593,12 @@ class ReportDetailView(generics.RetrieveDestroyAPIView):
     
     def get_queryset(self):
         return RecruitmentReport.objects.filter(recruiter=self.request.user)
+    
+    def perform_destroy(self, instance):
+        exported_file = instance.exported_file
+        instance.delete()
+        if exported_file:
+            release_file(exported_file.storage, exported_file.name)
 
 class DashboardViewListCreate(generics.ListCreateAPIView):
     """Manage recruiter dashboard views"""
@@ -818,6 +621,15 @@ class ExportListView(generics.ListAPIView):
     def get_queryset(self):
         return AnalyticsExport.objects.filter(recruiter=self.request.user)
 
+class ExportDetailView(generics.RetrieveAPIView):
+    """Export status and progress"""
+    serializer_class = AnalyticsExportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_url_kwarg = 'export_id'
+    
+    def get_queryset(self):
+        return AnalyticsExport.objects.filter(recruiter=self.request.user)
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def download_export(request, export_id):
@@ -825,39 +637,31 @@ def download_export(request, export_id):
     try:
         export = AnalyticsExport.objects.get(id=export_id, recruiter=request.user)
         
+        if export.status == 'EXPIRED':
+            return Response({
+                'success': False,
+                'error': 'Export file has expired; request the export again'
+            }, status=status.HTTP_410_GONE)
+        
         if export.status != 'COMPLETED' or not export.file:
             return Response({
                 'success': False,
                 'error': 'Export not ready or file missing'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        content_types = {
-            'EXCEL': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'CSV': 'text/csv; charset=utf-8',
-            'JSON': 'application/json; charset=utf-8',
-            'PDF': 'application/pdf'
-        }
-        
         file_extensions = {
             'EXCEL': 'xlsx',
             'CSV': 'csv',
+            'NDJSON': 'ndjson',
             'JSON': 'json',
             'PDF': 'pdf'
         }
         
-        content_type = content_types.get(export.format, 'application/octet-stream')
+        content_type = exports.CONTENT_TYPES.get(export.format, 'application/octet-stream')
         file_extension = file_extensions.get(export.format, 'bin')
-        
-        export.file.open('rb')
-        file_content = export.file.read()
-        export.file.close()
-        
         filename = f"{export.export_type.lower()}_export_{export.id}.{file_extension}"
         
-        response = HttpResponse(file_content, content_type=content_type)
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        return response
+        return file_download_response(export.file, filename, content_type)
         
     except AnalyticsExport.DoesNotExist:
         return Response({
@@ -0,0 +1,228 @@
+# analytics/widgets.py
+"""
+Dashboard widgets.
+
+A saved ``DashboardView`` lists its widgets in ``widget_config``::
+
+    {"widgets": [
+        {"id": "trend", "type": "applications_trend", "options": {"bucket": "week", "days": 90}},
+        {"id": "gaps", "type": "skill_gaps"}
+    ]}
+
+Only the listed widgets are computed. Each one is cached on its own, keyed
+on the recruiter, widget type and the parameters it reads, for the TTL in
+``WIDGETS`` (or the widget's ``cache_ttl`` option), so a cheap, fast-moving
+widget can refresh often without recomputing the expensive ones. Widgets
+missing from the cache are computed concurrently on a thread pool of
+``DASHBOARD_WIDGET_WORKERS`` threads.
+
+Parameters come from, in increasing precedence: the defaults below, the
+dashboard's saved ``filters``, the request's query parameters and the
+widget's own ``options``. A widget only receives (and is only keyed on) the
+parameters listed for it in ``WIDGETS``: the overview, pipeline, sources and
+time-to-hire widgets cover all of the recruiter's applications, so report
+filters do not apply to them.
+"""
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+from .analytics_engine import RecruitmentAnalyticsEngine
+from .trends import DEFAULT_BUCKET, parse_bucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 365
+MAX_CACHE_TTL = 60 * 60 * 24
+
+# Report filters a widget passes on to the engine
+FILTER_KEYS = ('job_id', 'status', 'min_match_score')
+
+# Used when the recruiter has no saved dashboard
+DEFAULT_WIDGET_CONFIG = {'widgets': [{'id': 'overview', 'type': 'overview'}]}
+
+
+def _range(params):
+    end_date = timezone.localdate()
+    return end_date - timedelta(days=params['days']), end_date
+
+
+# type: (compute(engine, params), cache TTL in seconds, parameters it reads)
+WIDGETS = {
+    'overview': (
+        lambda engine, params: engine.get_recruiter_overview(params['days'], params['bucket']),
+        5 * 60,
+        ('days', 'bucket'),
+    ),
+    'applications_trend': (
+        lambda engine, params: engine.get_applications_trend(*_range(params), params['bucket'], params['filters']),
+        5 * 60,
+        ('days', 'bucket', 'filters'),
+    ),
+    'applications_analysis': (
+        lambda engine, params: engine.get_applications_analysis(
+            *_range(params), dict(params['filters'], bucket=params['bucket'])
+        ),
+        15 * 60,
+        ('days', 'bucket', 'filters'),
+    ),
+    'pipeline': (
+        lambda engine, params: engine.get_candidate_pipeline(*_range(params)),
+        15 * 60,
+        ('days',),
+    ),
+    'sources': (
+        lambda engine, params: engine.get_source_analysis(*_range(params)),
+        60 * 60,
+        ('days',),
+    ),
+    'time_to_hire': (
+        lambda engine, params: engine.get_time_to_hire_analysis(*_range(params)),
+        60 * 60,
+        ('days',),
+    ),
+    'skill_gaps': (
+        lambda engine, params: engine.get_skill_gap_analysis(*_range(params), params['filters']),
+        60 * 60,
+        ('days', 'filters'),
+    ),
+}
+
+
+def configured_widgets(widget_config):
+    """The widget entries of a ``widget_config`` (a dict with ``widgets``, or a bare list)"""
+    if isinstance(widget_config, dict):
+        widget_config = widget_config.get('widgets')
+    if not isinstance(widget_config, list):
+        return []
+    return [widget for widget in widget_config if isinstance(widget, dict)]
+
+
+def widget_options(widget):
+    """A widget's ``options``; ValueError unless it is a dict (or missing)"""
+    options = widget.get('options') or {}
+    if not isinstance(options, dict):
+        raise ValueError('options must be an object')
+    return options
+
+
+def widget_params(defaults, widget, widget_type):
+    """
+    Parameters for one widget: ``defaults`` overridden by its ``options``,
+    limited to the ones ``widget_type`` reads
+    """
+    merged = {**defaults, **widget_options(widget)}
+    try:
+        days = int(merged.get('days') or DEFAULT_DAYS)
+    except (TypeError, ValueError):
+        days = DEFAULT_DAYS
+    if days <= 0 or days > MAX_DAYS:
+        days = DEFAULT_DAYS
+    params = {
+        'days': days,
+        'bucket': parse_bucket(merged.get('bucket', DEFAULT_BUCKET)),
+        'filters': {key: merged[key] for key in FILTER_KEYS if merged.get(key) not in (None, '')},
+    }
+    return {key: params[key] for key in WIDGETS[widget_type][2]}
+
+
+def cache_ttl(widget_type, widget):
+    try:
+        ttl = int(widget_options(widget).get('cache_ttl', WIDGETS[widget_type][1]))
+    except (TypeError, ValueError):
+        ttl = WIDGETS[widget_type][1]
+    return max(0, min(ttl, MAX_CACHE_TTL))
+
+
+def cache_key(recruiter, widget_type, params):
+    # The end date is part of the key so day-relative ranges roll over at midnight
+    key_data = [widget_type, params, timezone.localdate()]
+    digest = hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return f"analytics:widget:{recruiter.pk}:{digest}"
+
+
+def compute_widget(recruiter, widget_type, params):
+    compute = WIDGETS[widget_type][0]
+    engine = RecruitmentAnalyticsEngine(recruiter)
+    data = compute(engine, params)
+    if engine.failures:
+        # The engine fell back to empty data (and logged why); report the widget as failed
+        raise RuntimeError(f"Failed sections: {', '.join(engine.failures)}")
+    return data
+
+
+def _compute_in_thread(recruiter, widget_type, params):
+    try:
+        return compute_widget(recruiter, widget_type, params)
+    finally:
+        # Pool threads open their own DB connections; don't leak them
+        connections.close_all()
+
+
+def render_widgets(recruiter, widget_config, defaults):
+    """
+    ``[{'id', 'type', 'data', 'cached'}]`` for each configured widget, in
+    configuration order; unknown or failing widgets carry an ``error``
+    instead of ``data``.
+    """
+    results = []
+    pending = []
+    for index, widget in enumerate(configured_widgets(widget_config)):
+        widget_type = widget.get('type')
+        result = {'id': widget.get('id', index), 'type': widget_type}
+        results.append(result)
+        if widget_type not in WIDGETS:
+            result['error'] = 'Unknown widget type'
+            continue
+        try:
+            params = widget_params(defaults, widget, widget_type)
+        except ValueError as e:
+            result['error'] = f'Invalid widget configuration: {e}'
+            continue
+
+        key = cache_key(recruiter, widget_type, params)
+        data = cache.get(key)
+        if data is not None:
+            result.update(data=data, cached=True)
+        else:
+            pending.append((result, widget_type, params, key, cache_ttl(widget_type, widget)))
+
+    workers = min(getattr(settings, 'DASHBOARD_WIDGET_WORKERS', 4), len(pending))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hirepath-widget') as executor:
+            futures = [
+                executor.submit(_compute_in_thread, recruiter, widget_type, params)
+                for _, widget_type, params, _, _ in pending
+            ]
+            outcomes = [_outcome(future.result) for future in futures]
+    else:
+        outcomes = [
+            _outcome(lambda: compute_widget(recruiter, widget_type, params))
+            for _, widget_type, params, _, _ in pending
+        ]
+
+    for (result, widget_type, params, key, ttl), (data, error) in zip(pending, outcomes):
+        if error is not None:
+            logger.error(f"Dashboard widget {widget_type} failed for recruiter {recruiter.pk}: {error}")
+            result['error'] = 'Failed to compute widget'
+            continue
+        if ttl:
+            cache.set(key, data, ttl)
+        result.update(data=data, cached=False)
+    return results
+
+
+def _outcome(get):
+    """(data, None) from ``get()``, or (None, exception) if it raised"""
+    try:
+        return get(), None
+    except Exception as e:
+        return None, e
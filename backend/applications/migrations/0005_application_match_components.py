@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:04
+
+from django.db import migrations, models
+
+# Version 1 components are derived from the skills_assessment stored in ai_analysis
+BACKFILL_VERSION = 1
+
+
+def backfill_match_components(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    scored = Application.objects.filter(match_score__isnull=False, ai_analysis__isnull=False)
+    batch = []
+    for application in scored.only('id', 'ai_analysis').iterator(chunk_size=500):
+        skills = (application.ai_analysis or {}).get('skills_assessment') or {}
+        percentage = skills.get('match_percentage')
+        application.skills_matched = list(skills.get('matched_skills') or [])
+        application.skills_missing = list(skills.get('missing_skills') or [])
+        application.skills_match_percentage = (
+            min(max(int(percentage), 0), 100) if isinstance(percentage, (int, float)) else None
+        )
+        application.match_components_version = BACKFILL_VERSION
+        batch.append(application)
+        if len(batch) >= 500:
+            Application.objects.bulk_update(batch, [
+                'skills_matched', 'skills_missing', 'skills_match_percentage', 'match_components_version',
+            ])
+            batch = []
+    if batch:
+        Application.objects.bulk_update(batch, [
+            'skills_matched', 'skills_missing', 'skills_match_percentage', 'match_components_version',
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_add_ai_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='match_components_version',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='skills_match_percentage',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='skills_matched',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='skills_missing',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(backfill_match_components, migrations.RunPython.noop),
+    ]
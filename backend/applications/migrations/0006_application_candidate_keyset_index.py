@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_application_match_components'),
+        ('jobs', '0005_job_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-match_score', '-applied_at', 'id'], name='app_job_score_applied_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def backfill_status_events(apps, schema_editor):
+    """
+    Existing rows have no history, so infer the best available one: the
+    submission at applied_at and, for applications no longer pending, one
+    transition to the current status at updated_at.
+    """
+    Application = apps.get_model('applications', 'Application')
+    ApplicationStatusEvent = apps.get_model('applications', 'ApplicationStatusEvent')
+
+    events, changed = [], []
+    rows = Application.objects.only('id', 'job_id', 'status', 'applied_at', 'updated_at')
+    for application in rows.iterator(chunk_size=BATCH_SIZE):
+        events.append(ApplicationStatusEvent(
+            application_id=application.id,
+            job_id=application.job_id,
+            from_status='',
+            to_status='PENDING',
+            at=application.applied_at,
+        ))
+        application.status_changed_at = application.applied_at
+        if application.status != 'PENDING':
+            at = max(application.updated_at, application.applied_at)
+            events.append(ApplicationStatusEvent(
+                application_id=application.id,
+                job_id=application.job_id,
+                from_status='PENDING',
+                to_status=application.status,
+                at=at,
+                time_in_previous_status=at - application.applied_at,
+            ))
+            application.status_changed_at = at
+        changed.append(application)
+
+        if len(changed) >= BATCH_SIZE:
+            ApplicationStatusEvent.objects.bulk_create(events)
+            Application.objects.bulk_update(changed, ['status_changed_at'])
+            events, changed = [], []
+
+    ApplicationStatusEvent.objects.bulk_create(events)
+    Application.objects.bulk_update(changed, ['status_changed_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_application_hot_path_indexes'),
+        ('jobs', '0005_job_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('PENDING', 'Pending'), ('REVIEWED', 'Reviewed'), ('SHORTLISTED', 'Shortlisted'), ('INTERVIEW', 'Interview'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected'), ('WITHDRAWN', 'Withdrawn')], default='', max_length=20)),
+                ('to_status', models.CharField(choices=[('PENDING', 'Pending'), ('REVIEWED', 'Reviewed'), ('SHORTLISTED', 'Shortlisted'), ('INTERVIEW', 'Interview'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected'), ('WITHDRAWN', 'Withdrawn')], max_length=20)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('time_in_previous_status', models.DurationField(blank=True, null=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='applications.application')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_status_events', to='jobs.job')),
+            ],
+            options={
+                'ordering': ['at', 'id'],
+                'indexes': [models.Index(fields=['job', 'to_status', 'at'], name='app_event_job_status_at_idx'), models.Index(fields=['application', 'at'], name='app_event_application_at_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_status_events, migrations.RunPython.noop),
+    ]
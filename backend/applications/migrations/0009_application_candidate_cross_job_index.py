@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_application_status_events'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-match_score', '-applied_at', 'id'], name='app_score_applied_idx'),
+        ),
+    ]
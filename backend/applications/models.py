@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from jobs.models import Job
 from django.utils import timezone
@@ -12,6 +12,10 @@ from ai.services import ai_engine
 logger = logging.getLogger(__name__)
 User = settings.AUTH_USER_MODEL
 
+# Bump when the scoring algorithm or the shape of the stored match components
+# changes; rows scored under an older version are re-queued for scoring.
+MATCH_COMPONENTS_VERSION = 1
+
 class Application(models.Model):
     class Status(models.TextChoices):
         PENDING = "PENDING", "Pending"
@@ -28,12 +32,20 @@ class Application(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # When the current status was entered; every change is logged in ApplicationStatusEvent
+    status_changed_at = models.DateTimeField(null=True, blank=True)
     match_score = models.FloatField(null=True, blank=True)
     
     # AI-enhanced fields
     ai_analysis = models.JSONField(null=True, blank=True, help_text="Detailed AI analysis of the application")
     ai_feedback = models.TextField(blank=True, null=True, help_text="AI-generated feedback for improvement")
     
+    # Match components persisted at scoring time so list endpoints never recompute them
+    skills_matched = models.JSONField(default=list, blank=True)
+    skills_missing = models.JSONField(default=list, blank=True)
+    skills_match_percentage = models.PositiveSmallIntegerField(null=True, blank=True)
+    match_components_version = models.PositiveSmallIntegerField(default=0)
+    
     # Additional fields
     notes = models.TextField(blank=True, null=True, help_text="Recruiter notes about the application")
     interview_date = models.DateTimeField(blank=True, null=True)
@@ -41,15 +53,95 @@ class Application(models.Model):
     class Meta:
         unique_together = ("job", "applicant")
         ordering = ['-applied_at']
+        indexes = [
+            # Recruiter candidate list: keyset order within a job; also serves match_score ranges
+            models.Index(fields=['job', '-match_score', '-applied_at', 'id'], name='app_job_score_applied_idx'),
+            # Recruiter candidate list across all of a recruiter's jobs: same keyset order, no job prefix
+            models.Index(fields=['-match_score', '-applied_at', 'id'], name='app_score_applied_idx'),
+            # Recruiter/analytics: status counts and "hired today" (status + updated_at) per job
+            models.Index(fields=['job', 'status', 'updated_at'], name='app_job_status_updated_idx'),
+            # Recruiter/analytics: applications per job in a date range
+            models.Index(fields=['job', 'applied_at'], name='app_job_applied_idx'),
+            # Graduate dashboard: own applications, newest first
+            models.Index(fields=['applicant', 'applied_at'], name='app_applicant_applied_idx'),
+        ]
 
     def __str__(self):
         return f"{self.applicant.username} → {self.job.title} ({self.status})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can detect transitions
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def save(self, *args, **kwargs):
-        # Calculate match score when application is created or if score is None
-        if self._state.adding or self.match_score is None:
-            self.match_score, self.ai_analysis, self.ai_feedback = self.calculate_ai_match_score()
-        super().save(*args, **kwargs)
+        is_new = self._state.adding
+        with transaction.atomic():
+            previous_status = None if is_new else getattr(self, '_loaded_status', None)
+            if previous_status is None and not is_new:
+                # Not loaded from the database (e.g. returned by bulk_create): compare with the stored row
+                previous_status = Application.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+            status_changed = is_new or (previous_status is not None and previous_status != self.status)
+            event = None
+            if status_changed:
+                event = ApplicationStatusEvent.for_transition(
+                    self, '' if is_new else previous_status, timezone.now()
+                )
+                self.status_changed_at = event.at
+                update_fields = kwargs.get('update_fields')
+                if update_fields is not None and 'status_changed_at' not in update_fields:
+                    kwargs['update_fields'] = list(update_fields) + ['status_changed_at']
+            
+            # The status and its event are written together or not at all
+            super().save(*args, **kwargs)
+            
+            if event is not None:
+                event.application = self
+                event.save()
+        self._loaded_status = self.status
+        
+        if is_new and self.match_score is None:
+            # Scored in the background once the row is committed, never inline (see applications.tasks)
+            from .tasks import queue_missing_scores
+            transaction.on_commit(lambda: queue_missing_scores([self.pk]))
+
+    @staticmethod
+    def build_match_fields(match_score, ai_analysis, ai_feedback) -> Dict[str, Any]:
+        """Column values for one scoring run, including the derived match components"""
+        skills = (ai_analysis or {}).get('skills_assessment') or {}
+        percentage = skills.get('match_percentage')
+        return {
+            'match_score': match_score,
+            'ai_analysis': ai_analysis,
+            'ai_feedback': ai_feedback,
+            'skills_matched': list(skills.get('matched_skills') or []),
+            'skills_missing': list(skills.get('missing_skills') or []),
+            'skills_match_percentage': (
+                min(max(int(percentage), 0), 100) if isinstance(percentage, (int, float)) else None
+            ),
+            'match_components_version': MATCH_COMPONENTS_VERSION,
+        }
+
+    def apply_match_result(self, match_score, ai_analysis, ai_feedback):
+        """Set the score, AI output and match components from one scoring run"""
+        for field, value in self.build_match_fields(match_score, ai_analysis, ai_feedback).items():
+            setattr(self, field, value)
+
+    @property
+    def match_components_current(self) -> bool:
+        return self.match_components_version == MATCH_COMPONENTS_VERSION
+
+    @property
+    def match_details(self) -> Dict[str, Any]:
+        """Stored match components; no scoring happens here"""
+        return {
+            "skills_matched": self.skills_matched or [],
+            "skills_missing": self.skills_missing or [],
+            "skills_match_percentage": self.skills_match_percentage,
+            "feedback": [self.ai_feedback] if self.ai_feedback else [],
+        }
 
     def get_applicant_profile_data(self) -> Dict[str, Any]:
         """Extract structured data from applicant profile for AI analysis"""
@@ -140,7 +232,7 @@ class Application(models.Model):
 
     def refresh_ai_analysis(self):
         """Force refresh of AI analysis"""
-        self.match_score, self.ai_analysis, self.ai_feedback = self.calculate_ai_match_score()
+        self.apply_match_result(*self.calculate_ai_match_score())
         self.save()
 
     def get_ai_enhanced_feedback(self) -> str:
@@ -152,6 +244,12 @@ class Application(models.Model):
         self.refresh_ai_analysis()
         return self.ai_feedback
 
+    def can_withdraw(self) -> bool:
+        """Applications can be withdrawn until a final decision has been made"""
+        return self.status not in (
+            self.Status.ACCEPTED, self.Status.REJECTED, self.Status.WITHDRAWN
+        )
+
     @property
     def is_highly_matched(self) -> bool:
         """Check if this is a highly matched application"""
@@ -160,4 +258,44 @@ class Application(models.Model):
     @property
     def needs_improvement(self) -> bool:
         """Check if application needs improvement"""
-        return self.match_score and self.match_score < 60
\ No newline at end of file
+        return self.match_score and self.match_score < 60
+
+class ApplicationStatusEvent(models.Model):
+    """
+    Append-only log of application status transitions.
+
+    One row per change (plus the initial submission, with an empty
+    ``from_status``), so time-to-hire, stage durations and funnels are SQL
+    aggregates over this table instead of guesses from ``updated_at``.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name="status_events")
+    # Denormalized from application.job so per-job aggregates need no join
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="application_status_events")
+    from_status = models.CharField(max_length=20, choices=Application.Status.choices, blank=True, default='')
+    to_status = models.CharField(max_length=20, choices=Application.Status.choices)
+    at = models.DateTimeField(default=timezone.now)
+    # How long the application sat in from_status; null for the submission event
+    time_in_previous_status = models.DurationField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['at', 'id']
+        indexes = [
+            models.Index(fields=['job', 'to_status', 'at'], name='app_event_job_status_at_idx'),
+            models.Index(fields=['application', 'at'], name='app_event_application_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status or 'NEW'} → {self.to_status} at {self.at:%Y-%m-%d %H:%M}"
+
+    @classmethod
+    def for_transition(cls, application, from_status, at):
+        """Unsaved event for ``application`` moving from ``from_status`` to its current status"""
+        entered_previous = application.status_changed_at or application.applied_at
+        return cls(
+            application=application,
+            job_id=application.job_id,
+            from_status=from_status,
+            to_status=application.status,
+            at=at,
+            time_in_previous_status=(at - entered_previous) if from_status and entered_previous else None,
+        )
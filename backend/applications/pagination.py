@@ -0,0 +1,123 @@
+# backend/applications/pagination.py
+"""
+Keyset pagination for the recruiter candidate list.
+
+Candidates are ordered by ``match_score DESC NULLS LAST, applied_at DESC, id``.
+The cursor is the sort key of the last row on the page, so fetching the next
+page is an index range scan instead of an OFFSET that re-reads every earlier
+row.
+
+Two indexes carry that order: (job, -match_score, -applied_at, id) for the
+list narrowed to one job, and (-match_score, -applied_at, id) for the default
+list across all of a recruiter's jobs, which is read in index order and
+filtered by job until the page is full.
+"""
+import base64
+import json
+
+from django.db import connection
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def candidate_ordering():
+    """
+    ``match_score DESC NULLS LAST, applied_at DESC, id``.
+
+    MySQL and SQLite already sort NULLs last when descending; spelling out
+    NULLS LAST there makes Django emulate it with an ``IS NULL`` sort key,
+    which stops the keyset indexes from being used.
+    """
+    if connection.features.nulls_order_largest:
+        match_score = F('match_score').desc(nulls_last=True)
+    else:
+        match_score = F('match_score').desc()
+    return (match_score, F('applied_at').desc(), F('id').asc())
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_page_size(value):
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return min(max(page_size, 1), MAX_PAGE_SIZE)
+
+
+def encode_cursor(application):
+    payload = [application.match_score, application.applied_at.isoformat(), application.id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return ``(match_score, applied_at, id)`` from an opaque cursor string"""
+    try:
+        match_score, applied_at, application_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii'))
+        )
+        applied_at = parse_datetime(applied_at)
+        if applied_at is None or not isinstance(application_id, int):
+            raise ValueError
+        if match_score is not None:
+            match_score = float(match_score)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    return match_score, applied_at, application_id
+
+
+def after_cursor(queryset, cursor):
+    """Rows strictly after ``cursor`` in candidate order"""
+    match_score, applied_at, application_id = decode_cursor(cursor)
+
+    same_score_after = Q(applied_at__lt=applied_at) | Q(applied_at=applied_at, id__gt=application_id)
+    if match_score is None:
+        # Already in the unscored tail: only later unscored rows remain
+        return queryset.filter(Q(match_score__isnull=True) & same_score_after)
+
+    return queryset.filter(
+        Q(match_score__lt=match_score)
+        | Q(match_score__isnull=True)
+        | (Q(match_score=match_score) & same_score_after)
+    )
+
+
+def page_queryset(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """The query for one page of ``queryset``, with one extra row to detect a next page"""
+    queryset = queryset.order_by(*candidate_ordering())
+    if cursor:
+        queryset = after_cursor(queryset, cursor)
+    return queryset[:page_size + 1]
+
+
+def paginate_candidates(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return ``(rows, next_cursor)`` for one page of ``queryset``.
+
+    One extra row is fetched to know whether another page exists.
+    """
+    rows = list(page_queryset(queryset, cursor, page_size))
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1])
+    return rows, next_cursor
+
+
+def iterate_candidates(queryset, batch_size=500):
+    """
+    Yield every row of ``queryset`` in candidate order, one keyset page at a
+    time, so streaming never holds a server-side cursor (or, on mysqlclient,
+    a fully buffered result set) open.
+    """
+    cursor = None
+    while True:
+        rows, cursor = paginate_candidates(queryset, cursor=cursor, page_size=batch_size)
+        yield from rows
+        if cursor is None:
+            return
@@ -4,6 +4,14 @@ from .models import Application
 from accounts.serializers import UserSerializer
 
 class ApplicationSerializer(serializers.ModelSerializer):
+    """
+    Read-only application representation.
+
+    Only stored values are read: nothing here calls the scoring engine or
+    writes to the database. Applications still waiting for a score come back
+    with ``match_score: null`` and ``score_pending: true``; the views queue
+    them for background scoring.
+    """
     applicant_name = serializers.CharField(source="applicant.get_full_name", read_only=True)
     applicant_email = serializers.CharField(source="applicant.email", read_only=True)
     applicant_details = serializers.SerializerMethodField(read_only=True)
@@ -12,7 +20,8 @@ class ApplicationSerializer(serializers.ModelSerializer):
     company_name = serializers.CharField(source="job.company.name", read_only=True)
     company_logo = serializers.SerializerMethodField(read_only=True)
     
-    match_score = serializers.SerializerMethodField()
+    match_score = serializers.FloatField(read_only=True)
+    score_pending = serializers.SerializerMethodField(read_only=True)
     match_details = serializers.SerializerMethodField()
     
     can_withdraw = serializers.SerializerMethodField(read_only=True)
@@ -20,7 +29,6 @@ class ApplicationSerializer(serializers.ModelSerializer):
     ai_feedback = serializers.SerializerMethodField(read_only=True)
     is_highly_matched = serializers.BooleanField(read_only=True)
     needs_improvement = serializers.BooleanField(read_only=True)
-    is_active = serializers.BooleanField(read_only=True)
     status_timeline = serializers.SerializerMethodField(read_only=True)
    
     class Meta:
@@ -29,36 +37,18 @@ class ApplicationSerializer(serializers.ModelSerializer):
             "id", "job", "job_title", "company_name", "company_logo",
             "applicant", "applicant_name", "applicant_email", "applicant_details",
             "cover_letter", "status", "applied_at", "updated_at", 
-            "match_score", "match_details", "notes", "interview_date",
+            "match_score", "score_pending", "match_details", "notes", "interview_date",
             "can_withdraw", "ai_analysis", "ai_feedback", "is_highly_matched",
-            "needs_improvement", "is_active", "status_timeline"
-        ]
-        read_only_fields = [
-            "id", "status", "applied_at", "updated_at", "applicant_name", 
-            "applicant_email", "job_title", "company_name", "company_logo",
-            "applicant", "match_score", "match_details", "can_withdraw",
-            "ai_analysis", "ai_feedback", "is_highly_matched", "needs_improvement",
-            "is_active", "status_timeline"
+            "needs_improvement", "status_timeline"
         ]
+        read_only_fields = fields
 
-    def get_match_score(self, obj):
-        try:
-            if obj.match_score is None:
-                obj.match_score = obj.calculate_match_score()
-                obj.save()
-            return obj.match_score or 0
-        except Exception:
-            return 0
+    def get_score_pending(self, obj):
+        return obj.match_score is None or not obj.match_components_current
 
     def get_match_details(self, obj):
-        try:
-            return obj.calculate_match_details()
-        except Exception:
-            return {
-                "skills_matched": [],
-                "skills_missing": [],
-                "feedback": ["Error calculating match details"]
-            }
+        """Match components persisted by the last scoring run"""
+        return obj.match_details
 
     def get_company_logo(self, obj):
         try:
@@ -90,41 +80,83 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
     def get_can_withdraw(self, obj):
         """Check if application can be withdrawn"""
-        try:
-            return obj.can_withdraw()
-        except Exception:
-            return False
+        return obj.can_withdraw()
 
     def get_ai_analysis(self, obj):
         """Return AI analysis data"""
-        try:
-            return obj.ai_analysis or {}
-        except Exception:
-            return {}
+        return obj.ai_analysis or {}
 
     def get_ai_feedback(self, obj):
         """Return AI feedback"""
-        try:
-            return obj.ai_feedback or "No AI feedback available yet"
-        except Exception:
-            return "Error retrieving AI feedback"
+        return obj.ai_feedback or "No AI feedback available yet"
 
     def get_status_timeline(self, obj):
-        """Get application status timeline"""
-        try:
-            return obj.get_status_timeline()
-        except Exception:
-            return {
-                'applied': obj.applied_at,
-                'last_updated': obj.updated_at,
-                'interview_scheduled': obj.interview_date
-            }
+        """Get application status timeline (prefetch ``status_events`` for lists)"""
+        return {
+            'applied': obj.applied_at,
+            'last_updated': obj.updated_at,
+            'status_since': obj.status_changed_at,
+            'interview_scheduled': obj.interview_date,
+            'history': [
+                {
+                    'from_status': event.from_status or None,
+                    'to_status': event.to_status,
+                    'at': event.at
+                }
+                for event in obj.status_events.all()
+            ]
+        }
+
+class ApplicationCompactSerializer(serializers.ModelSerializer):
+    """Lightweight read-only row for list screens (?compact=true)"""
+    applicant_name = serializers.CharField(source="applicant.get_full_name", read_only=True)
+    applicant_email = serializers.CharField(source="applicant.email", read_only=True)
+    job_title = serializers.CharField(source="job.title", read_only=True)
+    company_name = serializers.CharField(source="job.company.name", read_only=True)
+    score_pending = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = Application
+        fields = [
+            "id", "job", "job_title", "company_name",
+            "applicant", "applicant_name", "applicant_email",
+            "status", "applied_at", "updated_at",
+            "match_score", "score_pending", "interview_date"
+        ]
+        read_only_fields = fields
+
+    def get_score_pending(self, obj):
+        return obj.match_score is None or not obj.match_components_current
 
 class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ['status', 'notes', 'interview_date']
 
+class ApplicationBulkUpdateSerializer(serializers.Serializer):
+    """Apply the same status/notes/interview change to many applications"""
+    MAX_APPLICATIONS = 500
+    UPDATE_FIELDS = ('status', 'notes', 'interview_date')
+
+    application_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_APPLICATIONS
+    )
+    status = serializers.ChoiceField(choices=Application.Status.choices, required=False)
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    interview_date = serializers.DateTimeField(required=False, allow_null=True)
+
+    def validate_application_ids(self, value):
+        return sorted(set(value))
+
+    def validate(self, attrs):
+        if not any(field in attrs for field in self.UPDATE_FIELDS):
+            raise serializers.ValidationError(
+                f"Provide at least one of: {', '.join(self.UPDATE_FIELDS)}"
+            )
+        return attrs
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
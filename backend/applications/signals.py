@@ -0,0 +1,53 @@
+# backend/applications/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from jobs.models import Job
+from .models import Application
+from hirepath.caching import bump_namespace_version
+
+# Sent with ``applications=[...]`` after queryset.update()/bulk_update() change
+# applications, since those send no model signals. Send it after commit.
+applications_updated = Signal()
+
+
+def stats_namespace(user_id):
+    """Cache namespace for one user's dashboard stats (graduate or recruiter)"""
+    return f"applications:stats:{user_id}"
+
+
+def invalidate_stats(user_ids):
+    for user_id in set(user_ids):
+        if user_id:
+            bump_namespace_version(stats_namespace(user_id))
+
+
+def invalidate_application_stats(applications):
+    """Invalidate the cached stats of every applicant and recruiter involved"""
+    user_ids = []
+    for application in applications:
+        user_ids.append(application.applicant_id)
+        user_ids.append(application.job.created_by_id)
+    invalidate_stats(user_ids)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def application_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_application_stats([instance])
+
+
+@receiver(applications_updated)
+def applications_bulk_changed(sender, applications, **kwargs):
+    invalidate_application_stats(applications)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def job_changed(sender, instance, raw=False, **kwargs):
+    """Recruiter stats list every job, including ones without applications"""
+    if raw:
+        return
+    invalidate_stats([instance.created_by_id])
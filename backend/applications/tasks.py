@@ -0,0 +1,66 @@
+# backend/applications/tasks.py
+import logging
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from hirepath.tasks import background_task
+
+logger = logging.getLogger(__name__)
+
+# How long an application stays marked as "queued for scoring" (seconds)
+SCORING_QUEUE_TIMEOUT = 60 * 10
+
+
+def _scoring_key(application_id):
+    return f"applications:scoring:{application_id}"
+
+
+def needs_scoring_q():
+    """Applications without a score, or scored by an older algorithm version"""
+    from .models import MATCH_COMPONENTS_VERSION
+    return Q(match_score__isnull=True) | Q(match_components_version__lt=MATCH_COMPONENTS_VERSION)
+
+
+@background_task
+def score_applications(application_ids):
+    """Compute and store match scores and components for applications that need them"""
+    from .models import Application
+    from .signals import applications_updated
+
+    applications = Application.objects.filter(
+        needs_scoring_q(), pk__in=application_ids
+    ).select_related('job', 'applicant')
+
+    for application in applications:
+        try:
+            match_fields = Application.build_match_fields(*application.calculate_ai_match_score())
+            # update() rather than save(): no re-entry into the scoring check in save().
+            # update() skips auto_now, so bump updated_at by hand (report cache watermark)
+            if Application.objects.filter(needs_scoring_q(), pk=application.pk).update(
+                updated_at=timezone.now(), **match_fields
+            ):
+                applications_updated.send(sender=Application, applications=[application])
+        except Exception as e:
+            logger.error(f"Background scoring failed for application {application.pk}: {e}")
+        finally:
+            cache.delete(_scoring_key(application.pk))
+
+
+def queue_missing_scores(application_ids):
+    """
+    Queue background scoring for the given unscored (or outdated) applications.
+    Applications already queued recently are skipped, so repeated list
+    requests don't pile up duplicate work.
+    """
+    keys = {_scoring_key(application_id): application_id for application_id in application_ids}
+    already_queued = cache.get_many(list(keys))
+    queued = [application_id for key, application_id in keys.items() if key not in already_queued]
+    if queued:
+        # Two round trips for the whole page; a rare duplicate from a concurrent
+        # request is harmless, as scoring skips rows that no longer need it
+        cache.set_many({_scoring_key(application_id): True for application_id in queued}, timeout=SCORING_QUEUE_TIMEOUT)
+        score_applications.enqueue(queued)
+    return queued
+
@@ -1,3 +1,729 @@
-from django.test import TestCase
+import importlib
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.db.models import Case, DateTimeField, Max, Min, Value, When
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.analytics_engine import RecruitmentAnalyticsEngine
+from companies.models import Company
+from hirepath.caching import shared_cache
+from hirepath.dates import date_range_filter
+from jobs.models import Job
+from notifications.models import Notification
+
+from .models import MATCH_COMPONENTS_VERSION, Application, ApplicationStatusEvent
+from .pagination import iterate_candidates, page_queryset
+from .serializers import ApplicationCompactSerializer, ApplicationSerializer
+from .tasks import needs_scoring_q, score_applications
+from .views import MyApplicationsView, candidate_queryset
+
+
+class ApplicationQueryPlanTests(TestCase):
+    """
+    Regression tests for the indexes behind the recruiter and analytics hot
+    paths. Each test builds its query through the view or engine that runs it
+    and checks the intended index can narrow (or already orders) it, so a
+    rewrite that would fall back to scanning or sorting the table fails here.
+    On MySQL the plan is checked too.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='plan_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Plan Co', location='Cape Town', created_by=cls.recruiter)
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Plan test job',
+                company=company,
+                location='Cape Town',
+                employment_type=Job.EMPLOYMENT_TYPES[0][0],
+                work_type=Job.WORK_TYPES[0][0],
+                experience_level=Job.EXPERIENCE_LEVELS[0][0],
+                created_by=cls.recruiter,
+            )
+            for i in range(3)
+        ]
+        cls.graduates = User.objects.bulk_create(
+            [User(username=f'plan_graduate_{i}', role='GRADUATE') for i in range(40)]
+        )
+        if not all(graduate.pk for graduate in cls.graduates):
+            cls.graduates = list(User.objects.filter(username__startswith='plan_graduate_'))
+
+        statuses = [choice for choice, _ in Application.Status.choices]
+        now = timezone.now()
+        # bulk_create skips save(), so no scoring runs while seeding
+        Application.objects.bulk_create([
+            Application(
+                job=job,
+                applicant=graduate,
+                status=statuses[(i + j) % len(statuses)],
+                match_score=float((i * 7 + j) % 100),
+            )
+            for j, job in enumerate(cls.jobs)
+            for i, graduate in enumerate(cls.graduates)
+        ])
+        # applied_at is auto_now_add, so bulk_create ignores it; spread it out afterwards
+        Application.objects.filter(applicant__in=cls.graduates).update(applied_at=Case(
+            *[When(applicant=graduate, then=Value(now - timedelta(days=i % 60))) for i, graduate in enumerate(cls.graduates)],
+            output_field=DateTimeField(),
+        ))
+
+    def engine(self):
+        return RecruitmentAnalyticsEngine(self.recruiter)
+
+    def recruiter_applications(self):
+        # order_by() as count()/aggregate() run it
+        return self.engine().applications.order_by()
+
+    def candidate_page(self, **params):
+        # The exact query recruiter_candidates runs for the first page
+        applications, _ = candidate_queryset(self.recruiter, params)
+        return page_queryset(applications)
+
+    def index_columns(self, index_name):
+        index = next(index for index in Application._meta.indexes if index.name == index_name)
+        return [
+            (Application._meta.get_field(name).column, order == 'DESC')
+            for name, order in index.fields_orders
+        ]
+
+    def filtered_columns(self, queryset):
+        """``{column: lookup}`` for the base table's columns in the top-level AND of the WHERE clause"""
+        base = queryset.query.get_initial_alias()
+        return {
+            child.lhs.target.column: child.lookup_name
+            for child in queryset.query.where.children
+            if getattr(child, 'lookup_name', None) and getattr(child.lhs, 'alias', None) == base
+        }
+
+    def assertPlannerMayUse(self, queryset, index_name):
+        # Plans depend on the vendor and on table statistics, so plan text is
+        # only checked on the production database, where EXPLAIN lists the
+        # index under possible_keys whenever the optimizer can use it
+        if connection.vendor == 'mysql':
+            plan = queryset.explain()
+            self.assertIn(index_name, plan, f"Expected {index_name} in plan:\n{plan}")
+
+    def assertIndexUsable(self, queryset, index_name, prefix):
+        """
+        The WHERE clause constrains ``prefix``, the index's leading columns:
+        equality (or IN) on each but the last, which may be a range.
+        """
+        filtered = self.filtered_columns(queryset)
+        usable = []
+        for column, _ in self.index_columns(index_name):
+            if column not in filtered:
+                break
+            usable.append(column)
+            if filtered[column] not in ('exact', 'in'):
+                break
+        self.assertEqual(usable, list(prefix), f"{index_name} is not usable for:\n{queryset.query}")
+        self.assertPlannerMayUse(queryset, index_name)
+
+    def assertIndexServesOrdering(self, queryset, index_name):
+        """
+        The index returns rows already in the queryset's ORDER BY: after the
+        leading columns pinned by equality filters, its columns are exactly
+        the sort key, all in the same or all in the reverse direction, so the
+        rows can be read without a sort.
+        """
+        columns = self.index_columns(index_name)
+        filtered = self.filtered_columns(queryset)
+        while columns and filtered.get(columns[0][0]) == 'exact':
+            columns.pop(0)
+        ordering = []
+        for order_by in queryset.query.order_by or Application._meta.ordering:
+            if isinstance(order_by, str):
+                name, descending = order_by.lstrip('-'), order_by.startswith('-')
+            else:
+                name, descending = order_by.expression.name, order_by.descending
+            ordering.append((Application._meta.get_field(name).column, descending))
+        reverse = [(column, not descending) for column, descending in columns]
+        self.assertIn(ordering, (columns, reverse), f"{index_name} does not match ORDER BY of:\n{queryset.query}")
+        self.assertPlannerMayUse(queryset, index_name)
+
+    def test_candidate_page_is_served_by_cross_job_keyset_index(self):
+        self.assertIndexServesOrdering(self.candidate_page(), 'app_score_applied_idx')
+        # The per-job index cannot serve the list across all of a recruiter's jobs
+        with self.assertRaises(AssertionError):
+            self.assertIndexServesOrdering(self.candidate_page(), 'app_job_score_applied_idx')
+
+    def test_job_candidate_page_is_served_by_job_keyset_index(self):
+        self.assertIndexServesOrdering(self.candidate_page(job=str(self.jobs[0].id)), 'app_job_score_applied_idx')
+
+    def test_min_match_score_uses_keyset_index(self):
+        queryset = self.candidate_page(job=str(self.jobs[0].id), min_score='80')
+        self.assertIndexUsable(queryset, 'app_job_score_applied_idx', ['job_id', 'match_score'])
+
+    def test_status_counts_use_job_status_index(self):
+        queryset = self.engine()._apply_filters(self.recruiter_applications(), {'status': Application.Status.PENDING})
+        self.assertIndexUsable(queryset, 'app_job_status_updated_idx', ['job_id', 'status'])
+
+    def test_job_status_filter_uses_job_status_index(self):
+        queryset = self.engine()._apply_filters(self.recruiter_applications(), {
+            'job_id': self.jobs[0].id, 'status': Application.Status.ACCEPTED,
+        })
+        self.assertIndexUsable(queryset, 'app_job_status_updated_idx', ['job_id', 'status'])
+
+    def test_applied_date_range_uses_job_applied_index(self):
+        # The range every engine report starts from (see get_applications_analysis)
+        today = timezone.localdate()
+        queryset = self.recruiter_applications().filter(
+            **date_range_filter('applied_at', today - timedelta(days=7), today)
+        )
+        self.assertIndexUsable(queryset, 'app_job_applied_idx', ['job_id', 'applied_at'])
+
+    def test_graduate_applications_use_applicant_index(self):
+        view = MyApplicationsView(request=SimpleNamespace(user=self.graduates[0]))
+        queryset = view.get_queryset()
+        self.assertIndexUsable(queryset, 'app_applicant_applied_idx', ['applicant_id'])
+        self.assertIndexServesOrdering(queryset, 'app_applicant_applied_idx')
+
+    def test_date_range_filter_matches_local_calendar_days(self):
+        today = timezone.localdate()
+        start = today - timedelta(days=7)
+        legacy = self.recruiter_applications().filter(applied_at__date__range=[start, today])
+        sargable = self.recruiter_applications().filter(**date_range_filter('applied_at', start, today))
+        self.assertEqual(set(legacy.values_list('id', flat=True)), set(sargable.values_list('id', flat=True)))
+        # One graduate per day 0..39 days ago: the range holds the 8 days from start to today
+        self.assertEqual(sargable.count(), 8 * len(self.jobs))
+
+    def test_seed_spreads_applied_dates(self):
+        applied = self.recruiter_applications().aggregate(first=Min('applied_at'), last=Max('applied_at'))
+        self.assertEqual((applied['last'] - applied['first']).days, 39)
+        self.assertEqual(self.recruiter_applications().dates('applied_at', 'day').count(), 40)
+
+
+class CandidateListTests(TestCase):
+    """Keyset pages and the NDJSON stream of the recruiter candidate list"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='list_recruiter', role='RECRUITER')
+        other = User.objects.create(username='list_other_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='List Co', location='Durban', created_by=cls.recruiter)
+
+        def make_job(title, created_by):
+            return Job.objects.create(
+                title=title,
+                description='Candidate list test job',
+                company=company,
+                location='Durban',
+                employment_type=Job.EMPLOYMENT_TYPES[0][0],
+                work_type=Job.WORK_TYPES[0][0],
+                experience_level=Job.EXPERIENCE_LEVELS[0][0],
+                created_by=created_by,
+            )
+
+        cls.job_a, cls.job_b = make_job('Job A', cls.recruiter), make_job('Job B', cls.recruiter)
+        other_job = make_job('Other Job', other)
+        graduates = User.objects.bulk_create(
+            [User(username=f'list_graduate_{i}', role='GRADUATE') for i in range(7)]
+        )
+        if not all(graduate.pk for graduate in graduates):
+            graduates = list(User.objects.filter(username__startswith='list_graduate_').order_by('username'))
+
+        now = timezone.now()
+        # (name, job, graduate, match_score, days ago)
+        rows = [
+            ('a90_old', cls.job_a, graduates[0], 90.0, 2),
+            ('b90_new', cls.job_b, graduates[6], 90.0, 1),
+            ('a70_1', cls.job_a, graduates[1], 70.0, 0),
+            ('a70_2', cls.job_a, graduates[2], 70.0, 0),
+            ('b70', cls.job_b, graduates[4], 70.0, 0),
+            ('a_unscored', cls.job_a, graduates[3], None, 3),
+            ('b_unscored', cls.job_b, graduates[5], None, 3),
+            ('other', other_job, graduates[0], 95.0, 0),
+        ]
+        # bulk_create skips save(), so no scoring runs while seeding
+        Application.objects.bulk_create([
+            Application(job=job, applicant=graduate, match_score=score) for _, job, graduate, score, _ in rows
+        ])
+        cls.ids = {}
+        for name, job, graduate, _, days in rows:
+            application = Application.objects.get(job=job, applicant=graduate)
+            # applied_at is auto_now_add, so bulk_create ignores it; set it afterwards
+            Application.objects.filter(pk=application.pk).update(applied_at=now - timedelta(days=days))
+            cls.ids[name] = application.pk
+
+        ties = sorted(cls.ids[name] for name in ('a70_1', 'a70_2', 'b70'))
+        unscored = sorted(cls.ids[name] for name in ('a_unscored', 'b_unscored'))
+        # Score descending with unscored last, then newest first, then id
+        cls.expected = [cls.ids['b90_new'], cls.ids['a90_old'], *ties, *unscored]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def get(self, **params):
+        return self.client.get('/applications/recruiter/candidates/', params)
+
+    def walk_pages(self, **params):
+        ids, cursor, pages = [], None, 0
+        while True:
+            response = self.get(**params, **({'cursor': cursor} if cursor else {}))
+            self.assertEqual(response.status_code, 200)
+            ids += [row['application_id'] for row in response.data['results']]
+            pages += 1
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                return ids, pages
+
+    def test_cursor_round_trip_returns_every_candidate_once_in_order(self):
+        for page_size in (1, 2, 3, 50):
+            with self.subTest(page_size=page_size):
+                ids, pages = self.walk_pages(page_size=page_size)
+                self.assertEqual(ids, self.expected)
+                self.assertEqual(pages, -(-len(self.expected) // page_size))
+
+    def test_ties_break_on_id_and_unscored_come_last(self):
+        response = self.get(page_size=3)
+        self.assertEqual([row['application_id'] for row in response.data['results']], self.expected[:3])
+
+        # Resuming inside the equal-score run, then crossing into the unscored tail
+        response = self.get(page_size=3, cursor=response.data['next_cursor'])
+        self.assertEqual([row['application_id'] for row in response.data['results']], self.expected[3:6])
+        response = self.get(page_size=3, cursor=response.data['next_cursor'])
+        self.assertEqual([row['application_id'] for row in response.data['results']], self.expected[6:])
+        self.assertIsNone(response.data['next_cursor'])
+
+    def test_pages_respect_filters(self):
+        ids, _ = self.walk_pages(page_size=1, job=str(self.job_a.id), min_score='50')
+        self.assertEqual(ids, [i for i in self.expected if i in {
+            self.ids['a90_old'], self.ids['a70_1'], self.ids['a70_2'],
+        }])
+        self.assertEqual(self.get(job=str(self.job_a.id)).data['total_count'], 4)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.get(cursor='not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'Invalid cursor'})
+
+    def test_ndjson_streams_every_candidate_in_order(self):
+        response = self.get(format='ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['application_id'] for row in rows], self.expected)
+
+        response = self.get(format='ndjson', job=str(self.job_b.id))
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(
+            [row['application_id'] for row in rows],
+            [self.ids['b90_new'], self.ids['b70'], self.ids['b_unscored']],
+        )
+
+    def test_iterate_candidates_reads_in_keyset_batches(self):
+        applications, _ = candidate_queryset(self.recruiter, {})
+        with self.assertNumQueries(4):
+            ids = [row.id for row in iterate_candidates(applications, batch_size=2)]
+        self.assertEqual(ids, self.expected)
+
+
+class RecruiterStatsCacheTests(TestCase):
+    """Per-user stats are cached per process but invalidated for every process"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='stats_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Stats Co', location='Pretoria', created_by=cls.recruiter)
+        cls.job = Job.objects.create(
+            title='Stats Job',
+            description='Stats test job',
+            company=company,
+            location='Pretoria',
+            employment_type=Job.EMPLOYMENT_TYPES[0][0],
+            work_type=Job.WORK_TYPES[0][0],
+            experience_level=Job.EXPERIENCE_LEVELS[0][0],
+            created_by=cls.recruiter,
+        )
+        graduates = User.objects.bulk_create(
+            [User(username=f'stats_graduate_{i}', role='GRADUATE') for i in range(2)]
+        )
+        if not all(graduate.pk for graduate in graduates):
+            graduates = list(User.objects.filter(username__startswith='stats_graduate_'))
+        # bulk_create skips save(), so no scoring runs while seeding
+        Application.objects.bulk_create([
+            Application(job=cls.job, applicant=graduate, match_score=50.0) for graduate in graduates
+        ])
+
+    def setUp(self):
+        cache.clear()
+        shared_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def test_change_in_another_process_invalidates_stats(self):
+        self.assertEqual(self.client.get('/applications/recruiter/stats/').data['totalApplications'], 2)
+
+        # Another worker process: its default cache is its own, only the shared cache is common
+        with override_settings(CACHES={
+            **settings.CACHES,
+            'default': {**settings.CACHES['default'], 'LOCATION': 'other-process'},
+        }):
+            Application.objects.filter(job=self.job).first().delete()
+
+        self.assertEqual(self.client.get('/applications/recruiter/stats/').data['totalApplications'], 1)
+
+
+class StatusEventTests(TestCase):
+    """Application.save records each status transition atomically with the status"""
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='event_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Event Co', location='Pretoria', created_by=recruiter)
+        cls.job = Job.objects.create(
+            title='Event Job',
+            description='Status event test job',
+            company=company,
+            location='Pretoria',
+            employment_type=Job.EMPLOYMENT_TYPES[0][0],
+            work_type=Job.WORK_TYPES[0][0],
+            experience_level=Job.EXPERIENCE_LEVELS[0][0],
+            created_by=recruiter,
+        )
+        cls.graduate = User.objects.create(username='event_graduate', role='GRADUATE')
+
+    def create_application(self):
+        # bulk_create skips save(), so no scoring runs while seeding
+        Application.objects.bulk_create([Application(job=self.job, applicant=self.graduate, match_score=50.0)])
+        application = Application.objects.get(job=self.job, applicant=self.graduate)
+        # As if the instance had not been loaded from the database (e.g. one returned by bulk_create)
+        del application._loaded_status
+        return application
+
+    def test_transition_is_recorded_for_instance_not_loaded_from_db(self):
+        application = self.create_application()
+        application.status = Application.Status.REVIEWED
+        application.save()
+
+        event = ApplicationStatusEvent.objects.get(application=application)
+        self.assertEqual((event.from_status, event.to_status), ('PENDING', 'REVIEWED'))
+
+        # Saving again without a change records nothing
+        application.save()
+        self.assertEqual(ApplicationStatusEvent.objects.filter(application=application).count(), 1)
+
+    def test_status_is_not_saved_without_its_event(self):
+        self.create_application()
+        application = Application.objects.get(job=self.job, applicant=self.graduate)
+        application.status = Application.Status.REVIEWED
+        with mock.patch.object(ApplicationStatusEvent, 'save', side_effect=DatabaseError('event write failed')):
+            with self.assertRaises(DatabaseError):
+                application.save()
+
+        self.assertEqual(Application.objects.get(pk=application.pk).status, Application.Status.PENDING)
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
+
+
+class BulkUpdateTests(TestCase):
+    """bulk_update_applications touches only the recruiter's rows and records each transition"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='bulk_recruiter', role='RECRUITER')
+        other_recruiter = User.objects.create(username='bulk_other_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Bulk Co', location='Gqeberha', created_by=cls.recruiter)
+
+        def create_job(title, created_by):
+            return Job.objects.create(
+                title=title,
+                description='Bulk update test job',
+                company=company,
+                location='Gqeberha',
+                employment_type=Job.EMPLOYMENT_TYPES[0][0],
+                work_type=Job.WORK_TYPES[0][0],
+                experience_level=Job.EXPERIENCE_LEVELS[0][0],
+                created_by=created_by,
+            )
+
+        job = create_job('Bulk Job', cls.recruiter)
+        other_job = create_job('Other Bulk Job', other_recruiter)
+        graduates = [User.objects.create(username=f'bulk_graduate_{i}', role='GRADUATE') for i in range(3)]
+        # bulk_create skips save(), so no scoring is queued while seeding
+        Application.objects.bulk_create(
+            [Application(job=job, applicant=graduate, match_score=50.0) for graduate in graduates[:2]]
+            + [Application(job=job, applicant=graduates[2], match_score=50.0, status=Application.Status.REVIEWED)]
+            + [Application(job=other_job, applicant=graduates[0], match_score=50.0)]
+        )
+        cls.own_ids = list(Application.objects.filter(job=job).order_by('id').values_list('id', flat=True))
+        cls.other_id = Application.objects.get(job=other_job).id
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def post(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/applications/bulk/', payload, format='json')
+
+    def test_status_change_records_one_event_per_changed_row(self):
+        response = self.post({'application_ids': self.own_ids, 'status': Application.Status.REVIEWED})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+        # The third application was already REVIEWED
+        self.assertCountEqual(response.data['status_changed_ids'], self.own_ids[:2])
+        events = ApplicationStatusEvent.objects.order_by('application_id')
+        self.assertEqual(
+            [(event.application_id, event.from_status, event.to_status) for event in events],
+            [(pk, 'PENDING', 'REVIEWED') for pk in self.own_ids[:2]],
+        )
+        self.assertEqual(
+            Notification.objects.filter(kind=Notification.Kind.STATUS_CHANGED).count(), 2
+        )
+        changed = Application.objects.filter(pk__in=self.own_ids[:2])
+        self.assertFalse(changed.filter(status_changed_at__isnull=True).exists())
+
+    def test_notes_only_update_records_no_events(self):
+        response = self.post({'application_ids': self.own_ids, 'notes': 'Phone screen booked'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status_changed_ids'], [])
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
+        self.assertEqual(
+            set(Application.objects.filter(pk__in=self.own_ids).values_list('notes', flat=True)),
+            {'Phone screen booked'},
+        )
+
+    def test_other_recruiters_applications_reject_the_whole_batch(self):
+        response = self.post({
+            'application_ids': self.own_ids + [self.other_id], 'status': Application.Status.REJECTED
+        })
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['missing_ids'], [self.other_id])
+        self.assertFalse(Application.objects.filter(status=Application.Status.REJECTED).exists())
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
+
+    def test_unknown_ids_are_reported(self):
+        missing_id = max(self.own_ids + [self.other_id]) + 100
+        response = self.post({'application_ids': [self.own_ids[0], missing_id], 'notes': 'x'})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['missing_ids'], [missing_id])
+        self.assertIsNone(Application.objects.get(pk=self.own_ids[0]).notes)
+
+    def test_invalid_payloads(self):
+        for payload in (
+            {'application_ids': [], 'notes': 'x'},
+            {'application_ids': [0], 'notes': 'x'},
+            {'application_ids': ['abc'], 'notes': 'x'},
+            {'application_ids': self.own_ids},
+            {'application_ids': self.own_ids, 'status': 'NOT_A_STATUS'},
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
+
+
+class LazyScoringTests(TestCase):
+    """Scores are computed in the background, never while saving or serializing"""
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='lazy_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Lazy Co', location='Durban', created_by=recruiter)
+        cls.job = Job.objects.create(
+            title='Lazy Job',
+            description='Lazy scoring test job',
+            company=company,
+            location='Durban',
+            employment_type=Job.EMPLOYMENT_TYPES[0][0],
+            work_type=Job.WORK_TYPES[0][0],
+            experience_level=Job.EXPERIENCE_LEVELS[0][0],
+            created_by=recruiter,
+        )
+        cls.graduate = User.objects.create(username='lazy_graduate', role='GRADUATE')
+        cls.other_graduate = User.objects.create(username='lazy_other_graduate', role='GRADUATE')
+        other_job = Job.objects.create(
+            title='Other Lazy Job',
+            description='Lazy scoring test job',
+            company=company,
+            location='Durban',
+            employment_type=Job.EMPLOYMENT_TYPES[0][0],
+            work_type=Job.WORK_TYPES[0][0],
+            experience_level=Job.EXPERIENCE_LEVELS[0][0],
+            created_by=recruiter,
+        )
+        # bulk_create skips save(), so no scoring is queued while seeding
+        Application.objects.bulk_create([
+            Application(job=cls.job, applicant=cls.graduate, match_score=None),
+            Application(job=other_job, applicant=cls.graduate, match_score=80.0,
+                        skills_matched=['Python'], skills_missing=['SQL'], skills_match_percentage=50,
+                        match_components_version=1),
+            Application(job=cls.job, applicant=cls.other_graduate, match_score=None),
+        ])
+        cls.unscored = Application.objects.get(job=cls.job, applicant=cls.graduate)
+        cls.scored = Application.objects.get(job=other_job, applicant=cls.graduate)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.graduate)
+        scoring = mock.patch.object(
+            Application, 'calculate_ai_match_score', side_effect=AssertionError('scored inline')
+        )
+        scoring.start()
+        self.addCleanup(scoring.stop)
+
+    def test_create_queues_scoring_after_commit(self):
+        job = Job.objects.get(title='Other Lazy Job')
+        with mock.patch('applications.tasks.score_applications.enqueue') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                application = Application.objects.create(job=job, applicant=self.other_graduate)
+        self.assertIsNone(application.match_score)
+        enqueue.assert_called_once_with([application.pk])
+
+    def test_list_queues_only_the_returned_unscored_rows(self):
+        with mock.patch('applications.views.queue_missing_scores') as queue:
+            response = self.client.get('/applications/mine/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+        # The other graduate's unscored application is not on this page
+        queue.assert_called_once_with([self.unscored.pk])
+
+    def test_rows_already_queued_are_not_queued_again(self):
+        with mock.patch('applications.tasks.score_applications.enqueue') as enqueue:
+            for _ in range(2):
+                self.client.get('/applications/mine/')
+        enqueue.assert_called_once_with([self.unscored.pk])
+
+    def test_serializer_is_read_only_and_uses_stored_components(self):
+        rows = {row['id']: row for row in self.client.get('/applications/mine/').data}
+        self.assertEqual((rows[self.unscored.pk]['match_score'], rows[self.unscored.pk]['score_pending']), (None, True))
+        scored = rows[self.scored.pk]
+        self.assertEqual((scored['match_score'], scored['score_pending']), (80.0, False))
+        self.assertEqual(scored['match_details']['skills_matched'], ['Python'])
+        self.assertEqual(scored['match_details']['skills_missing'], ['SQL'])
+        self.assertEqual(scored['status_timeline']['history'], [])
+
+        serializer = ApplicationSerializer(self.scored, data={'status': 'HIRED', 'match_score': 1}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data, {})
+
+    def test_compact_list(self):
+        response = self.client.get('/applications/mine/', {'compact': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data[0]), set(ApplicationCompactSerializer.Meta.fields))
+        self.assertNotIn('ai_analysis', response.data[0])
+        pending = {row['id']: row['score_pending'] for row in response.data}
+        self.assertEqual(pending, {self.unscored.pk: True, self.scored.pk: False})
+
+
+class MatchComponentTests(TestCase):
+    """Match components are stored with a version; outdated rows are rescored and backfilled"""
+
+    ANALYSIS = {'skills_assessment': {
+        'matched_skills': ['Python', 'SQL'], 'missing_skills': ['Go'], 'match_percentage': 66.7,
+    }}
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='components_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Components Co', location='Durban', created_by=recruiter)
+        cls.job = Job.objects.create(
+            title='Components Job',
+            description='Match component test job',
+            company=company,
+            location='Durban',
+            employment_type=Job.EMPLOYMENT_TYPES[0][0],
+            work_type=Job.WORK_TYPES[0][0],
+            experience_level=Job.EXPERIENCE_LEVELS[0][0],
+            created_by=recruiter,
+        )
+        cls.graduate = User.objects.create(username='components_graduate', role='GRADUATE')
+
+    def create_application(self, **fields):
+        # bulk_create skips save(), so no scoring is queued while seeding
+        Application.objects.bulk_create([Application(job=self.job, applicant=self.graduate, **fields)])
+        return Application.objects.get(job=self.job, applicant=self.graduate)
+
+    def test_build_match_fields(self):
+        fields = Application.build_match_fields(72.5, self.ANALYSIS, 'Strong SQL')
+        self.assertEqual(fields, {
+            'match_score': 72.5,
+            'ai_analysis': self.ANALYSIS,
+            'ai_feedback': 'Strong SQL',
+            'skills_matched': ['Python', 'SQL'],
+            'skills_missing': ['Go'],
+            'skills_match_percentage': 66,
+            'match_components_version': MATCH_COMPONENTS_VERSION,
+        })
+
+    def test_build_match_fields_tolerates_partial_analysis(self):
+        for analysis, percentage in (
+            (None, None),
+            ({}, None),
+            ({'skills_assessment': {'match_percentage': 'high'}}, None),
+            ({'skills_assessment': {'match_percentage': 140}}, 100),
+            ({'skills_assessment': {'match_percentage': -5}}, 0),
+        ):
+            with self.subTest(analysis=analysis):
+                fields = Application.build_match_fields(10.0, analysis, '')
+                self.assertEqual(fields['skills_match_percentage'], percentage)
+                self.assertEqual((fields['skills_matched'], fields['skills_missing']), ([], []))
+
+    def test_match_details_read_stored_components(self):
+        application = Application(job=self.job, applicant=self.graduate)
+        application.apply_match_result(72.5, self.ANALYSIS, 'Strong SQL')
+        with mock.patch.object(Application, 'calculate_ai_match_score', side_effect=AssertionError('scored')):
+            self.assertEqual(application.match_details, {
+                'skills_matched': ['Python', 'SQL'],
+                'skills_missing': ['Go'],
+                'skills_match_percentage': 66,
+                'feedback': ['Strong SQL'],
+            })
+        self.assertTrue(application.match_components_current)
+
+    def test_version_bump_requeues_and_rescores(self):
+        application = self.create_application(
+            match_score=50.0, match_components_version=MATCH_COMPONENTS_VERSION
+        )
+        self.assertFalse(Application.objects.filter(needs_scoring_q()).exists())
+
+        with mock.patch('applications.models.MATCH_COMPONENTS_VERSION', MATCH_COMPONENTS_VERSION + 1):
+            self.assertEqual(list(Application.objects.filter(needs_scoring_q())), [application])
+            with mock.patch.object(
+                Application, 'calculate_ai_match_score', return_value=(72.5, self.ANALYSIS, 'Strong SQL')
+            ):
+                score_applications([application.pk])
+            application.refresh_from_db()
+            self.assertTrue(application.match_components_current)
+            self.assertFalse(Application.objects.filter(needs_scoring_q()).exists())
+
+        self.assertEqual(application.match_components_version, MATCH_COMPONENTS_VERSION + 1)
+        self.assertEqual((application.match_score, application.skills_missing), (72.5, ['Go']))
+
+    def test_backfill_derives_components_from_stored_analysis(self):
+        application = self.create_application(match_score=72.5, ai_analysis=self.ANALYSIS)
+        self.assertEqual(application.match_components_version, 0)
+
+        migration = importlib.import_module('applications.migrations.0005_application_match_components')
+        migration.backfill_match_components(django_apps, None)
+
+        application.refresh_from_db()
+        self.assertEqual(application.match_components_version, 1)
+        self.assertEqual(application.skills_matched, ['Python', 'SQL'])
+        self.assertEqual(application.skills_match_percentage, 66)
+        # The score itself is left alone
+        self.assertEqual(application.match_score, 72.5)
+
+    def test_backfill_skips_unscored_rows(self):
+        application = self.create_application(match_score=None, ai_analysis=self.ANALYSIS)
+        migration = importlib.import_module('applications.migrations.0005_application_match_components')
+        migration.backfill_match_components(django_apps, None)
+        application.refresh_from_db()
+        self.assertEqual((application.match_components_version, application.skills_matched), (0, []))
@@ -5,6 +5,7 @@ from .views import (
     MyApplicationsView, 
     JobApplicationsView,
     ApplicationStatusUpdateView,
+    bulk_update_applications,
     application_details,
     graduate_stats,
     recruiter_stats,
@@ -17,6 +18,7 @@ urlpatterns = [
     path("mine/", MyApplicationsView.as_view(), name="my-applications"),
     path("job/<int:job_id>/", JobApplicationsView.as_view(), name="job-applications"),
     path("<int:pk>/status/", ApplicationStatusUpdateView.as_view(), name="update-application-status"),
+    path("bulk/", bulk_update_applications, name="bulk-update-applications"),
     path("<int:application_id>/withdraw/", withdraw_application, name="withdraw-application"),
       # Single detail endpoint for both graduate and recruiter
     path("<int:application_id>/", application_details, name="application-details"),
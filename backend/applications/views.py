@@ -1,20 +1,64 @@
 # backend/applications/views.py
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from django.db.models import Count, Q, Avg
+from django.db.models import Count, Q, Avg, Sum
 from django.shortcuts import get_object_or_404
 
 from rest_framework import serializers 
-from .models import Application
+from .models import Application, ApplicationStatusEvent
 from jobs.models import Job
 from .serializers import (
     ApplicationSerializer, 
+    ApplicationCompactSerializer,
     ApplicationCreateSerializer,
-    ApplicationStatusUpdateSerializer
+    ApplicationStatusUpdateSerializer,
+    ApplicationBulkUpdateSerializer
 )
+from .tasks import queue_missing_scores
+from .pagination import (
+    InvalidCursor, iterate_candidates, paginate_candidates, parse_page_size
+)
+from .signals import stats_namespace, applications_updated
+from hirepath.caching import cached_swr, conditional_response
+from hirepath.renderers import NDJSONRenderer
+from notifications.queue import notify_status_changes
+
+class ApplicationListMixin:
+    """
+    Shared behaviour for application list views: ?compact=true switches to the
+    lightweight serializer, and rows still missing a match score are queued
+    for background scoring instead of being scored during serialization.
+    """
+    serializer_class = ApplicationSerializer
+
+    def get_serializer_class(self):
+        if self.request.query_params.get('compact', '').lower() in ('1', 'true', 'yes'):
+            return ApplicationCompactSerializer
+        return ApplicationSerializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_serializer_class() is ApplicationSerializer:
+            # status_timeline lists each application's status history
+            queryset = queryset.prefetch_related('status_events')
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        # Only the rows on this page, as serialized: no extra query over the whole list
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        unscored_ids = [row['id'] for row in rows if row['score_pending']]
+        if unscored_ids:
+            queue_missing_scores(unscored_ids)
+        return response
 
 # Graduate applies to job
 class ApplicationCreateView(generics.CreateAPIView):
@@ -35,18 +79,16 @@ class ApplicationCreateView(generics.CreateAPIView):
         serializer.save(applicant=self.request.user)
 
 # Graduate views their applications
-class MyApplicationsView(generics.ListAPIView):
-    serializer_class = ApplicationSerializer
+class MyApplicationsView(ApplicationListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Application.objects.filter(applicant=self.request.user).select_related(
-            'job', 'job__company'
+            'applicant', 'job', 'job__company'
         )
 
 # Recruiter views applications for their jobs
-class JobApplicationsView(generics.ListAPIView):
-    serializer_class = ApplicationSerializer
+class JobApplicationsView(ApplicationListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -63,6 +105,72 @@ class ApplicationStatusUpdateView(generics.UpdateAPIView):
     def get_queryset(self):
         return Application.objects.filter(job__created_by=self.request.user)
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_update_applications(request):
+    """
+    Apply one status/notes/interview_date change to many of the recruiter's
+    applications. All-or-nothing: if any id isn't one of the recruiter's
+    applications nothing is updated. Scores are not recomputed; applicants
+    whose status changed are queued for notification in one batch.
+    """
+    serializer = ApplicationBulkUpdateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    application_ids = data['application_ids']
+    update_fields = [field for field in serializer.UPDATE_FIELDS if field in data]
+    
+    with transaction.atomic():
+        # Ownership check and row locks in one query
+        applications = list(
+            Application.objects.select_for_update(of=('self',))
+            .filter(pk__in=application_ids, job__created_by=request.user)
+            .select_related('job')
+        )
+        found_ids = {application.id for application in applications}
+        if len(found_ids) != len(application_ids):
+            return Response(
+                {
+                    'error': 'Some applications were not found',
+                    'missing_ids': [pk for pk in application_ids if pk not in found_ids]
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        now = timezone.now()
+        status_changed_ids = []
+        status_events = []
+        for application in applications:
+            previous_status = application.status
+            for field in update_fields:
+                setattr(application, field, data[field])
+            if application.status != previous_status:
+                status_changed_ids.append(application.id)
+                status_events.append(ApplicationStatusEvent.for_transition(application, previous_status, now))
+                application.status_changed_at = now
+            # bulk_update() doesn't apply auto_now
+            application.updated_at = now
+        
+        # bulk_update() bypasses save(), so no scoring check runs
+        written_fields = update_fields + ['updated_at']
+        if 'status' in update_fields:
+            written_fields.append('status_changed_at')
+        Application.objects.bulk_update(applications, written_fields, batch_size=500)
+        ApplicationStatusEvent.objects.bulk_create(status_events, batch_size=500)
+        
+        # After commit, so cached stats and rollups can't be rebuilt from pre-update rows
+        transaction.on_commit(
+            lambda: applications_updated.send(sender=Application, applications=applications)
+        )
+        # bulk_create() sends no signals: queue the notifications as one batch here
+        notify_status_changes(status_events)
+    
+    return Response({
+        'updated': len(applications),
+        'application_ids': application_ids,
+        'status_changed_ids': status_changed_ids,
+    })
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def withdraw_application(request, application_id):
@@ -90,44 +198,97 @@ def withdraw_application(request, application_id):
 
 # --- ENHANCED STATS ENDPOINTS ---
 
+# Per-user stats are cached briefly; application and job writes invalidate them
+STATS_CACHE_TTL = 60
+STATS_CACHE_STALE_TTL = 10
+
+def status_count_aggregates(lookup_prefix=''):
+    """One conditional COUNT per application status, keyed ``status_<VALUE>``"""
+    counted = lookup_prefix.rstrip('_') or 'id'
+    return {
+        f'status_{value}': Count(counted, filter=Q(**{f'{lookup_prefix}status': value}))
+        for value in Application.Status.values
+    }
+
+def compute_graduate_stats(user):
+    """Graduate dashboard numbers: one aggregate query plus the top matches"""
+    applications = Application.objects.filter(applicant=user)
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+    
+    totals = applications.aggregate(
+        total=Count('id'),
+        avg_score=Avg('match_score'),
+        recent=Count('id', filter=Q(applied_at__gte=thirty_days_ago)),
+        **status_count_aggregates()
+    )
+    
+    return {
+        'totalApplications': totals['total'],
+        'applicationsByStatus': {
+            value: totals[f'status_{value}']
+            for value in Application.Status.values
+            if totals[f'status_{value}']
+        },
+        'averageMatchScore': totals['avg_score'] or 0,
+        'recentApplications': totals['recent'],
+        'topMatchedJobs': list(
+            applications.filter(match_score__gte=80)
+            .values('job__title', 'match_score')
+            .order_by('-match_score')[:5]
+        )
+    }
+
+def compute_recruiter_stats(user):
+    """Recruiter dashboard numbers from one per-job grouped aggregate"""
+    jobs = list(
+        Job.objects.filter(created_by=user).annotate(
+            application_count=Count('applications'),
+            avg_match_score=Avg('applications__match_score'),
+            scored_count=Count('applications__match_score'),
+            score_total=Sum('applications__match_score'),
+            **status_count_aggregates('applications__')
+        ).order_by('-created_at')
+    )
+    
+    applications_by_status = {}
+    for value in Application.Status.values:
+        count = sum(getattr(job, f'status_{value}') for job in jobs)
+        if count:
+            applications_by_status[value] = count
+    
+    scored_count = sum(job.scored_count for job in jobs)
+    score_total = sum(job.score_total or 0 for job in jobs)
+    
+    return {
+        'totalJobs': len(jobs),
+        'totalApplications': sum(job.application_count for job in jobs),
+        'applicationsByStatus': applications_by_status,
+        'averageMatchScore': score_total / scored_count if scored_count else 0,
+        'applicationsByJob': [
+            {
+                'id': job.id,
+                'title': job.title,
+                'application_count': job.application_count,
+                'avg_match_score': job.avg_match_score,
+            }
+            for job in jobs
+        ]
+    }
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def graduate_stats(request):
     """Get comprehensive statistics for graduate dashboard"""
     try:
         user = request.user
-        
-        applications = Application.objects.filter(applicant=user)
-        
-        # Fix: Proper status count aggregation
-        status_counts = applications.values('status').annotate(
-            count=Count('id')
+        entry = cached_swr(
+            f"applications:graduate_stats:{user.id}",
+            lambda: compute_graduate_stats(user),
+            namespace=stats_namespace(user.id),
+            ttl=STATS_CACHE_TTL,
+            stale_ttl=STATS_CACHE_STALE_TTL,
         )
-        applications_by_status = {
-            item['status']: item['count'] 
-            for item in status_counts
-        }
-        
-        # Fix: Calculate recent applications properly
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        stats = {
-            'totalApplications': applications.count(),
-            'applicationsByStatus': applications_by_status,
-            'averageMatchScore': applications.aggregate(
-                avg_score=Avg('match_score')
-            )['avg_score'] or 0,
-            'recentApplications': applications.filter(
-                applied_at__gte=thirty_days_ago
-            ).count(),
-            'topMatchedJobs': list(
-                applications.filter(match_score__gte=80)
-                .values('job__title', 'match_score')
-                .order_by('-match_score')[:5]
-            )
-        }
-        
-        return Response(stats)
+        return conditional_response(request, entry, max_age=0, stale_while_revalidate=0, private=True)
     
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -138,114 +299,114 @@ def recruiter_stats(request):
     """Get comprehensive statistics for recruiter dashboard"""
     try:
         user = request.user
-        
-        recruiter_jobs = Job.objects.filter(created_by=user)
-        applications = Application.objects.filter(job__in=recruiter_jobs)
-        
-        # Fix: Proper status count aggregation
-        status_counts = applications.values('status').annotate(
-            count=Count('id')
-        )
-        applications_by_status = {
-            item['status']: item['count'] 
-            for item in status_counts
-        }
-        
-        # Fix: Applications by job with proper annotation
-        applications_by_job = list(
-            recruiter_jobs.annotate(
-                application_count=Count('applications'),
-                avg_match_score=Avg('applications__match_score')
-            ).values('id', 'title', 'application_count', 'avg_match_score')
+        entry = cached_swr(
+            f"applications:recruiter_stats:{user.id}",
+            lambda: compute_recruiter_stats(user),
+            namespace=stats_namespace(user.id),
+            ttl=STATS_CACHE_TTL,
+            stale_ttl=STATS_CACHE_STALE_TTL,
         )
-        
-        stats = {
-            'totalJobs': recruiter_jobs.count(),
-            'totalApplications': applications.count(),
-            'applicationsByStatus': applications_by_status,
-            'averageMatchScore': applications.aggregate(
-                avg_score=Avg('match_score')
-            )['avg_score'] or 0,
-            'applicationsByJob': applications_by_job
-        }
-        
-        return Response(stats)
+        return conditional_response(request, entry, max_age=0, stale_while_revalidate=0, private=True)
     
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def serialize_candidate(application):
+    """One row of the recruiter candidate list"""
+    return {
+        'application_id': application.id,
+        'applicant_id': application.applicant.id,
+        'first_name': application.applicant.first_name or 'N/A',
+        'last_name': application.applicant.last_name or 'N/A',
+        'email': application.applicant.email,
+        'location': application.applicant.location or 'Not specified',
+        'current_job_title': application.applicant.job_title or 'Not specified',
+        'applied_date': application.applied_at.strftime('%Y-%m-%d'),
+        'match_score': application.match_score or 0,
+        'match_details': application.match_details,
+        'job_title': application.job.title,
+        'company_name': application.job.company.name,
+        'application_status': application.status,
+        'cover_letter': application.cover_letter or '',
+        'notes': application.notes or '',
+        'interview_date': application.interview_date,
+    }
+
+def candidate_queryset(user, params):
+    """
+    The recruiter candidate list before ordering and pagination, plus the
+    filters it applied. ``params`` is the request's query dict.
+    """
+    status_filter = params.get('status', '')
+    min_match_score = params.get('min_score', 0)
+    job_filter = params.get('job', '')
+    
+    applications = Application.objects.filter(
+        job__created_by=user
+    ).select_related(
+        'applicant', 'job', 'job__company'
+    )
+    
+    # Apply filters
+    if job_filter.isdigit():
+        applications = applications.filter(job_id=int(job_filter))
+    
+    if status_filter:
+        applications = applications.filter(status=status_filter)
+    
+    if min_match_score:
+        try:
+            applications = applications.filter(
+                match_score__gte=float(min_match_score)
+            )
+        except ValueError:
+            pass  # Ignore invalid min_score values
+    
+    filters_applied = {
+        'job': job_filter,
+        'status': status_filter,
+        'min_match_score': min_match_score
+    }
+    return applications, filters_applied
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
 def recruiter_candidates(request):
-    """Get enhanced candidates list with filtering"""
+    """
+    Get enhanced candidates list with filtering.
+
+    Paginated by keyset: pass the returned ``next_cursor`` as ``?cursor=`` to
+    get the next page (``?page_size=``, default 50, max 200). Bulk consumers
+    can request ``?format=ndjson`` (or ``Accept: application/x-ndjson``) to
+    stream every matching candidate, one JSON object per line.
+    """
     try:
-        user = request.user
-        
-        status_filter = request.GET.get('status', '')
-        min_match_score = request.GET.get('min_score', 0)
-        
-        applications = Application.objects.filter(
-            job__created_by=user
-        ).select_related(
-            'applicant', 'job', 'job__company'
-        )
+        applications, filters_applied = candidate_queryset(request.user, request.GET)
         
-        # Apply filters
-        if status_filter:
-            applications = applications.filter(status=status_filter)
-        
-        if min_match_score:
-            try:
-                applications = applications.filter(
-                    match_score__gte=float(min_match_score)
-                )
-            except ValueError:
-                pass  # Ignore invalid min_score values
-        
-        applications = applications.order_by('-match_score', '-applied_at')
+        if request.accepted_renderer.format == 'ndjson':
+            rows = iterate_candidates(applications)
+            response = StreamingHttpResponse(
+                (json.dumps(serialize_candidate(row), cls=DjangoJSONEncoder) + "\n" for row in rows),
+                content_type='application/x-ndjson'
+            )
+            response['X-Accel-Buffering'] = 'no'
+            return response
         
-        candidates_data = []
-        for application in applications:
-            # Fix: Handle potential None match_score
-            current_match_score = application.match_score or 0
-            
-            # Fix: Calculate match details safely
-            try:
-                match_details = application.calculate_match_details()
-            except Exception:
-                match_details = {
-                    "skills_matched": [],
-                    "skills_missing": [],
-                    "feedback": ["Error calculating match details"]
-                }
-            
-            candidate_data = {
-                'application_id': application.id,
-                'applicant_id': application.applicant.id,
-                'first_name': application.applicant.first_name or 'N/A',
-                'last_name': application.applicant.last_name or 'N/A',
-                'email': application.applicant.email,
-                'location': application.applicant.location or 'Not specified',
-                'current_job_title': application.applicant.job_title or 'Not specified',
-                'applied_date': application.applied_at.strftime('%Y-%m-%d'),
-                'match_score': current_match_score,
-                'match_details': match_details,
-                'job_title': application.job.title,
-                'company_name': application.job.company.name,
-                'application_status': application.status,
-                'cover_letter': application.cover_letter or '',
-                'notes': application.notes or '',
-                'interview_date': application.interview_date,
-            }
-            candidates_data.append(candidate_data)
+        try:
+            page, next_cursor = paginate_candidates(
+                applications,
+                cursor=request.GET.get('cursor'),
+                page_size=parse_page_size(request.GET.get('page_size')),
+            )
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
-            'results': candidates_data,
-            'total_count': len(candidates_data),
-            'filters_applied': {
-                'status': status_filter,
-                'min_match_score': min_match_score
-            }
+            'results': [serialize_candidate(application) for application in page],
+            'total_count': applications.count(),
+            'next_cursor': next_cursor,
+            'filters_applied': filters_applied
         })
     
     except Exception as e:
@@ -306,6 +467,9 @@ def application_details(request, application_id):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        if application.match_score is None or not application.match_components_current:
+            queue_missing_scores([application.id])
+        
         # Use the same serializer as list views
         serializer = ApplicationSerializer(application, context={'request': request})
         return Response(serializer.data)
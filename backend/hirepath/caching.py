@@ -0,0 +1,167 @@
+# backend/hirepath/caching.py
+"""
+Shared response-caching helpers.
+
+Cached values belong to a *namespace* (e.g. ``jobs``) whose version is the
+timestamp of its last invalidation. Bumping the namespace version makes every
+entry in it outdated at once, and doubles as the Last-Modified time. Versions
+live in the ``shared`` cache so an invalidation in one worker process reaches
+all of them; the entries themselves stay in each process's default cache.
+Version reads and bumps fail soft: if the shared cache is unavailable the
+error is logged, writes go ahead and responses are computed uncached.
+
+``cached_swr`` adds a short stale-while-revalidate window: once an entry is
+outdated only one caller (holding a cache lock) recomputes it while everyone
+else keeps getting the previous value, so a traffic burst never runs the same
+aggregate concurrently.
+"""
+import hashlib
+import json
+import time
+import logging
+
+from django.core.cache import cache, caches
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.05
+
+# Cache alias shared by every worker process (see CACHES in settings)
+SHARED_CACHE_ALIAS = 'shared'
+
+
+def shared_cache():
+    """The cache for cross-process state such as namespace versions"""
+    return caches[SHARED_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f"cache_version:{namespace}"
+
+
+def get_namespace_version(namespace):
+    """Timestamp of the namespace's last invalidation; None if the shared cache is unavailable"""
+    key = _version_key(namespace)
+    try:
+        versions = shared_cache()
+        version = versions.get(key)
+        if version is None:
+            versions.add(key, time.time(), timeout=None)
+            version = versions.get(key)
+        return version
+    except Exception:
+        logger.exception(f"Could not read cache version of {namespace}")
+        return None
+
+
+def bump_namespace_version(namespace):
+    """Invalidate every entry cached under ``namespace``; never raises, so a cache outage can't break writes"""
+    try:
+        shared_cache().set(_version_key(namespace), time.time(), timeout=None)
+    except Exception:
+        logger.exception(f"Could not invalidate cache namespace {namespace}")
+
+
+def make_etag(data):
+    payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.md5(payload).hexdigest()
+
+
+def _store(key, compute, version, ttl, stale_ttl):
+    data = compute()
+    now = time.time()
+    entry = {
+        'data': data,
+        'version': version,
+        'etag': make_etag(data),
+        'last_modified': version,
+        'fresh_until': now + ttl,
+    }
+    cache.set(key, entry, timeout=ttl + stale_ttl)
+    return entry
+
+
+def _is_fresh(entry, version, now):
+    return entry['version'] == version and now < entry['fresh_until']
+
+
+def _is_servable_stale(entry, version, now, stale_ttl):
+    if entry['version'] != version:
+        # Outdated by a write: only serve it for stale_ttl seconds after that write
+        return now < version + stale_ttl
+    return now < entry['fresh_until'] + stale_ttl
+
+
+def cached_swr(key, compute, namespace, ttl=300, stale_ttl=30, lock_timeout=30):
+    """
+    Return a cache entry dict (``data``, ``etag``, ``last_modified``) for ``key``.
+
+    ``compute`` is only called by the single caller that wins the refresh lock.
+    """
+    version = get_namespace_version(namespace)
+    if version is None:
+        # Without a version nothing cached can be trusted to be current
+        data = compute()
+        return {'data': data, 'version': None, 'etag': make_etag(data), 'last_modified': None}
+    lock_key = f"{key}:lock"
+    now = time.time()
+
+    entry = cache.get(key)
+    if entry and _is_fresh(entry, version, now):
+        return entry
+
+    if entry and _is_servable_stale(entry, version, now, stale_ttl):
+        if cache.add(lock_key, 1, timeout=lock_timeout):
+            try:
+                return _store(key, compute, version, ttl, stale_ttl)
+            finally:
+                cache.delete(lock_key)
+        return entry
+
+    # Nothing usable cached: one caller computes, the rest wait briefly for it
+    if cache.add(lock_key, 1, timeout=lock_timeout):
+        try:
+            return _store(key, compute, version, ttl, stale_ttl)
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.time() + LOCK_WAIT_SECONDS
+    while time.time() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        entry = cache.get(key)
+        if entry and entry['version'] == version:
+            return entry
+
+    logger.warning(f"Timed out waiting for cache refresh of {key}; computing directly")
+    data = compute()
+    return {'data': data, 'version': version, 'etag': make_etag(data), 'last_modified': version}
+
+
+def conditional_response(request, entry, max_age=60, stale_while_revalidate=30, private=False):
+    """
+    Build a Response for a cache entry, answering conditional GETs with 304.
+
+    Pass ``private=True`` for per-user data so shared caches don't store it.
+    An entry whose ``last_modified`` is None is validated by ETag alone.
+    """
+    etag = quote_etag(entry['etag'])
+    last_modified = int(entry['last_modified']) if entry['last_modified'] is not None else None
+
+    response = Response(entry['data'])
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    visibility = {'private': True} if private else {'public': True}
+    patch_cache_control(
+        response,
+        **visibility,
+        max_age=max_age,
+        stale_while_revalidate=stale_while_revalidate,
+    )
+    return get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=response
+    )
@@ -0,0 +1,17 @@
+# backend/hirepath/celery.py
+"""
+Celery application used when ``BACKGROUND_TASK_BACKEND = 'celery'``.
+
+Configuration comes from the ``CELERY_*`` Django settings. Start a worker with::
+
+    celery -A hirepath worker -l info
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hirepath.settings')
+
+app = Celery('hirepath')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
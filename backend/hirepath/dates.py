@@ -0,0 +1,30 @@
+# backend/hirepath/dates.py
+"""
+Index-friendly date filters.
+
+``applied_at__date__range`` compiles to ``DATE(CONVERT_TZ(applied_at, ...))``,
+which no index on ``applied_at`` can serve. ``date_range_filter`` expresses
+the same local-calendar-day range as a half-open datetime range on the raw
+column instead.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def start_of_day(day):
+    """Aware datetime for local midnight at the start of ``day``"""
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def date_range_filter(field, start_date, end_date=None):
+    """
+    Filter kwargs matching ``field`` on local dates ``start_date``..``end_date``
+    inclusive (a single day when ``end_date`` is omitted), e.g.
+    ``queryset.filter(**date_range_filter('applied_at', start, end))``.
+    """
+    end_date = end_date or start_date
+    return {
+        f'{field}__gte': start_of_day(start_date),
+        f'{field}__lt': start_of_day(end_date + timedelta(days=1)),
+    }
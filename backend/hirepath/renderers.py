@@ -0,0 +1,32 @@
+# backend/hirepath/renderers.py
+"""
+Renderers for streaming endpoints.
+
+Streaming views write their own body with ``StreamingHttpResponse``; these
+renderers exist so content negotiation accepts the streaming media types
+(``Accept`` header or ``?format=``) and so error responses still render as
+one line in the requested format.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON; streaming views write their own body, errors render as one line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder) + "\n"
+
+
+class EventStreamRenderer(NDJSONRenderer):
+    """Server-sent events (text/event-stream)"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f"event: error\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     "job_roles",
     "work_experience",
     "analytics",
+    "notifications",
    
    
 ]
@@ -110,7 +111,7 @@ ROOT_URLCONF = "hirepath.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {"context_processors": [
             "django.template.context_processors.debug",
@@ -179,15 +180,33 @@ LOGGING = {
     },
 }
 
+# "shared" holds state every worker process must agree on: cache namespace
+# versions and the job search index version (see hirepath.caching). It defaults
+# to the database (its table is created by the jobs migrations);
+# point it at Redis in production with
+# SHARED_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# SHARED_CACHE_LOCATION=redis://localhost:6379/1
+SHARED_CACHE_BACKEND = config('SHARED_CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache')
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "unique-snowflake",
-    }
+    },
+    "shared": {
+        "BACKEND": SHARED_CACHE_BACKEND,
+        "LOCATION": config('SHARED_CACHE_LOCATION', default='hirepath_shared_cache'),
+        "TIMEOUT": None,
+    },
 }
+if SHARED_CACHE_BACKEND.endswith('.DatabaseCache'):
+    # One version key per user namespace; culling one would invalidate that user's cache
+    CACHES["shared"]["OPTIONS"] = {"MAX_ENTRIES": 100000}
 
 # backend/settings.py
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Local/tests: EMAIL_BACKEND=django.core.mail.backends.console.EmailBackend or
+# django.core.mail.backends.filebased.EmailBackend (writes to EMAIL_FILE_PATH)
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = config('EMAIL_FILE_PATH', default=str(BASE_DIR / 'sent_emails'))
 EMAIL_HOST = 'mail.hirepath.co.za'  # or your SMTP server
 EMAIL_PORT = 465
 EMAIL_USE_TLS = True
@@ -201,10 +220,31 @@ SITE_NAME = 'Hire-path'
 SUPPORT_EMAIL = 'noreply@hirepath.co.za'
 REPLY_TO_EMAIL = 'noreply@hirepath.co.za'
 
+# Notifications: wait this many seconds after an event before delivering, so bursts share one batch.
+# Delayed runs on the thread backend don't survive a restart: run `manage.py send_notifications`
+# from cron every few minutes to deliver anything left pending
+NOTIFICATION_BATCH_DELAY = 60
+
 # Celery Configuration
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = 'UTC'
\ No newline at end of file
+CELERY_TIMEZONE = 'UTC'
+
+# Background tasks: 'celery' publishes to the broker above, 'thread' runs them in-process
+BACKGROUND_TASK_BACKEND = config('BACKGROUND_TASK_BACKEND', default='thread')
+
+# Analytics exports
+EXPORT_MAX_CONCURRENT_PER_RECRUITER = 2
+EXPORT_MAX_ATTEMPTS = 3
+# Seconds an export may sit pending or processing without progress before it is treated as abandoned
+EXPORT_STALE_AFTER = 30 * 60
+# Export and report files older than this are removed by `manage.py expire_exports`
+EXPORT_FILE_TTL_DAYS = 7
+# Set to an nginx internal location aliased to MEDIA_ROOT to let nginx serve downloads
+EXPORT_X_ACCEL_REDIRECT_PREFIX = config('EXPORT_X_ACCEL_REDIRECT_PREFIX', default='')
+
+# Dashboard widgets missing from the cache are computed on up to this many threads; 1 computes them inline
+DASHBOARD_WIDGET_WORKERS = 4
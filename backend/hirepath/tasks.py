@@ -0,0 +1,89 @@
+# backend/hirepath/tasks.py
+"""
+Background task runner.
+
+Decorate a module-level function with ``@background_task`` and call
+``func.enqueue(*args, countdown=0)`` to run it off the request thread. Jobs
+are submitted once the surrounding transaction commits so workers always
+see the rows that triggered them.
+
+With ``BACKGROUND_TASK_BACKEND = 'celery'`` jobs are published to the Celery
+broker (``CELERY_*`` settings) and run by ``celery -A hirepath worker``; task
+arguments must then be JSON-serializable. Otherwise, or if the broker can't
+be reached, they run on a shared in-process thread pool
+(``BACKGROUND_TASK_WORKERS``); a delayed job waits on a timer thread and
+only takes a pool worker once it is due. Set ``BACKGROUND_TASKS_EAGER = True`` to run
+them inline (tests, scripts).
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 4),
+                thread_name_prefix='hirepath-task',
+            )
+        return _executor
+
+
+def use_celery():
+    return getattr(settings, 'BACKGROUND_TASK_BACKEND', 'thread') == 'celery'
+
+
+def background_task(func):
+    """Give ``func`` an ``enqueue`` method that runs it in the background"""
+    from .celery import app as celery_app
+
+    @wraps(func)
+    def run(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            logger.exception(f"Background task {func.__module__}.{func.__name__} failed")
+        finally:
+            # Worker threads open their own DB connections; don't leak them
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+
+    def enqueue(*args, countdown=0, **kwargs):
+        if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+            transaction.on_commit(lambda: func(*args, **kwargs))
+            return
+
+        def submit():
+            if use_celery():
+                try:
+                    celery_task.apply_async(args, kwargs, countdown=countdown or None, retry=False)
+                    return
+                except Exception:
+                    logger.warning(
+                        f"Could not publish {celery_task.name} to the broker; running it in-process",
+                        exc_info=True,
+                    )
+            if countdown:
+                # Wait on a timer thread, not in a pool worker, so delays don't tie up the pool
+                timer = threading.Timer(countdown, lambda: get_executor().submit(run, *args, **kwargs))
+                timer.daemon = True
+                timer.start()
+            else:
+                get_executor().submit(run, *args, **kwargs)
+
+        transaction.on_commit(submit)
+
+    celery_task = celery_app.task(name=f'{func.__module__}.{func.__name__}')(run)
+    func.enqueue = enqueue
+    return func
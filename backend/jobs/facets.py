@@ -0,0 +1,67 @@
+# backend/jobs/facets.py
+"""
+Facet counts for the job filter sidebar.
+
+Each facet is one grouped aggregate over the jobs matching every active
+filter except the facet's own, so picking "Remote" still shows how many
+hybrid/on-site jobs the other choices would return.
+"""
+from django.db.models import Count
+
+from .filters import apply_job_filters
+from .models import Job
+
+FACET_LIMIT = 20
+
+
+def _choice_facet(queryset, field, choices):
+    counts = dict(
+        queryset.order_by().values_list(field).annotate(count=Count('id'))
+    )
+    return [
+        {'value': value, 'display_name': display_name, 'count': counts.get(value, 0)}
+        for value, display_name in choices
+    ]
+
+
+def _skills_facet(queryset, limit):
+    through = Job.skills_required.through
+    rows = (
+        through.objects.filter(job_id__in=queryset.order_by().values('pk'))
+        .values('skill_id', 'skill__name')
+        .annotate(count=Count('job_id'))
+        .order_by('-count', 'skill__name')[:limit]
+    )
+    return [
+        {'value': row['skill_id'], 'display_name': row['skill__name'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def _location_facet(queryset, limit):
+    rows = (
+        queryset.order_by().values('location')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'location')[:limit]
+    )
+    return [
+        {'value': row['location'], 'display_name': row['location'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def compute_facets(params, queryset=None, limit=FACET_LIMIT):
+    """Return per-facet counts for the filters in ``params``"""
+    base = Job.objects.all() if queryset is None else queryset
+
+    def narrowed(facet):
+        return apply_job_filters(base, params, exclude=(facet,))
+
+    return {
+        'total': apply_job_filters(base, params).order_by().count(),
+        'employment_type': _choice_facet(narrowed('employment_type'), 'employment_type', Job.EMPLOYMENT_TYPES),
+        'work_type': _choice_facet(narrowed('work_type'), 'work_type', Job.WORK_TYPES),
+        'experience_level': _choice_facet(narrowed('experience_level'), 'experience_level', Job.EXPERIENCE_LEVELS),
+        'skills': _skills_facet(narrowed('skills'), limit),
+        'location': _location_facet(narrowed('location'), limit),
+    }
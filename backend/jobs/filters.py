@@ -0,0 +1,101 @@
+# backend/jobs/filters.py
+from django.db.models import Count
+
+from .models import Job
+from .search import get_search_backend, tokenize
+
+# Query params understood by the public job list, in the order they are applied
+JOB_FILTER_PARAMS = (
+    'employment_type', 'work_type', 'experience_level',
+    'skills', 'skills_match', 'location', 'company', 'search',
+)
+
+SKILLS_MATCH_ANY = 'any'
+SKILLS_MATCH_ALL = 'all'
+
+
+def parse_skill_ids(values):
+    """Accept ?skills=1&skills=2 and ?skills=1,2; silently drop non-numeric ids"""
+    skill_ids = set()
+    for value in values or []:
+        for part in str(value).split(','):
+            part = part.strip()
+            if part.isdigit():
+                skill_ids.add(int(part))
+    return sorted(skill_ids)
+
+
+def filter_by_skills(queryset, skill_ids, match=SKILLS_MATCH_ANY):
+    """
+    Restrict jobs by required skills without joining the M2M table into the
+    outer query, so rows are never multiplied and no DISTINCT is needed.
+
+    ``any``: job id IN (jobs having a required-skill row for one of the ids)
+    ``all``: job id IN (jobs having a required-skill row for every id)
+
+    Both are uncorrelated semi-joins, so the planner can drive the query from
+    the (skill_id, job_id) rows instead of probing once per job.
+    """
+    # A repeated id must not raise the number of skills ``all`` requires
+    skill_ids = set(skill_ids or ())
+    if not skill_ids:
+        return queryset
+    job_skills = Job.skills_required.through.objects.filter(skill_id__in=skill_ids)
+
+    if match == SKILLS_MATCH_ALL:
+        jobs_with_all = (
+            job_skills.order_by().values('job_id')
+            .annotate(matched=Count('skill_id'))
+            .filter(matched=len(skill_ids))
+            .values('job_id')
+        )
+        return queryset.filter(pk__in=jobs_with_all)
+
+    return queryset.filter(pk__in=job_skills.values('job_id'))
+
+
+def apply_job_filters(queryset, params, exclude=()):
+    """
+    Apply the public job list filters found in ``params`` (request query params).
+
+    ``exclude`` names filters to leave out; faceting uses it so each facet is
+    counted against every *other* active filter. The ``search`` filter only
+    restricts here; ranking is applied separately by ``search_jobs``.
+    """
+    # Filter by employment type
+    employment_type = params.get('employment_type')
+    if employment_type and 'employment_type' not in exclude:
+        queryset = queryset.filter(employment_type=employment_type)
+
+    # Filter by work type
+    work_type = params.get('work_type')
+    if work_type and 'work_type' not in exclude:
+        queryset = queryset.filter(work_type=work_type)
+
+    # Filter by experience level
+    experience_level = params.get('experience_level')
+    if experience_level and 'experience_level' not in exclude:
+        queryset = queryset.filter(experience_level=experience_level)
+
+    # Filter by skills (?skills_match=all requires every listed skill, default is any)
+    skills = params.getlist('skills') if hasattr(params, 'getlist') else params.get('skills')
+    if skills and 'skills' not in exclude:
+        match = SKILLS_MATCH_ALL if params.get('skills_match') == SKILLS_MATCH_ALL else SKILLS_MATCH_ANY
+        queryset = filter_by_skills(queryset, parse_skill_ids(skills), match)
+
+    # Filter by location (case-insensitive partial match)
+    location = params.get('location')
+    if location and 'location' not in exclude:
+        queryset = queryset.filter(location__icontains=location)
+
+    # Filter by company
+    company = params.get('company')
+    if company and 'company' not in exclude:
+        queryset = queryset.filter(company__name__icontains=company)
+
+    # Full-text search (restriction only)
+    search = (params.get('search') or '').strip()
+    if search and tokenize(search) and 'search' not in exclude:
+        queryset = get_search_backend().filter(queryset, search)
+
+    return queryset
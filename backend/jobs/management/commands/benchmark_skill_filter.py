@@ -0,0 +1,111 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import User
+from companies.models import Company
+from jobs.filters import filter_by_skills, SKILLS_MATCH_ANY, SKILLS_MATCH_ALL
+from jobs.models import Job
+from skills.models import Skill
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the job skills filter (legacy JOIN + DISTINCT vs semi-join) on synthetic jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000, help='Number of synthetic jobs')
+        parser.add_argument('--skills', type=int, default=300, help='Size of the synthetic skill pool')
+        parser.add_argument('--skills-per-job', type=int, default=6)
+        parser.add_argument('--filter-skills', type=int, default=3, help='Skills passed to the filter')
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic data instead of rolling back')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                if not options['keep']:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write('Synthetic data rolled back.')
+
+    def run(self, options):
+        rng = random.Random(42)
+        started = time.perf_counter()
+        skill_ids = self.seed(options, rng)
+        self.stdout.write(f"Seeded {options['jobs']} jobs in {time.perf_counter() - started:.1f}s")
+
+        # Pick filter skills from the popular end of the pool so the filters match many jobs
+        filter_ids = rng.sample(skill_ids[:20], options['filter_skills'])
+        base = Job.objects.order_by('-created_at')
+
+        cases = {
+            'legacy any (JOIN + DISTINCT)': lambda: base.filter(skills_required__id__in=filter_ids).distinct(),
+            'semi-join any (IN subquery)': lambda: filter_by_skills(base, filter_ids, SKILLS_MATCH_ANY),
+            'semi-join all (IN + HAVING)': lambda: filter_by_skills(base, filter_ids, SKILLS_MATCH_ALL),
+        }
+
+        self.stdout.write(f"Filtering on skills {filter_ids}, {options['runs']} runs each (median ms)")
+        for label, build in cases.items():
+            count_times, page_times = [], []
+            for _ in range(options['runs']):
+                t0 = time.perf_counter()
+                total = build().count()
+                count_times.append((time.perf_counter() - t0) * 1000)
+
+                t0 = time.perf_counter()
+                list(build()[:20])
+                page_times.append((time.perf_counter() - t0) * 1000)
+
+            self.stdout.write(
+                f"  {label:<32} matches={total:<8} "
+                f"count={statistics.median(count_times):8.1f}  first page={statistics.median(page_times):8.1f}"
+            )
+
+    def seed(self, options, rng):
+        recruiter = User.objects.create(username=f'bench_recruiter_{rng.randint(0, 10**9)}', role='RECRUITER')
+        company = Company.objects.create(name=f'Bench Co {recruiter.pk}', location='Cape Town', created_by=recruiter)
+
+        skills = Skill.objects.bulk_create(
+            [Skill(name=f'bench-skill-{recruiter.pk}-{i}') for i in range(options['skills'])]
+        )
+        skill_ids = [skill.pk for skill in skills]
+        if not all(skill_ids):
+            skill_ids = list(Skill.objects.filter(name__startswith=f'bench-skill-{recruiter.pk}-').values_list('pk', flat=True))
+        # Skewed popularity: low indexes are picked far more often
+        weights = [1.0 / (rank + 1) for rank in range(len(skill_ids))]
+
+        through = Job.skills_required.through
+        batch_size = 5000
+        remaining = options['jobs']
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            jobs = Job.objects.bulk_create([
+                Job(
+                    title=f'Bench job {i}',
+                    description='Synthetic job description ' * 20,
+                    company=company,
+                    location='Cape Town',
+                    employment_type=rng.choice(Job.EMPLOYMENT_TYPES)[0],
+                    work_type=rng.choice(Job.WORK_TYPES)[0],
+                    experience_level=rng.choice(Job.EXPERIENCE_LEVELS)[0],
+                    created_by=recruiter,
+                )
+                for i in range(size)
+            ])
+            if not all(job.pk for job in jobs):
+                jobs = list(Job.objects.filter(company=company).order_by('-pk')[:size])
+            rows = []
+            for job in jobs:
+                picked = set(rng.choices(skill_ids, weights=weights, k=options['skills_per_job']))
+                rows.extend(through(job_id=job.pk, skill_id=skill_id) for skill_id in picked)
+            through.objects.bulk_create(rows, batch_size=batch_size)
+            remaining -= size
+        return skill_ids
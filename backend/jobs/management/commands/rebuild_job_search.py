@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from jobs.models import Job
+from jobs.search import bump_search_index_version
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalised job search documents (e.g. after bulk imports that skip signals)'
+
+    def handle(self, *args, **options):
+        updated = 0
+        jobs = Job.objects.select_related('company').iterator(chunk_size=500)
+        for job in jobs:
+            before = job.search_document
+            if job.refresh_search_document() != before:
+                updated += 1
+        bump_search_index_version()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search documents ({updated} changed)'))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:56
+
+from django.db import migrations, models
+
+
+def backfill_search_documents(apps, schema_editor):
+    from jobs.search import build_search_document
+
+    Job = apps.get_model('jobs', 'Job')
+    for job in Job.objects.select_related('company').prefetch_related('skills_required').iterator(chunk_size=500):
+        document = build_search_document(
+            job.title,
+            job.company.name,
+            job.location,
+            [skill.name for skill in job.skills_required.all()],
+            job.description,
+        )
+        Job.objects.filter(pk=job.pk).update(search_document=document)
+
+
+def create_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        "CREATE FULLTEXT INDEX jobs_job_search_document_ft ON jobs_job (search_document)"
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute("DROP INDEX jobs_job_search_document_ft ON jobs_job")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_alter_job_certificates_preferred_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:20
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_tables(apps, schema_editor):
+    # The "shared" cache (hirepath.caching) defaults to DatabaseCache; job and
+    # application signals write to it on every save, so its table must exist
+    # as soon as the schema does. createcachetable skips non-database caches
+    # and tables that already exist.
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_search_document'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_tables, migrations.RunPython.noop),
+    ]
@@ -57,6 +57,9 @@ class Job(models.Model):
     
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="jobs")
 
+    # Denormalised text used by the job search index (see jobs/search.py)
+    search_document = models.TextField(blank=True, default='', editable=False)
+
     def __str__(self):
         return f"{self.title} @ {self.company.name}"
     
@@ -69,6 +72,21 @@ class Job(models.Model):
             return True
         return self.closing_date >= date.today()
 
+    def refresh_search_document(self):
+        """Rebuild the search column from the job, its company and required skills"""
+        from .search import build_search_document
+        document = build_search_document(
+            self.title,
+            self.company.name if self.company_id else '',
+            self.location,
+            self.skills_required.values_list('name', flat=True),
+            self.description,
+        )
+        if document != self.search_document:
+            self.search_document = document
+            Job.objects.filter(pk=self.pk).update(search_document=document)
+        return document
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -0,0 +1,255 @@
+# backend/jobs/search.py
+"""
+Job search subsystem.
+
+Every job keeps a denormalised ``search_document`` (title, company name,
+location, required skill names and description). On MySQL that column is
+covered by a FULLTEXT index and ranked with ``MATCH ... AGAINST``. Other
+databases (SQLite in tests, local dev) fall back to an in-process inverted
+index scored with BM25. That backend scores every matching job, keeps the
+ones that pass the caller's queryset filters, and sorts them in Python;
+rows are then fetched one slice (page) at a time by ``RankedResults``.
+"""
+import math
+import re
+import threading
+import logging
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from hirepath.caching import shared_cache
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_VERSION_KEY = 'jobs:search:index_version'
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with', 'we', 'you', 'our',
+    'will', 'this', 'that',
+})
+
+
+def tokenize(text):
+    """Lowercase word tokens, keeping tech names like c++, c# and node.js intact"""
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def build_search_document(title, company_name, location, skill_names, description):
+    """Flatten the searchable job fields into one string for the search column"""
+    # Title is counted twice so it outweighs a passing mention in the description
+    parts = [title, title, company_name, location, ' '.join(skill_names), description]
+    return '\n'.join(part for part in parts if part)
+
+
+def bump_search_index_version():
+    """Mark the inverted indexes of every worker process as stale; never raises"""
+    try:
+        versions = shared_cache()
+        try:
+            versions.incr(SEARCH_INDEX_VERSION_KEY)
+        except ValueError:
+            versions.set(SEARCH_INDEX_VERSION_KEY, 1, timeout=None)
+    except Exception:
+        logger.exception("Could not bump the job search index version")
+
+
+def get_search_index_version():
+    """Current index version; None if the shared cache is unavailable"""
+    try:
+        versions = shared_cache()
+        version = versions.get(SEARCH_INDEX_VERSION_KEY)
+        if version is None:
+            versions.add(SEARCH_INDEX_VERSION_KEY, 1, timeout=None)
+            version = versions.get(SEARCH_INDEX_VERSION_KEY)
+        return version
+    except Exception:
+        logger.exception("Could not read the job search index version")
+        return None
+
+
+class BM25Index:
+    """Inverted index over job search documents scored with Okapi BM25"""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)  # term -> {doc_id: term frequency}
+        self.doc_lengths = {}
+        self.avg_doc_length = 0.0
+
+    @classmethod
+    def from_documents(cls, documents, **kwargs):
+        """Build an index from an iterable of (doc_id, text) pairs"""
+        index = cls(**kwargs)
+        for doc_id, text in documents:
+            index.add(doc_id, text)
+        index.finalize()
+        return index
+
+    def add(self, doc_id, text):
+        tokens = tokenize(text)
+        self.doc_lengths[doc_id] = len(tokens)
+        for term, frequency in Counter(tokens).items():
+            self.postings[term][doc_id] = frequency
+
+    def finalize(self):
+        total = sum(self.doc_lengths.values())
+        self.avg_doc_length = (total / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+    def idf(self, term):
+        doc_count = len(self.doc_lengths)
+        doc_frequency = len(self.postings.get(term, ()))
+        return math.log(1 + (doc_count - doc_frequency + 0.5) / (doc_frequency + 0.5))
+
+    def search(self, query, limit=None):
+        """Return [(doc_id, score), ...] ordered by descending BM25 score"""
+        scores = defaultdict(float)
+        avg_length = self.avg_doc_length or 1.0
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, frequency in postings.items():
+                length_norm = 1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return ranked[:limit] if limit else ranked
+
+
+class RankedResults:
+    """
+    Rows of ``queryset`` in the order of ``ids``, each with its ``search_rank``.
+
+    Behaves like a sliceable, countable sequence, so it can be paginated or
+    serialized like a queryset; each slice is fetched with one query.
+    """
+    ordered = True
+    chunk_size = 500
+
+    def __init__(self, queryset, ids, scores):
+        self.queryset = queryset
+        self.ids = ids
+        self.scores = scores
+
+    def count(self):
+        return len(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _fetch(self, ids):
+        rows = {row.pk: row for row in self.queryset.filter(pk__in=ids)}
+        for pk in ids:
+            if pk in rows:
+                rows[pk].search_rank = self.scores[pk]
+                yield rows[pk]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._fetch(self.ids[index]))
+        return list(self._fetch([self.ids[index]]))[0]
+
+    def __iter__(self):
+        for start in range(0, len(self.ids), self.chunk_size):
+            yield from self._fetch(self.ids[start:start + self.chunk_size])
+
+
+class InvertedIndexBackend:
+    """Pure-Python BM25 backend, rebuilt lazily whenever a job changes"""
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_index(self):
+        from .models import Job
+
+        version = get_search_index_version()
+
+        with self._lock:
+            # With the shared cache unavailable (version None) keep serving the index already built
+            if self._index is None or (version is not None and self._version != version):
+                documents = Job.objects.values_list('id', 'search_document').iterator(chunk_size=2000)
+                self._index = BM25Index.from_documents(documents)
+                self._version = version
+                logger.info(f"Rebuilt job search index with {len(self._index.doc_lengths)} documents")
+            return self._index
+
+    def scores(self, query):
+        """BM25 score of every matching job (not truncated: filters are applied afterwards)"""
+        return dict(self.get_index().search(query))
+
+    def filter(self, queryset, query):
+        return queryset.filter(pk__in=sorted(self.scores(query)))
+
+    def rank(self, queryset, query):
+        """Matches that pass ``queryset``'s filters, best first (then newest)"""
+        scores = self.scores(query)
+        if not scores:
+            return queryset.none()
+        candidates = queryset.filter(pk__in=sorted(scores)).order_by().values_list('pk', 'created_at')
+        ranked = sorted(candidates, key=lambda row: (-scores[row[0]], -row[1].timestamp(), -row[0]))
+        return RankedResults(queryset, [pk for pk, _ in ranked], scores)
+
+
+class MySQLFullTextBackend:
+    """Ranks with MATCH ... AGAINST over the FULLTEXT index on search_document"""
+
+    def _match_expression(self, query):
+        from .models import Job
+
+        column = '%s.%s' % (
+            connection.ops.quote_name(Job._meta.db_table),
+            connection.ops.quote_name('search_document'),
+        )
+        return RawSQL(
+            f"MATCH({column}) AGAINST (%s IN NATURAL LANGUAGE MODE)",
+            (query,),
+            output_field=FloatField(),
+        )
+
+    def filter(self, queryset, query):
+        return queryset.alias(search_rank=self._match_expression(query)).filter(search_rank__gt=0)
+
+    def rank(self, queryset, query):
+        return queryset.annotate(
+            search_rank=self._match_expression(query)
+        ).filter(search_rank__gt=0).order_by('-search_rank', '-created_at')
+
+
+_backend = None
+
+
+def get_search_backend():
+    """Pick the full-text backend for the configured database"""
+    global _backend
+    if _backend is None:
+        backend_name = getattr(settings, 'JOB_SEARCH_BACKEND', None) or (
+            'mysql' if connection.vendor == 'mysql' else 'inverted_index'
+        )
+        if backend_name == 'mysql':
+            _backend = MySQLFullTextBackend()
+        else:
+            _backend = InvertedIndexBackend()
+    return _backend
+
+
+def search_jobs(queryset, query):
+    """Restrict a job queryset to matches for ``query``, best matches first"""
+    query = (query or '').strip()
+    if not query or not tokenize(query):
+        return queryset
+    return get_search_backend().rank(queryset, query)
@@ -0,0 +1,67 @@
+# backend/jobs/signals.py
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from companies.models import Company
+from skills.models import Skill
+from .models import Job
+from .search import bump_search_index_version
+from hirepath.caching import bump_namespace_version
+
+# Cache namespace for the public job aggregates (job_stats)
+JOBS_CACHE_NAMESPACE = 'jobs'
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, raw=False, **kwargs):
+    """Keep the search column in sync with the job's own fields"""
+    if raw:
+        return
+    instance.refresh_search_document()
+    bump_search_index_version()
+    bump_namespace_version(JOBS_CACHE_NAMESPACE)
+
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    bump_search_index_version()
+    bump_namespace_version(JOBS_CACHE_NAMESPACE)
+
+
+@receiver(m2m_changed, sender=Job.skills_required.through)
+def job_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Required skills are part of the search document"""
+    if reverse and action == 'pre_clear':
+        # Remember which jobs lose this skill; the relation is empty by post_clear
+        instance._search_cleared_job_ids = list(instance.jobs.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # instance is a Skill; refresh every job it was added to / removed from
+        job_ids = pk_set if pk_set is not None else getattr(instance, '_search_cleared_job_ids', [])
+        jobs = Job.objects.filter(pk__in=job_ids).select_related('company')
+    else:
+        jobs = [instance]
+    for job in jobs:
+        job.refresh_search_document()
+    bump_search_index_version()
+
+
+@receiver(post_save, sender=Company)
+def company_saved(sender, instance, created, raw=False, **kwargs):
+    """Company names are indexed on each of their jobs"""
+    if raw or created:
+        return
+    for job in instance.jobs.select_related('company'):
+        job.refresh_search_document()
+    bump_search_index_version()
+
+
+@receiver(post_save, sender=Skill)
+def skill_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    for job in instance.jobs.select_related('company'):
+        job.refresh_search_document()
+    bump_search_index_version()
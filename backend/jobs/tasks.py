@@ -0,0 +1,68 @@
+# backend/jobs/tasks.py
+"""
+Queued AI analyses for the batch analysis endpoint.
+
+``queue_batch_analysis`` stores the batch (profile, job data, summaries) in
+the shared cache and queues one ``run_batch_analysis`` per job; each stores
+its result next to the batch, where ``batch_results`` reads it for the poll
+endpoint. The AI round trips never run on a web worker.
+"""
+import logging
+
+from hirepath.caching import shared_cache
+from hirepath.tasks import background_task
+
+logger = logging.getLogger(__name__)
+
+# How long a batch and its results stay available for polling (seconds)
+BATCH_ANALYSIS_TTL = 60 * 60
+
+
+def _batch_key(batch_id):
+    return f"jobs:analysis_batch:{batch_id}"
+
+
+def _result_key(batch_id, job_id):
+    return f"jobs:analysis_batch:{batch_id}:{job_id}"
+
+
+def queue_batch_analysis(batch_id, user_id, user_data, jobs_data, summaries):
+    """Store a batch and queue an analysis for each of ``jobs_data`` (job id -> job data, in rank order)"""
+    shared_cache().set(_batch_key(batch_id), {
+        'user_id': user_id,
+        'user_data': user_data,
+        'job_ids': list(jobs_data),
+        'jobs_data': jobs_data,
+        'summaries': summaries,
+    }, timeout=BATCH_ANALYSIS_TTL)
+    for job_id in jobs_data:
+        run_batch_analysis.enqueue(batch_id, job_id)
+
+
+def get_batch(batch_id):
+    """The stored batch, or None once it has expired"""
+    return shared_cache().get(_batch_key(batch_id))
+
+
+def batch_results(batch_id, job_ids):
+    """{job id: analysis result} for the analyses of the batch that have finished"""
+    keys = {_result_key(batch_id, job_id): job_id for job_id in job_ids}
+    return {keys[key]: result for key, result in shared_cache().get_many(list(keys)).items()}
+
+
+@background_task
+def run_batch_analysis(batch_id, job_id):
+    """Run the full AI analysis of one job in a batch and store the result"""
+    from ai.services import ai_engine
+
+    batch = get_batch(batch_id)
+    if batch is None:
+        logger.warning(f"Analysis batch {batch_id} expired before job {job_id} ran")
+        return
+    user_data, job_data = batch['user_data'], batch['jobs_data'][job_id]
+    try:
+        result = ai_engine.analyze_application_match(user_data, job_data, "")
+    except Exception as e:
+        logger.error(f"Batch analysis failed for job {job_id}: {e}")
+        result = ai_engine.score_match(user_data, job_data)
+    shared_cache().set(_result_key(batch_id, job_id), result, timeout=BATCH_ANALYSIS_TTL)
@@ -1,3 +1,377 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from ai.services import ai_engine
+from companies.models import Company
+from hirepath.caching import shared_cache
+from skills.models import Skill
+
+from . import search, views
+from .facets import compute_facets
+from .filters import SKILLS_MATCH_ALL, SKILLS_MATCH_ANY, apply_job_filters, filter_by_skills
+from .models import Job
+from .search import InvertedIndexBackend, MySQLFullTextBackend, RankedResults
+
+
+def make_job(company, title, description='Test job', location='Durban', **fields):
+    fields = {
+        'employment_type': Job.EMPLOYMENT_TYPES[0][0],
+        'work_type': Job.WORK_TYPES[0][0],
+        'experience_level': Job.EXPERIENCE_LEVELS[0][0],
+        **fields,
+    }
+    return Job.objects.create(
+        title=title, description=description, company=company, location=location,
+        created_by=company.created_by, **fields
+    )
+
+
+class JobCacheTests(TestCase):
+    """Invalidation goes through the shared cache, so every worker process sees it"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(username='cache_recruiter', role='RECRUITER')
+        cls.company = Company.objects.create(name='Cache Co', location='Durban', created_by=cls.recruiter)
+
+    def setUp(self):
+        cache.clear()
+        shared_cache().clear()
+        self.client = APIClient()
+
+    def create_job(self, title):
+        return make_job(self.company, title, 'Cache test job')
+
+    def other_process(self):
+        """Settings under which the default cache is private, as in another worker process"""
+        return override_settings(CACHES={
+            **settings.CACHES,
+            'default': {**settings.CACHES['default'], 'LOCATION': 'other-process'},
+        })
+
+    def test_job_change_invalidates_stats_in_other_processes(self):
+        self.create_job('Backend Developer')
+        self.assertEqual(self.client.get('/jobs/stats/').data['total_jobs'], 1)
+
+        with self.other_process():
+            self.create_job('Frontend Developer')
+
+        self.assertEqual(self.client.get('/jobs/stats/').data['total_jobs'], 2)
+
+    def test_search_index_is_rebuilt_after_changes_elsewhere(self):
+        backend = InvertedIndexBackend()
+        self.create_job('Backend Developer')
+        self.assertEqual(len(backend.scores('developer')), 1)
+
+        with self.other_process():
+            self.create_job('Frontend Developer')
+        self.assertEqual(len(backend.scores('developer')), 2)
+
+    def test_categories_are_validated_by_etag_only(self):
+        response = self.client.get('/jobs/categories/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('employment_types', response.data)
+
+        response = self.client.get('/jobs/categories/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # A job change does not touch the categories
+        self.create_job('Backend Developer')
+        self.assertEqual(
+            self.client.get('/jobs/categories/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+
+    def test_shared_cache_outage_does_not_break_writes_or_reads(self):
+        with mock.patch('hirepath.caching.caches') as caches, self.assertLogs('hirepath.caching', 'ERROR'):
+            caches.__getitem__.side_effect = ConnectionError('cache down')
+            self.create_job('Backend Developer')
+            response = self.client.get('/jobs/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_jobs'], 1)
+        self.assertNotIn('Last-Modified', response)
+
+
+class JobSearchTests(TestCase):
+    """Ranked search on the in-process BM25 backend, combined with the list filters"""
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='search_recruiter', role='RECRUITER')
+        cls.company = Company.objects.create(name='Search Co', location='Durban', created_by=recruiter)
+        cls.title_match = make_job(cls.company, 'Python Developer', 'Build APIs')
+        cls.description_match = make_job(cls.company, 'Backend Engineer', 'Some Python scripting', location='Cape Town')
+        cls.unrelated = make_job(cls.company, 'Accountant', 'Spreadsheets')
+
+    def setUp(self):
+        shared_cache().clear()
+        self.client = APIClient()
+        # Each test starts from a fresh backend (the module keeps one per process)
+        patcher = mock.patch.object(search, '_backend', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def titles(self, params):
+        return [job['title'] for job in self.client.get('/jobs/', params).data]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(self.titles({'search': 'python'}), ['Python Developer', 'Backend Engineer'])
+
+    def test_ties_fall_back_to_newest_first(self):
+        newer = make_job(self.company, 'Python Developer', 'Build APIs')
+        ranked = InvertedIndexBackend().rank(Job.objects.all(), 'python developer')
+        self.assertEqual([job.pk for job in ranked][:2], [newer.pk, self.title_match.pk])
+        self.assertEqual(ranked[0].search_rank, ranked[1].search_rank)
+
+    def test_low_ranked_match_survives_filters(self):
+        # Only the weaker match is in Cape Town; ranking must not drop it before filtering
+        self.assertEqual(self.titles({'search': 'python', 'location': 'cape town'}), ['Backend Engineer'])
+        filtered = apply_job_filters(Job.objects.all(), {'search': 'python', 'location': 'cape town'})
+        self.assertEqual(list(filtered), [self.description_match])
+
+    def test_ranked_results_fetch_one_slice_per_query(self):
+        ranked = InvertedIndexBackend().rank(Job.objects.all(), 'python')
+        self.assertIsInstance(ranked, RankedResults)
+        self.assertEqual(ranked.count(), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(ranked[1:2], [self.description_match])
+
+    def test_no_match_is_empty(self):
+        self.assertEqual(self.titles({'search': 'haskell'}), [])
+
+    def test_backend_follows_database_vendor_and_setting(self):
+        with mock.patch.object(search.connection, 'vendor', 'mysql'):
+            self.assertIsInstance(search.get_search_backend(), MySQLFullTextBackend)
+        search._backend = None
+        with override_settings(JOB_SEARCH_BACKEND='inverted_index'), \
+                mock.patch.object(search.connection, 'vendor', 'mysql'):
+            self.assertIsInstance(search.get_search_backend(), InvertedIndexBackend)
+
+    def test_mysql_backend_ranks_with_match_against(self):
+        sql = str(MySQLFullTextBackend().rank(Job.objects.all(), 'python').query)
+        self.assertIn('MATCH(', sql)
+        self.assertIn('AGAINST (python IN NATURAL LANGUAGE MODE)', sql)
+        self.assertIn('ORDER BY', sql)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class BatchAnalysisTests(TestCase):
+    """Scores stream straight away; full AI analyses are queued and polled"""
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='batch_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Batch Co', location='Durban', created_by=recruiter)
+        python, django = Skill.objects.create(name='Python'), Skill.objects.create(name='Django')
+        cls.strong = make_job(company, 'Django Developer')
+        cls.strong.skills_required.set([python, django])
+        cls.weak = make_job(company, 'Rust Developer')
+        cls.weak.skills_required.set([Skill.objects.create(name='Rust')])
+        cls.graduate = User.objects.create(username='batch_graduate', role='GRADUATE')
+        cls.graduate.skills.set([python, django])
+
+    def setUp(self):
+        shared_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.graduate)
+        self.analyze = mock.patch.object(ai_engine, 'analyze_application_match', side_effect=lambda user, job, cover: {
+            'match_score': 91.0, 'analysis': {'skills_assessment': {'job': job['title']}}, 'feedback': 'Apply',
+        }).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def post(self, body):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/jobs/analyze/batch/', body, format='json')
+            events = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        return events, callbacks
+
+    def test_scores_stream_and_analyses_run_in_background(self):
+        events, callbacks = self.post({'job_ids': [self.weak.pk, self.strong.pk], 'top_k': 1})
+
+        self.assertEqual([event['event'] for event in events], ['profile', 'score', 'score', 'done'])
+        self.assertEqual(events[0]['top_k'], 1)
+        self.assertFalse(events[0]['truncated'])
+        self.assertEqual([event['job']['id'] for event in events[1:3]], [self.strong.pk, self.weak.pk])
+        done = events[-1]
+        self.assertEqual(done['queued'], 1)
+        # Nothing called the AI while the request was served
+        self.analyze.assert_not_called()
+
+        pending = self.client.get(done['results_url']).data
+        self.assertEqual((pending['complete'], pending['pending'], pending['analyses']), (False, [self.strong.pk], []))
+
+        for callback in callbacks:
+            callback()
+        results = self.client.get(done['results_url']).data
+        self.assertTrue(results['complete'])
+        self.assertEqual(results['analyses'][0]['job']['id'], self.strong.pk)
+        self.assertEqual(results['analyses'][0]['analysis']['match_score'], 91.0)
+        self.assertEqual(results['analyses'][0]['analysis']['skills_match'], {'job': 'Django Developer'})
+
+    def test_failed_analysis_falls_back_to_deterministic_score(self):
+        self.analyze.side_effect = RuntimeError('model unavailable')
+        events, callbacks = self.post({'job_ids': [self.strong.pk], 'top_k': 1})
+        for callback in callbacks:
+            callback()
+        analysis = self.client.get(events[-1]['results_url']).data['analyses'][0]['analysis']
+        self.assertEqual(analysis['match_score'], events[1]['match_score'])
+
+    def test_truncation_is_reported(self):
+        with mock.patch.object(views, 'BATCH_ANALYSIS_MAX_JOBS', 1):
+            events, _ = self.post({'job_ids': [self.weak.pk, self.strong.pk], 'top_k': 0})
+        self.assertEqual((events[0]['jobs_count'], events[0]['truncated'], events[0]['max_jobs']), (1, True, 1))
+        self.assertEqual(events[-1], {'event': 'done', 'queued': 0, 'batch_id': None, 'results_url': None})
+
+    def test_results_are_private_to_the_requester(self):
+        events, _ = self.post({'job_ids': [self.strong.pk], 'top_k': 1})
+        self.client.force_authenticate(User.objects.create(username='batch_other', role='GRADUATE'))
+        self.assertEqual(self.client.get(events[-1]['results_url']).status_code, 404)
+        self.assertEqual(self.client.get('/jobs/analyze/batch/unknown/').status_code, 404)
+
+    def test_profile_without_skills_is_rejected(self):
+        self.graduate.skills.clear()
+        response = self.client.post('/jobs/analyze/batch/', {'all_active': True}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class SkillFilterTests(TestCase):
+    """filter_by_skills: any/all matching as semi-joins, so jobs are never repeated"""
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='skills_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Skills Co', location='Durban', created_by=recruiter)
+        cls.python, cls.sql, cls.go = (Skill.objects.create(name=name) for name in ('Python', 'SQL', 'Go'))
+        cls.both = make_job(company, 'Data Engineer')
+        cls.both.skills_required.set([cls.python, cls.sql])
+        cls.python_only = make_job(company, 'Python Developer')
+        cls.python_only.skills_required.set([cls.python])
+        cls.go_only = make_job(company, 'Go Developer')
+        cls.go_only.skills_required.set([cls.go])
+        cls.no_skills = make_job(company, 'Office Manager')
+
+    def filtered(self, skill_ids, match=SKILLS_MATCH_ANY):
+        return list(filter_by_skills(Job.objects.order_by('pk'), skill_ids, match))
+
+    def listed(self, query):
+        response = APIClient().get(f'/jobs/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return sorted(job['id'] for job in response.data)
+
+    def test_any_matches_jobs_with_at_least_one_skill_once(self):
+        self.assertEqual(self.filtered([self.python.pk, self.sql.pk]), [self.both, self.python_only])
+        self.assertEqual(self.filtered([self.sql.pk, self.go.pk]), [self.both, self.go_only])
+
+    def test_all_requires_every_skill(self):
+        self.assertEqual(self.filtered([self.python.pk, self.sql.pk], SKILLS_MATCH_ALL), [self.both])
+        self.assertEqual(self.filtered([self.python.pk], SKILLS_MATCH_ALL), [self.both, self.python_only])
+        self.assertEqual(self.filtered([self.python.pk, self.go.pk], SKILLS_MATCH_ALL), [])
+
+    def test_duplicate_ids_count_once(self):
+        self.assertEqual(
+            self.filtered([self.python.pk, self.python.pk, self.sql.pk], SKILLS_MATCH_ALL), [self.both]
+        )
+        self.assertEqual(self.filtered([self.python.pk, self.python.pk]), [self.both, self.python_only])
+        self.assertEqual(
+            self.listed(f'skills={self.python.pk},{self.python.pk}&skills={self.python.pk}&skills_match=all'),
+            [self.both.pk, self.python_only.pk],
+        )
+
+    def test_empty_input_does_not_filter(self):
+        queryset = Job.objects.all()
+        self.assertIs(filter_by_skills(queryset, []), queryset)
+        self.assertIs(filter_by_skills(queryset, None, SKILLS_MATCH_ALL), queryset)
+        everything = sorted(Job.objects.values_list('pk', flat=True))
+        self.assertEqual(self.listed('skills=&skills_match=all'), everything)
+        # Non-numeric ids are dropped, leaving no skill filter
+        self.assertEqual(self.listed('skills=python'), everything)
+
+
+class FacetTests(TestCase):
+    """Each facet counts the jobs every other active filter (but not its own) leaves"""
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create(username='facet_recruiter', role='RECRUITER')
+        company = Company.objects.create(name='Facet Co', location='Durban', created_by=recruiter)
+        cls.python, cls.sql = Skill.objects.create(name='Python'), Skill.objects.create(name='SQL')
+        rows = [
+            ('Remote Python', 'FULL_TIME', 'REMOTE', 'SENIOR', 'Cape Town', [cls.python, cls.sql]),
+            ('Remote Contract', 'CONTRACT', 'REMOTE', 'MID', 'Durban', [cls.python]),
+            ('Hybrid Analyst', 'FULL_TIME', 'HYBRID', 'MID', 'Cape Town', [cls.sql]),
+            ('Onsite Intern', 'INTERNSHIP', 'ONSITE', 'ENTRY', 'Durban', []),
+            ('Onsite Lead', 'FULL_TIME', 'ONSITE', 'LEAD', 'Pretoria', [cls.python]),
+        ]
+        for title, employment_type, work_type, experience_level, location, skills in rows:
+            job = make_job(
+                company, title, location=location, employment_type=employment_type,
+                work_type=work_type, experience_level=experience_level,
+            )
+            job.skills_required.set(skills)
+
+    def assertFacetsMatchFilteredQuerysets(self, query):
+        params = QueryDict(query)
+        facets = compute_facets(params)
+        jobs = Job.objects.all()
+
+        self.assertEqual(facets['total'], apply_job_filters(jobs, params).count(), query)
+        for facet in ('employment_type', 'work_type', 'experience_level'):
+            for choice in facets[facet]:
+                # The count a visitor would get by picking this value instead of the current one
+                picked = params.copy()
+                picked[facet] = choice['value']
+                self.assertEqual(choice['count'], apply_job_filters(jobs, picked).count(), (query, choice))
+
+        others = apply_job_filters(jobs, params, exclude=('skills',))
+        for choice in facets['skills']:
+            self.assertEqual(
+                choice['count'], others.filter(skills_required=choice['value']).count(), (query, choice)
+            )
+        others = apply_job_filters(jobs, params, exclude=('location',))
+        self.assertEqual(
+            {choice['value']: choice['count'] for choice in facets['location']},
+            {location: others.filter(location=location).count()
+             for location in others.values_list('location', flat=True).distinct()},
+            query,
+        )
+        return facets
+
+    def test_counts_match_filtered_querysets(self):
+        for query in (
+            '',
+            'work_type=REMOTE',
+            'employment_type=FULL_TIME&location=cape',
+            f'skills={self.python.pk}',
+            f'skills={self.python.pk},{self.sql.pk}&skills_match=all&work_type=REMOTE',
+            'experience_level=MID&company=facet',
+        ):
+            with self.subTest(query=query):
+                self.assertFacetsMatchFilteredQuerysets(query)
+
+    def test_facets_are_disjunctive(self):
+        facets = self.assertFacetsMatchFilteredQuerysets('work_type=REMOTE&employment_type=FULL_TIME')
+        self.assertEqual(facets['total'], 1)
+        counts = lambda facet: {choice['value']: choice['count'] for choice in facets[facet]}
+        # Picking Remote still shows what the other work types would return for full-time jobs...
+        self.assertEqual(counts('work_type'), {'ONSITE': 1, 'REMOTE': 1, 'HYBRID': 1})
+        # ...and the employment types of remote jobs, ignoring the full-time filter
+        self.assertEqual(counts('employment_type')['CONTRACT'], 1)
+        self.assertEqual(counts('employment_type')['INTERNSHIP'], 0)
+        # Every choice is listed, including empty ones, with its display name
+        self.assertEqual(len(facets['work_type']), len(Job.WORK_TYPES))
+        self.assertEqual(facets['work_type'][0]['display_name'], 'On-site')
+
+    def test_endpoints_serve_the_same_counts(self):
+        query = f'work_type=REMOTE&skills={self.python.pk}'
+        expected = json.loads(json.dumps(compute_facets(QueryDict(query))))
+        self.assertEqual(APIClient().get(f'/jobs/facets/?{query}').json(), expected)
+        response = APIClient().get(f'/jobs/?{query}&include_facets=true').json()
+        self.assertEqual(response['facets'], expected)
+        self.assertEqual(len(response['results']), expected['total'])
@@ -5,9 +5,12 @@ from .views import (
     JobPublicDetailView, 
     MyJobListView,
     analyze_job, 
+    analyze_jobs_batch,
+    analyze_jobs_batch_results,
     ping, 
     active_jobs, 
     job_categories,
+    job_facets,
     job_stats
 )
 
@@ -17,8 +20,11 @@ urlpatterns = [
     path("active/", active_jobs, name="active-jobs"),
     path("categories/", job_categories, name="job-categories"),
     path("stats/", job_stats, name="job-stats"),
+    path("facets/", job_facets, name="job-facets"),
     path("me/", MyJobListView.as_view(), name="my-job-list"),
     path("<int:pk>/", JobDetailView.as_view(), name="job-detail"),
     path("details/<int:pk>/", JobPublicDetailView.as_view(), name="job-public-detail"), 
+    path("analyze/batch/", analyze_jobs_batch, name="job-analyze-batch"),
+    path("analyze/batch/<str:batch_id>/", analyze_jobs_batch_results, name="job-analyze-batch-results"),
     path("<int:job_id>/analyze/", analyze_job, name="job-analyze"),
 ]
\ No newline at end of file
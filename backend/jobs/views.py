@@ -1,12 +1,25 @@
+import json
+import uuid
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.db import models
+from django.http import StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from datetime import date
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from .models import Job
 from .serializers import JobSerializer, JobCreateSerializer, JobListSerializer
+from .search import search_jobs
+from .filters import apply_job_filters
+from .facets import compute_facets
+from .signals import JOBS_CACHE_NAMESPACE
+from .tasks import batch_results, get_batch, queue_batch_analysis
+from hirepath.caching import cached_swr, conditional_response, make_etag
+from hirepath.renderers import NDJSONRenderer, EventStreamRenderer
 
 # Import for job analysis
 from ai.services import ai_engine
@@ -14,6 +27,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Public aggregate endpoints: server-side freshness, client max-age and the
+# stale-while-revalidate window (seconds)
+JOBS_CACHE_TTL = 60 * 10
+JOBS_CLIENT_MAX_AGE = 60
+JOBS_CACHE_STALE_TTL = 30
+
+# Batch analysis limits
+BATCH_ANALYSIS_MAX_JOBS = 200
+BATCH_ANALYSIS_DEFAULT_TOP_K = 5
+BATCH_ANALYSIS_MAX_TOP_K = 20
+
 class JobListCreateView(generics.ListCreateAPIView):
     queryset = Job.objects.all().order_by("-created_at")
     serializer_class = JobListSerializer
@@ -40,38 +64,25 @@ class JobListCreateView(generics.ListCreateAPIView):
         # Prefetch related data to optimize queries
         queryset = queryset.select_related('company').prefetch_related('skills_required', 'applications')
         
-        # Filter by employment type
-        employment_type = self.request.query_params.get('employment_type')
-        if employment_type:
-            queryset = queryset.filter(employment_type=employment_type)
-        
-        # Filter by work type
-        work_type = self.request.query_params.get('work_type')
-        if work_type:
-            queryset = queryset.filter(work_type=work_type)
-        
-        # Filter by experience level
-        experience_level = self.request.query_params.get('experience_level')
-        if experience_level:
-            queryset = queryset.filter(experience_level=experience_level)
-        
-        # Filter by skills
-        skills = self.request.query_params.getlist('skills')
-        if skills:
-            queryset = queryset.filter(skills_required__id__in=skills).distinct()
+        queryset = apply_job_filters(queryset, self.request.query_params, exclude=('search',))
         
-        # Filter by location (case-insensitive partial match)
-        location = self.request.query_params.get('location')
-        if location:
-            queryset = queryset.filter(location__icontains=location)
-        
-        # Filter by company
-        company = self.request.query_params.get('company')
-        if company:
-            queryset = queryset.filter(company__name__icontains=company)
+        # Full-text search over title, description, company, location and skills (ranked)
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = search_jobs(queryset, search)
         
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """Optionally return facet counts alongside the results (?include_facets=true)"""
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get('include_facets', '').lower() in ('1', 'true', 'yes'):
+            response.data = {
+                'results': response.data,
+                'facets': compute_facets(request.query_params),
+            }
+        return response
+
 class MyJobListView(generics.ListAPIView):
     serializer_class = JobListSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -136,47 +147,72 @@ def active_jobs(request):
 @permission_classes([permissions.AllowAny])
 def job_categories(request):
     """Get available job categories and filters"""
-    categories = {
+    # Static choices: nothing to cache server-side or invalidate, just let clients revalidate by ETag
+    data = compute_job_categories()
+    entry = {'data': data, 'etag': make_etag(data), 'last_modified': None}
+    return conditional_response(request, entry, max_age=JOBS_CLIENT_MAX_AGE, stale_while_revalidate=JOBS_CACHE_STALE_TTL)
+
+def compute_job_categories():
+    """Choice metadata for the job filter UI"""
+    return {
         'employment_types': dict(Job.EMPLOYMENT_TYPES),
         'work_types': dict(Job.WORK_TYPES),
         'experience_levels': dict(Job.EXPERIENCE_LEVELS),
     }
-    return Response(categories)
+
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+def job_facets(request):
+    """Get per-facet job counts for the currently applied list filters"""
+    return Response(compute_facets(request.query_params))
 
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
 def job_stats(request):
-    """Get job statistics"""
-    total_jobs = Job.objects.count()
-    active_jobs_count = Job.objects.filter(
-        models.Q(closing_date__gte=date.today()) | 
-        models.Q(closing_date__isnull=True)
-    ).count()
+    """Get job statistics (cached until a job changes; supports conditional GETs)"""
+    # "active" depends on today's date, so each day gets its own entry
+    entry = cached_swr(
+        f'jobs:stats:{date.today().isoformat()}',
+        compute_job_stats,
+        namespace=JOBS_CACHE_NAMESPACE,
+        ttl=JOBS_CACHE_TTL,
+        stale_ttl=JOBS_CACHE_STALE_TTL,
+    )
+    return conditional_response(request, entry, max_age=JOBS_CLIENT_MAX_AGE, stale_while_revalidate=JOBS_CACHE_STALE_TTL)
+
+def compute_job_stats():
+    """Aggregate the job_stats payload (3 queries)"""
+    totals = Job.objects.aggregate(
+        total_jobs=models.Count('id'),
+        active_jobs=models.Count(
+            'id',
+            filter=models.Q(closing_date__gte=date.today()) | models.Q(closing_date__isnull=True)
+        ),
+    )
     
-    # Count by employment type
-    employment_stats = {}
-    for employment_type, display_name in Job.EMPLOYMENT_TYPES:
-        count = Job.objects.filter(employment_type=employment_type).count()
-        employment_stats[employment_type] = {
-            'display_name': display_name,
-            'count': count
-        }
+    # Count by employment type / work type with one grouped query each
+    employment_counts = dict(
+        Job.objects.order_by().values_list('employment_type').annotate(count=models.Count('id'))
+    )
+    employment_stats = {
+        employment_type: {'display_name': display_name, 'count': employment_counts.get(employment_type, 0)}
+        for employment_type, display_name in Job.EMPLOYMENT_TYPES
+    }
     
-    # Count by work type
-    work_stats = {}
-    for work_type, display_name in Job.WORK_TYPES:
-        count = Job.objects.filter(work_type=work_type).count()
-        work_stats[work_type] = {
-            'display_name': display_name,
-            'count': count
-        }
+    work_counts = dict(
+        Job.objects.order_by().values_list('work_type').annotate(count=models.Count('id'))
+    )
+    work_stats = {
+        work_type: {'display_name': display_name, 'count': work_counts.get(work_type, 0)}
+        for work_type, display_name in Job.WORK_TYPES
+    }
     
-    return Response({
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs_count,
+    return {
+        'total_jobs': totals['total_jobs'],
+        'active_jobs': totals['active_jobs'],
         'employment_types': employment_stats,
         'work_types': work_stats,
-    })
+    }
 
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
@@ -228,18 +264,7 @@ def analyze_job(request, job_id):
 
         # Prepare response
         response_data = {
-            'job': {
-                'id': job.id,
-                'title': job.title,
-                'company': job.company.name,
-                'location': job.location,
-                'employment_type': job.get_employment_type_display(),
-                'work_type': job.get_work_type_display(),
-                'experience_level': job.get_experience_level_display(),
-                'salary_range': get_salary_range(job),
-                'closing_date': job.closing_date,
-                'days_remaining': get_days_remaining(job),
-            },
+            'job': get_job_summary(job),
             'profile_summary': {
                 'skills_count': skills_count,
                 'educations_count': educations_count,
@@ -333,6 +358,155 @@ def analyze_job(request, job_id):
             {'error': 'Analysis failed. Please try again.'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@renderer_classes([JSONRenderer, NDJSONRenderer, EventStreamRenderer])
+def analyze_jobs_batch(request):
+    """
+    Analyze many jobs for the current graduate in one request
+    POST /api/jobs/analyze/batch/
+    Body: {"job_ids": [1, 2, 3]} or {"all_active": true}, optional "top_k"
+
+    The profile is built once and every job is scored with the deterministic
+    engine straight away; full AI analyses for the top_k jobs are queued as
+    background tasks (see jobs.tasks) and collected by polling
+    GET /api/jobs/analyze/batch/<batch_id>/. Scores are streamed as NDJSON,
+    or as server-sent events when the client sends "Accept: text/event-stream".
+    At most BATCH_ANALYSIS_MAX_JOBS jobs are scored; the profile event reports
+    whether the request was cut to that.
+    """
+    user = request.user
+    user_data = get_user_profile_data(user)
+
+    if not user_data.get('skills'):
+        return Response(
+            {'error': 'Please add skills to your profile to analyze jobs.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    jobs = Job.objects.select_related('company').prefetch_related(
+        'skills_required', 'courses_preferred', 'certificates_preferred'
+    )
+    if request.data.get('all_active'):
+        jobs = jobs.filter(
+            models.Q(closing_date__gte=date.today()) | models.Q(closing_date__isnull=True)
+        ).order_by('-created_at')
+    else:
+        job_ids = request.data.get('job_ids') or []
+        if not isinstance(job_ids, list) or not all(str(job_id).isdigit() for job_id in job_ids):
+            return Response(
+                {'error': 'Provide "job_ids" as a list of ids or set "all_active": true.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        jobs = jobs.filter(pk__in=[int(job_id) for job_id in job_ids]).order_by('pk')
+    # One extra row tells whether the request was cut to the limit
+    jobs = list(jobs[:BATCH_ANALYSIS_MAX_JOBS + 1])
+    truncated = len(jobs) > BATCH_ANALYSIS_MAX_JOBS
+    jobs = jobs[:BATCH_ANALYSIS_MAX_JOBS]
+
+    try:
+        top_k = int(request.data.get('top_k', BATCH_ANALYSIS_DEFAULT_TOP_K))
+    except (TypeError, ValueError):
+        top_k = BATCH_ANALYSIS_DEFAULT_TOP_K
+    top_k = max(0, min(top_k, BATCH_ANALYSIS_MAX_TOP_K))
+
+    # Everything (scoring and queueing included) happens before the response starts streaming
+    jobs_data = {job.id: get_prefetched_job_data(job) for job in jobs}
+    summaries = {job.id: get_job_summary(job) for job in jobs}
+    scored = sorted(
+        ((ai_engine.score_match(user_data, job_data)['match_score'], job_id) for job_id, job_data in jobs_data.items()),
+        key=lambda item: (-item[0], item[1])
+    )
+    top_ids = [job_id for _, job_id in scored[:top_k]]
+    batch_id = uuid.uuid4().hex
+    if top_ids:
+        queue_batch_analysis(
+            batch_id, user.id, user_data,
+            {job_id: jobs_data[job_id] for job_id in top_ids},
+            {job_id: summaries[job_id] for job_id in top_ids},
+        )
+    use_sse = request.accepted_renderer.format == 'sse'
+
+    def encode(event, payload):
+        body = json.dumps({'event': event, **payload}, cls=DjangoJSONEncoder)
+        if use_sse:
+            return f"event: {event}\ndata: {body}\n\n"
+        return body + "\n"
+
+    def stream():
+        yield encode('profile', {
+            'profile_summary': {
+                'skills_count': len(user_data.get('skills', [])),
+                'educations_count': len(user_data.get('educations', [])),
+                'experiences_count': len(user_data.get('experiences', [])),
+                'certificates_count': len(user_data.get('certificates', [])),
+            },
+            'jobs_count': len(jobs_data),
+            'truncated': truncated,
+            'max_jobs': BATCH_ANALYSIS_MAX_JOBS,
+            'top_k': len(top_ids),
+        })
+
+        for rank, (score, job_id) in enumerate(scored, start=1):
+            yield encode('score', {
+                'rank': rank,
+                'job': summaries[job_id],
+                'match_score': score,
+                'match_quality': get_match_quality(score),
+            })
+
+        yield encode('done', {
+            'queued': len(top_ids),
+            'batch_id': batch_id if top_ids else None,
+            'results_url': reverse('job-analyze-batch-results', args=[batch_id]) if top_ids else None,
+        })
+
+    response = StreamingHttpResponse(
+        stream(),
+        content_type='text/event-stream' if use_sse else 'application/x-ndjson'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def format_analysis(result):
+    """The analysis payload of a full (or fallback) match result"""
+    analysis = result.get('analysis', {})
+    return {
+        'match_score': result.get('match_score', 0),
+        'match_quality': get_match_quality(result.get('match_score', 0)),
+        'skills_match': analysis.get('skills_assessment', {}),
+        'education_match': analysis.get('education_assessment', {}),
+        'certification_match': analysis.get('certification_assessment', {}),
+        'feedback': result.get('feedback', ''),
+    }
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def analyze_jobs_batch_results(request, batch_id):
+    """
+    Poll the queued analyses of a batch
+    GET /api/jobs/analyze/batch/<batch_id>/
+
+    Returns the analyses finished so far (in rank order) and the job ids still
+    pending; "complete" is true once every analysis is in.
+    """
+    batch = get_batch(batch_id)
+    if batch is None or batch['user_id'] != request.user.id:
+        return Response({'error': 'Analysis batch not found or expired'}, status=status.HTTP_404_NOT_FOUND)
+
+    results = batch_results(batch_id, batch['job_ids'])
+    return Response({
+        'batch_id': batch_id,
+        'complete': len(results) == len(batch['job_ids']),
+        'pending': [job_id for job_id in batch['job_ids'] if job_id not in results],
+        'analyses': [
+            {'job': batch['summaries'][job_id], 'analysis': format_analysis(results[job_id])}
+            for job_id in batch['job_ids'] if job_id in results
+        ],
+    })
+
 # Helper functions for job analysis
 def get_user_profile_data(user):
     """Extract user profile data for analysis - using your complete model structure"""
@@ -430,6 +604,32 @@ def get_job_data(job):
         logger.error(f"Error extracting job data: {e}")
         return {}
 
+def get_prefetched_job_data(job):
+    """Same shape as get_job_data, but reads prefetched relations (no extra queries)"""
+    return {
+        "title": job.title,
+        "description": job.description,
+        "skills_required": [skill.name for skill in job.skills_required.all()],
+        "experience_level": job.experience_level,
+        "courses_preferred": [course.name for course in job.courses_preferred.all()],
+        "certificates_preferred": [cert.name for cert in job.certificates_preferred.all()],
+    }
+
+def get_job_summary(job):
+    """Job fields shown alongside an analysis"""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company.name,
+        'location': job.location,
+        'employment_type': job.get_employment_type_display(),
+        'work_type': job.get_work_type_display(),
+        'experience_level': job.get_experience_level_display(),
+        'salary_range': get_salary_range(job),
+        'closing_date': job.closing_date,
+        'days_remaining': get_days_remaining(job),
+    }
+
 def get_salary_range(job):
     """Get formatted salary range"""
     if job.min_salary and job.max_salary:
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Notification
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'recipient', 'application', 'state', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['kind', 'state', 'created_at']
+    search_fields = ['recipient__username', 'recipient__email']
+    readonly_fields = ['created_at', 'sent_at', 'batch_id']
@@ -0,0 +1,288 @@
+# notifications/delivery.py
+"""
+Render and send queued notifications.
+
+Templates are compiled once per (template, locale) and reused for every
+email in every batch. A batch is sent over a single mail connection with
+``send_messages``. New-applicant notices for the same recruiter within one
+batch are coalesced into a single digest email.
+
+A failed email is retried after ``RETRY_DELAY`` seconds, doubling with each
+attempt, up to ``MAX_ATTEMPTS``; only the notifications in that email are
+retried. Notifications left in SENDING by a run that died are claimed again
+once their ``SENDING_LEASE`` runs out, so they may be sent twice but are
+never lost.
+"""
+import logging
+import math
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Q
+from django.template import TemplateDoesNotExist
+from django.template.loader import select_template
+from django.utils import timezone, translation
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+MAX_ATTEMPTS = 3
+# Seconds before the first retry; doubled for each further attempt
+RETRY_DELAY = 60
+# Seconds after which a notification still SENDING is assumed abandoned
+SENDING_LEASE = 10 * 60
+
+# Kinds that are merged into one digest email when a recipient has several in a batch
+DIGEST_TEMPLATES = {
+    Notification.Kind.NEW_APPLICANT: 'recruiter_digest',
+}
+
+TEMPLATES = {
+    Notification.Kind.APPLICATION_SUBMITTED: 'application_submission',
+    Notification.Kind.STATUS_CHANGED: 'status_changed',
+    Notification.Kind.NEW_APPLICANT: 'new_applicant',
+}
+
+
+@lru_cache(maxsize=None)
+def get_email_templates(name, locale):
+    """
+    Compiled ``(text, html)`` templates for ``emails/<name>``, preferring a
+    locale-specific ``emails/<locale>/<name>``. ``html`` may be None.
+    """
+    def load(extension):
+        try:
+            return select_template([f'emails/{locale}/{name}.{extension}', f'emails/{name}.{extension}'])
+        except TemplateDoesNotExist:
+            return None
+
+    text = load('txt')
+    if text is None:
+        raise TemplateDoesNotExist(f'emails/{name}.txt')
+    return text, load('html')
+
+
+def render_email(name, locale, context, subject, to):
+    text_template, html_template = get_email_templates(name, locale)
+    context = {
+        'site_name': getattr(settings, 'SITE_NAME', 'Hire-path'),
+        'support_email': getattr(settings, 'SUPPORT_EMAIL', settings.DEFAULT_FROM_EMAIL),
+        **context,
+    }
+    with translation.override(locale):
+        message = EmailMultiAlternatives(subject, text_template.render(context), to=[to])
+        if html_template is not None:
+            message.attach_alternative(html_template.render(context), 'text/html')
+    return message
+
+
+def display_name(user):
+    return user.get_full_name() or user.username
+
+
+def application_context(application):
+    job = application.job
+    return {
+        'application_id': application.id,
+        'applicant_name': display_name(application.applicant),
+        'job_title': job.title,
+        'company_name': job.company.name if job.company_id else '',
+        'match_score': round(application.match_score) if application.match_score is not None else None,
+        'application_date': timezone.localtime(application.applied_at).strftime('%Y-%m-%d'),
+        'status': application.get_status_display(),
+        'interview_date': application.interview_date,
+    }
+
+
+def build_single(notification):
+    application = notification.application
+    context = application_context(application)
+    status_labels = dict(application.Status.choices)
+    site_name = getattr(settings, 'SITE_NAME', 'Hire-path')
+
+    if notification.kind == Notification.Kind.STATUS_CHANGED:
+        to_status = notification.context.get('to_status', application.status)
+        context.update(
+            previous_status=status_labels.get(notification.context.get('from_status'), ''),
+            status=status_labels.get(to_status, to_status),
+        )
+        subject = f"{site_name}: your application for {context['job_title']} is now {context['status']}"
+    elif notification.kind == Notification.Kind.NEW_APPLICANT:
+        context['recruiter_name'] = display_name(notification.recipient)
+        subject = f"{site_name}: new applicant for {context['job_title']}"
+    else:
+        subject = f"{site_name}: application submitted for {context['job_title']}"
+
+    return render_email(
+        TEMPLATES[notification.kind], notification.locale, context, subject, notification.recipient.email
+    )
+
+
+def build_digest(notifications):
+    first = notifications[0]
+    applicants = [application_context(notification.application) for notification in notifications]
+    site_name = getattr(settings, 'SITE_NAME', 'Hire-path')
+    jobs = defaultdict(int)
+    for applicant in applicants:
+        jobs[applicant['job_title']] += 1
+    context = {
+        'recruiter_name': display_name(first.recipient),
+        'count': len(applicants),
+        'applicants': applicants,
+        'jobs': sorted(jobs.items(), key=lambda item: -item[1]),
+    }
+    subject = f"{site_name}: {len(applicants)} new applicants"
+    return render_email(DIGEST_TEMPLATES[first.kind], first.locale, context, subject, first.recipient.email)
+
+
+def build_messages(notifications):
+    """Return ``[(message, [notification, ...]), ...]`` with digestible bursts merged"""
+    groups = defaultdict(list)
+    for notification in notifications:
+        if notification.kind in DIGEST_TEMPLATES:
+            groups[(notification.recipient_id, notification.kind, notification.locale)].append(notification)
+        else:
+            groups[notification.id].append(notification)
+
+    messages = []
+    for group in groups.values():
+        message = build_digest(group) if len(group) > 1 else build_single(group[0])
+        messages.append((message, group))
+    return messages
+
+
+def claimable(now):
+    """Pending notifications that are due, and SENDING ones whose lease ran out"""
+    due = Q(state=Notification.State.PENDING) & (Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+    abandoned = Q(state=Notification.State.SENDING, claimed_at__lt=now - timedelta(seconds=SENDING_LEASE))
+    return due | abandoned
+
+
+def claim_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """Mark up to ``batch_size`` claimable notifications as ours and return them"""
+    now = timezone.now()
+    pending_ids = list(
+        Notification.objects.filter(claimable(now))
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not pending_ids:
+        return []
+
+    batch_id = uuid.uuid4()
+    # Re-checking the condition keeps a concurrent run from claiming the same rows
+    Notification.objects.filter(claimable(now), id__in=pending_ids).update(
+        state=Notification.State.SENDING, batch_id=batch_id, claimed_at=now
+    )
+    return list(
+        Notification.objects.filter(batch_id=batch_id).select_related(
+            'recipient', 'application__applicant', 'application__job__company'
+        )
+    )
+
+
+def retry_delay(attempts):
+    return RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def mark_failed(notifications, error):
+    """
+    Back to PENDING with a backed-off ``next_attempt_at``, or FAILED once
+    attempts run out. Returns the seconds until the earliest retry, or None.
+    """
+    now = timezone.now()
+    earliest = None
+    for notification in notifications:
+        notification.attempts += 1
+        notification.error = str(error)[:1000]
+        if notification.attempts >= MAX_ATTEMPTS:
+            notification.state = Notification.State.FAILED
+            notification.next_attempt_at = None
+        else:
+            delay = retry_delay(notification.attempts)
+            notification.state = Notification.State.PENDING
+            notification.next_attempt_at = now + timedelta(seconds=delay)
+            earliest = delay if earliest is None else min(earliest, delay)
+    Notification.objects.bulk_update(notifications, ['attempts', 'error', 'state', 'next_attempt_at'])
+    return earliest
+
+
+def send_prepared(prepared):
+    """
+    Send ``[(message, notifications)]`` over one connection, one message at a
+    time so a failure only affects its own message. Returns the delivered
+    notifications and ``[(notifications, error)]`` for the failed ones.
+    """
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error(f"Opening the mail connection for {len(prepared)} notification emails failed: {e}")
+        return [], [([notification for _, group in prepared for notification in group], e)]
+
+    delivered, failed = [], []
+    try:
+        for message, group in prepared:
+            try:
+                connection.send_messages([message])
+                delivered.extend(group)
+            except Exception as e:
+                logger.error(f"Sending notification email to {', '.join(message.to)} failed: {e}")
+                failed.append((group, e))
+    finally:
+        connection.close()
+    return delivered, failed
+
+
+def schedule_retry(failures):
+    """Mark ``[(notifications, error)]`` failed and schedule a run for the earliest retry"""
+    from .queue import schedule_retry_run
+
+    delays = [delay for delay in (mark_failed(group, error) for group, error in failures) if delay is not None]
+    if delays:
+        schedule_retry_run(math.ceil(min(delays)))
+
+
+def deliver_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Claim, render and send one batch over a single mail connection.
+    Returns the number of notifications claimed (0 when the queue is empty).
+    """
+    claimed = claim_batch(batch_size)
+    if not claimed:
+        return 0
+
+    deliverable, undeliverable = [], []
+    for notification in claimed:
+        if notification.recipient.email and notification.application_id:
+            deliverable.append(notification)
+        else:
+            undeliverable.append(notification)
+    if undeliverable:
+        Notification.objects.filter(id__in=[notification.id for notification in undeliverable]).update(
+            state=Notification.State.FAILED, error='Recipient has no email address or there is no application'
+        )
+
+    try:
+        prepared = build_messages(deliverable)
+    except Exception as e:
+        logger.exception("Rendering notifications failed")
+        schedule_retry([(deliverable, e)])
+        return len(claimed)
+
+    delivered, failed = send_prepared(prepared) if prepared else ([], [])
+    if failed:
+        schedule_retry(failed)
+
+    now = timezone.now()
+    Notification.objects.filter(id__in=[notification.id for notification in delivered]).update(
+        state=Notification.State.SENT, sent_at=now, error='', next_attempt_at=None
+    )
+    logger.info(f"Delivered {len(delivered)} notifications in {len(prepared) - len(failed)} emails")
+    return len(claimed)
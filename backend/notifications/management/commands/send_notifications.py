@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from notifications.delivery import DEFAULT_BATCH_SIZE, deliver_batch
+from notifications.models import Notification
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending email notifications now (e.g. from cron, or after an outage)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--retry-failed', action='store_true', help='Requeue notifications that ran out of attempts')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            requeued = Notification.objects.filter(state=Notification.State.FAILED).update(
+                state=Notification.State.PENDING, attempts=0, next_attempt_at=None
+            )
+            self.stdout.write(f'Requeued {requeued} failed notifications.')
+
+        processed = 0
+        while True:
+            claimed = deliver_batch(options['batch_size'])
+            if not claimed:
+                break
+            processed += claimed
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} notifications.'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('applications', '0008_application_status_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('APPLICATION_SUBMITTED', 'Application submitted'), ('STATUS_CHANGED', 'Application status changed'), ('NEW_APPLICANT', 'New applicant')], max_length=30)),
+                ('context', models.JSONField(blank=True, default=dict, help_text='Event details not stored on the application')),
+                ('locale', models.CharField(default='en-us', max_length=10)),
+                ('state', models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('batch_id', models.UUIDField(blank=True, help_text='Delivery run that claimed this notification', null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='applications.application')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['state', 'created_at'], name='notification_state_created_idx'), models.Index(fields=['batch_id'], name='notification_batch_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# notifications/models.py
+from django.conf import settings
+from django.db import models
+
+
+class Notification(models.Model):
+    """
+    Queued email notification about an application event.
+
+    Rows are written in the request and delivered in batches by
+    ``notifications.tasks.deliver_notifications``; bursts for the same
+    recipient and kind (e.g. many new applicants) are coalesced into one
+    digest email at delivery time.
+    """
+    class Kind(models.TextChoices):
+        APPLICATION_SUBMITTED = "APPLICATION_SUBMITTED", "Application submitted"
+        STATUS_CHANGED = "STATUS_CHANGED", "Application status changed"
+        NEW_APPLICANT = "NEW_APPLICANT", "New applicant"
+
+    class State(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENDING = "SENDING", "Sending"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications")
+    kind = models.CharField(max_length=30, choices=Kind.choices)
+    application = models.ForeignKey(
+        "applications.Application", on_delete=models.CASCADE, null=True, blank=True, related_name="notifications"
+    )
+    context = models.JSONField(default=dict, blank=True, help_text="Event details not stored on the application")
+    locale = models.CharField(max_length=10, default=settings.LANGUAGE_CODE)
+
+    state = models.CharField(max_length=10, choices=State.choices, default=State.PENDING)
+    batch_id = models.UUIDField(null=True, blank=True, help_text="Delivery run that claimed this notification")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True, help_text="Not retried before this time")
+    claimed_at = models.DateTimeField(null=True, blank=True, help_text="When the current delivery run claimed it")
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['state', 'created_at'], name='notification_state_created_idx'),
+            models.Index(fields=['batch_id'], name='notification_batch_idx'),
+            models.Index(fields=['state', 'next_attempt_at'], name='notification_state_next_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} → {self.recipient_id} ({self.state})"
@@ -0,0 +1,97 @@
+# notifications/queue.py
+"""
+Queue application notifications.
+
+Callers only insert ``Notification`` rows; delivery runs in the background a
+short while later (``NOTIFICATION_BATCH_DELAY`` seconds), so a burst of
+events is picked up by one delivery run and can be coalesced.
+
+The pending-run marker lives in the shared cache so every worker process
+sees it. On the thread backend a delayed run (including a retry of failed
+notifications) only exists on a timer thread and is lost if the process
+restarts; run ``manage.py send_notifications`` from cron every few minutes
+as the backstop that picks up anything left pending.
+"""
+import logging
+
+from django.conf import settings
+
+from hirepath.caching import shared_cache
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_SCHEDULED_KEY = 'notifications:delivery_scheduled'
+
+# Statuses the applicant set themselves; no email for those
+SILENT_STATUSES = ('WITHDRAWN',)
+
+
+def get_batch_delay():
+    return getattr(settings, 'NOTIFICATION_BATCH_DELAY', 60)
+
+
+def schedule_delivery():
+    """Make sure one delivery run is pending; repeated calls within the window are no-ops"""
+    from .tasks import deliver_notifications
+
+    delay = get_batch_delay()
+    try:
+        scheduled = shared_cache().add(DELIVERY_SCHEDULED_KEY, True, timeout=delay + 60)
+    except Exception:
+        # Without the marker, schedule anyway: an extra run finds nothing left to claim
+        logger.exception("Could not check for a scheduled notification delivery")
+        scheduled = True
+    if scheduled:
+        deliver_notifications.enqueue(countdown=delay)
+
+
+def schedule_retry_run(delay):
+    """
+    A delivery run once failed notifications are due again. Not deduplicated
+    with schedule_delivery(): a run already scheduled for new events may
+    start before the retries are due. Lost on restart with the thread
+    backend; the ``send_notifications`` cron run covers that.
+    """
+    from .tasks import deliver_notifications
+
+    deliver_notifications.enqueue(countdown=delay)
+
+
+def queue_notifications(notifications):
+    notifications = [notification for notification in notifications if notification.recipient_id]
+    if not notifications:
+        return []
+    created = Notification.objects.bulk_create(notifications)
+    schedule_delivery()
+    return created
+
+
+def notify_application_submitted(application):
+    """Confirmation to the applicant, and a new-applicant notice to the recruiter"""
+    return queue_notifications([
+        Notification(
+            recipient_id=application.applicant_id,
+            kind=Notification.Kind.APPLICATION_SUBMITTED,
+            application=application,
+        ),
+        Notification(
+            recipient_id=application.job.created_by_id,
+            kind=Notification.Kind.NEW_APPLICANT,
+            application=application,
+        ),
+    ])
+
+
+def notify_status_changes(status_events):
+    """One notification per ApplicationStatusEvent, to the applicant"""
+    return queue_notifications([
+        Notification(
+            recipient_id=event.application.applicant_id,
+            kind=Notification.Kind.STATUS_CHANGED,
+            application_id=event.application_id,
+            context={'from_status': event.from_status, 'to_status': event.to_status},
+        )
+        for event in status_events
+        if event.from_status and event.to_status not in SILENT_STATUSES
+    ])
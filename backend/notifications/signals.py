@@ -0,0 +1,19 @@
+# notifications/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from applications.models import Application, ApplicationStatusEvent
+from .queue import notify_application_submitted, notify_status_changes
+
+
+@receiver(post_save, sender=Application)
+def application_submitted(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notify_application_submitted(instance)
+
+
+@receiver(post_save, sender=ApplicationStatusEvent)
+def application_status_changed(sender, instance, created, raw=False, **kwargs):
+    """Single saves; bulk updates call notify_status_changes() themselves"""
+    if created and not raw:
+        notify_status_changes([instance])
@@ -0,0 +1,30 @@
+# notifications/tasks.py
+import logging
+
+from hirepath.caching import shared_cache
+from hirepath.tasks import background_task
+from .delivery import DEFAULT_BATCH_SIZE, deliver_batch
+from .queue import DELIVERY_SCHEDULED_KEY
+
+logger = logging.getLogger(__name__)
+
+
+@background_task
+def deliver_notifications(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Deliver every notification that is due, one batch (and mail connection)
+    at a time. Failed ones are not due until their backoff passes, so the
+    loop ends once the queue only holds those; a run is scheduled for them.
+    """
+    # Anything queued from here on schedules its own run
+    try:
+        shared_cache().delete(DELIVERY_SCHEDULED_KEY)
+    except Exception:
+        # The marker expires on its own; deliver what is due regardless
+        logger.exception("Could not clear the scheduled notification delivery marker")
+    delivered = 0
+    while True:
+        claimed = deliver_batch(batch_size)
+        if not claimed:
+            return delivered
+        delivered += claimed
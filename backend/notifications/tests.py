@@ -0,0 +1,201 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from applications.models import Application, ApplicationStatusEvent
+from companies.models import Company
+from hirepath.caching import shared_cache
+from jobs.models import Job
+
+from .delivery import MAX_ATTEMPTS, RETRY_DELAY, SENDING_LEASE, deliver_batch
+from .models import Notification
+from .queue import DELIVERY_SCHEDULED_KEY, notify_application_submitted, notify_status_changes
+from .tasks import deliver_notifications
+
+
+class FlakyEmailBackend(EmailBackend):
+    """locmem backend that refuses mail to the addresses in ``failing``"""
+    failing = set()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & self.failing:
+                raise ConnectionError('SMTP unavailable')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='notifications.tests.FlakyEmailBackend')
+class NotificationDeliveryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create(
+            username='notify_recruiter', role='RECRUITER', email='recruiter@example.com', first_name='Rita'
+        )
+        company = Company.objects.create(name='Notify Co', location='Cape Town', created_by=cls.recruiter)
+        cls.job = Job.objects.create(
+            title='Data Analyst',
+            description='Notification test job',
+            company=company,
+            location='Cape Town',
+            employment_type=Job.EMPLOYMENT_TYPES[0][0],
+            work_type=Job.WORK_TYPES[0][0],
+            experience_level=Job.EXPERIENCE_LEVELS[0][0],
+            created_by=cls.recruiter,
+        )
+        User.objects.bulk_create([
+            User(username=f'notify_graduate_{i}', role='GRADUATE', email=f'graduate{i}@example.com')
+            for i in range(3)
+        ])
+        cls.graduates = list(User.objects.filter(username__startswith='notify_graduate_').order_by('username'))
+        # bulk_create skips save(), so no scoring or signals run while seeding
+        Application.objects.bulk_create([
+            Application(job=cls.job, applicant=graduate, match_score=70.0) for graduate in cls.graduates
+        ])
+        cls.applications = list(Application.objects.filter(job=cls.job).order_by('applicant__username'))
+
+    def setUp(self):
+        FlakyEmailBackend.failing = set()
+
+    def submit_all(self):
+        for application in self.applications:
+            notify_application_submitted(application)
+
+    def test_submission_queues_applicant_and_recruiter_notices(self):
+        notify_application_submitted(self.applications[0])
+        self.assertEqual(
+            sorted(Notification.objects.values_list('kind', 'recipient_id')),
+            sorted([
+                (Notification.Kind.APPLICATION_SUBMITTED, self.graduates[0].pk),
+                (Notification.Kind.NEW_APPLICANT, self.recruiter.pk),
+            ])
+        )
+        self.assertTrue(all(state == Notification.State.PENDING for state in Notification.objects.values_list('state', flat=True)))
+
+    def test_status_change_notifies_applicant_except_withdrawals(self):
+        application = self.applications[0]
+        events = [
+            ApplicationStatusEvent(application=application, job=self.job, from_status='PENDING', to_status='INTERVIEW'),
+            ApplicationStatusEvent(application=application, job=self.job, from_status='INTERVIEW', to_status='WITHDRAWN'),
+            ApplicationStatusEvent(application=application, job=self.job, from_status='', to_status='PENDING'),
+        ]
+        queued = notify_status_changes(events)
+        self.assertEqual(len(queued), 1)
+        self.assertEqual(queued[0].context, {'from_status': 'PENDING', 'to_status': 'INTERVIEW'})
+
+    def test_one_delivery_run_is_scheduled_per_window_across_processes(self):
+        with mock.patch.object(deliver_notifications, 'enqueue') as enqueue:
+            self.submit_all()
+        enqueue.assert_called_once_with(countdown=60)
+        # The marker is in the shared cache, not this process's default cache
+        self.assertTrue(shared_cache().get(DELIVERY_SCHEDULED_KEY))
+        self.assertIsNone(cache.get(DELIVERY_SCHEDULED_KEY))
+
+    def test_delivery_is_scheduled_when_shared_cache_is_down(self):
+        with mock.patch('notifications.queue.shared_cache', side_effect=ConnectionError('cache down')), \
+                mock.patch.object(deliver_notifications, 'enqueue') as enqueue, \
+                self.assertLogs('notifications.queue', level='ERROR'):
+            notify_application_submitted(self.applications[0])
+        enqueue.assert_called_once_with(countdown=60)
+
+    def test_batch_is_sent_with_new_applicants_as_one_digest(self):
+        self.submit_all()
+        self.assertEqual(deliver_batch(), 6)
+
+        self.assertEqual(Notification.objects.filter(state=Notification.State.SENT).count(), 6)
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(recipients, ['graduate0@example.com', 'graduate1@example.com', 'graduate2@example.com', 'recruiter@example.com'])
+        digest = next(message for message in mail.outbox if message.to == ['recruiter@example.com'])
+        self.assertIn('3 new applicants', digest.subject)
+        self.assertIn('Data Analyst: 3', digest.body)
+        self.assertEqual(deliver_batch(), 0)
+
+    def test_single_new_applicant_is_not_a_digest(self):
+        notify_application_submitted(self.applications[0])
+        deliver_batch()
+        notice = next(message for message in mail.outbox if message.to == ['recruiter@example.com'])
+        self.assertIn('new applicant for Data Analyst', notice.subject)
+
+    def test_failed_email_is_retried_after_backoff(self):
+        FlakyEmailBackend.failing = {'graduate0@example.com'}
+        notify_application_submitted(self.applications[0])
+        deliver_batch()
+
+        failed = Notification.objects.get(recipient=self.graduates[0])
+        self.assertEqual((failed.state, failed.attempts), (Notification.State.PENDING, 1))
+        self.assertAlmostEqual(
+            (failed.next_attempt_at - timezone.now()).total_seconds(), RETRY_DELAY, delta=5
+        )
+        # Only the failed email is retried; the recruiter's went out
+        self.assertEqual(Notification.objects.get(recipient=self.recruiter).state, Notification.State.SENT)
+        self.assertEqual(len(mail.outbox), 1)
+
+        # Not due yet: an immediate second run claims nothing
+        self.assertEqual(deliver_batch(), 0)
+
+        FlakyEmailBackend.failing = set()
+        Notification.objects.filter(pk=failed.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_batch(), 1)
+        failed.refresh_from_db()
+        self.assertEqual((failed.state, failed.next_attempt_at), (Notification.State.SENT, None))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_gives_up_after_max_attempts(self):
+        FlakyEmailBackend.failing = {'graduate0@example.com'}
+        notify_application_submitted(self.applications[0])
+        notification = Notification.objects.get(recipient=self.graduates[0])
+
+        delays = []
+        for _ in range(MAX_ATTEMPTS):
+            Notification.objects.filter(pk=notification.pk).update(next_attempt_at=None)
+            deliver_batch()
+            notification.refresh_from_db()
+            if notification.next_attempt_at:
+                delays.append(round((notification.next_attempt_at - timezone.now()).total_seconds()))
+
+        self.assertEqual((notification.state, notification.attempts), (Notification.State.FAILED, MAX_ATTEMPTS))
+        self.assertEqual(delays, [RETRY_DELAY, RETRY_DELAY * 2])
+
+    def test_abandoned_sending_rows_are_reclaimed_after_lease(self):
+        notify_application_submitted(self.applications[0])
+        now = timezone.now()
+        Notification.objects.filter(kind=Notification.Kind.APPLICATION_SUBMITTED).update(
+            state=Notification.State.SENDING, claimed_at=now - timedelta(seconds=SENDING_LEASE + 1)
+        )
+        Notification.objects.filter(kind=Notification.Kind.NEW_APPLICANT).update(
+            state=Notification.State.SENDING, claimed_at=now
+        )
+
+        self.assertEqual(deliver_batch(), 1)
+        self.assertEqual(
+            dict(Notification.objects.values_list('kind', 'state')),
+            {
+                Notification.Kind.APPLICATION_SUBMITTED: Notification.State.SENT,
+                Notification.Kind.NEW_APPLICANT: Notification.State.SENDING,
+            }
+        )
+
+    def test_recipient_without_email_fails_without_retry(self):
+        User.objects.filter(pk=self.graduates[0].pk).update(email='')
+        notify_application_submitted(self.applications[0])
+        deliver_batch()
+        notification = Notification.objects.get(recipient=self.graduates[0])
+        self.assertEqual(notification.state, Notification.State.FAILED)
+
+    def test_command_requeues_failures_and_delivers(self):
+        self.submit_all()
+        Notification.objects.update(state=Notification.State.FAILED, attempts=MAX_ATTEMPTS)
+
+        out = StringIO()
+        call_command('send_notifications', '--retry-failed', stdout=out)
+        self.assertIn('Requeued 6 failed notifications.', out.getvalue())
+        self.assertIn('Processed 6 notifications.', out.getvalue())
+        self.assertEqual(Notification.objects.filter(state=Notification.State.SENT).count(), 6)